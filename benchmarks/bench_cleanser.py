@@ -0,0 +1,249 @@
+"""
+Benchmark suite of Cleanser.clean and of each Spotter over synthetic data frames
+
+Every case generates a reproducible frame with a given number of rows, text and
+numeric columns, string length and PII density (the fraction of text cells holding
+an email address or a card number), then reports the throughput in cells/s and
+MB/s of text, and the peak memory (traced by tracemalloc, in a separate run from
+the timing).
+
+Usage:
+    python benchmarks/bench_cleanser.py --output results.json
+    python benchmarks/bench_cleanser.py --quick --compare results.json
+    python benchmarks/bench_cleanser.py --modes --jobs 4 --scale 2000
+
+--compare prints the speed ratio of every case against a previous results file and
+exits with status 1 when a case got slower than --threshold.
+
+--modes instead times Cleanser.clean on tests/data_with_pii.csv repeated --scale
+times, serially, on --jobs threads (backend="threads") and on --jobs processes.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import sanityze
+from sanityze import engine
+from sanityze.cleanser import Cleanser
+from sanityze.spotters import CreditCardSpotter, EmailSpotter
+
+WORDS = ("the", "order", "was", "shipped", "to", "customer", "on", "monday", "please",
+         "call", "back", "about", "invoice", "number", "thanks", "regards", "support")
+EMAILS = ("JacobKing100@yahoo.com", "ChloeLavoie200@gmail.com", "MylesClark300@hotmail.com")
+CARDS = ("4556129404313766", "5567554868135971", "345160678082328", "6011087735246416")
+
+FULL_GRID = {"rows": [10_000, 100_000], "text_cols": [2], "num_cols": [2],
+             "str_len": [32, 256], "pii_density": [0.0, 0.1, 0.5]}
+QUICK_GRID = {"rows": [5_000], "text_cols": [2], "num_cols": [2],
+              "str_len": [64], "pii_density": [0.0, 0.2]}
+
+
+def make_frame(rows, text_cols, num_cols, str_len, pii_density, seed=0) -> pd.DataFrame:
+    """
+    Generate a synthetic data frame
+
+    Parameters
+    ----------
+    rows : int
+        The number of rows
+    text_cols : int
+        The number of object columns of free text
+    num_cols : int
+        The number of float columns
+    str_len : int
+        The approximate length of every text cell
+    pii_density : float
+        The fraction of text cells holding an email address or a card number
+    seed : int, optional
+        The seed of the generator. The default is 0.
+
+    Returns
+    -------
+    The data frame
+    """
+    rng = np.random.default_rng(seed)
+    n_words = max(1, str_len // 6)
+    data = {}
+    for k in range(text_cols):
+        words = rng.choice(WORDS, size=(rows, n_words))
+        cells = [" ".join(row) for row in words]
+        for i in np.flatnonzero(rng.random(rows) < pii_density):
+            pii = EMAILS[i % len(EMAILS)] if rng.random() < 0.5 else CARDS[i % len(CARDS)]
+            cut = len(cells[i]) // 2
+            cells[i] = f"{cells[i][:cut]} {pii} {cells[i][cut:]}"
+        data[f"text_{k}"] = cells
+    for k in range(num_cols):
+        data[f"num_{k}"] = rng.random(rows)
+    return pd.DataFrame(data)
+
+
+def text_megabytes(df: pd.DataFrame) -> float:
+    """
+    The size of the text held by the object columns of the frame, in MB
+    """
+    return sum(df[c].str.len().sum() for c in df.columns if df[c].dtype == object) / 1e6
+
+
+def measure(func, repeat):
+    """
+    Time func (best of repeat runs) and trace its peak memory in one more run
+
+    Returns
+    -------
+    A tuple (seconds, peak megabytes)
+    """
+    seconds = min(_timed(func) for _ in range(repeat))
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def targets(df: pd.DataFrame):
+    """
+    The benchmarked callables for a frame, as (name, callable, cells processed)
+    """
+    text = [df[c] for c in df.columns if df[c].dtype == object]
+    text_cells = sum(len(s) for s in text)
+    yield "Cleanser.clean", lambda: Cleanser().clean(df), df.size
+    yield "Cleanser.clean(hash)", lambda: Cleanser(hash_spotted=True).clean(df), df.size
+    yield "Cleanser.clean(fused)", lambda: Cleanser().clean(df, fused=True), df.size
+    yield "Cleanser.clean(spans)", lambda: Cleanser().clean(df, fused="spans"), df.size
+    for spotter in (EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")):
+        name = type(spotter).__name__
+        yield f"{name}.process", lambda s=spotter: [s.process(cell) for col in text for cell in col], text_cells
+        yield f"{name}.processSeries", lambda s=spotter: [s.processSeries(col) for col in text], text_cells
+
+
+def run(grid: dict, repeat: int) -> list:
+    """
+    Run every case of the grid
+
+    Returns
+    -------
+    A list of result dicts
+    """
+    results = []
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        case = dict(zip(keys, values))
+        df = make_frame(**case)
+        megabytes = text_megabytes(df)
+        for name, func, cells in targets(df):
+            seconds, peak = measure(func, repeat)
+            result = {"target": name, **case, "seconds": seconds, "cells_per_s": cells / seconds,
+                      "mb_per_s": megabytes / seconds, "peak_mb": peak}
+            results.append(result)
+            print(f"{name:<32} {_case_key(result):<48} {result['cells_per_s']:>14,.0f} cells/s "
+                  f"{result['mb_per_s']:>8.2f} MB/s {peak:>8.1f} MB peak", flush=True)
+    return results
+
+
+def _case_key(result: dict) -> str:
+    return " ".join(f"{k}={result[k]}" for k in ("rows", "text_cols", "num_cols", "str_len", "pii_density"))
+
+
+def compare(results: list, baseline: dict, threshold: float) -> bool:
+    """
+    Print the speed of every case relative to a previous results file
+
+    Returns
+    -------
+    True if no case is slower than the baseline by more than threshold
+    """
+    previous = {(r["target"], _case_key(r)): r for r in baseline["results"]}
+    ok = True
+    print(f"\ncompared to sanityze {baseline['meta']['sanityze']}:")
+    for r in results:
+        old = previous.get((r["target"], _case_key(r)))
+        if old is None:
+            continue
+        ratio = r["cells_per_s"] / old["cells_per_s"]
+        slower = ratio < 1 - threshold
+        ok = ok and not slower
+        print(f"{r['target']:<32} {_case_key(r):<48} {ratio:6.2f}x{'  REGRESSION' if slower else ''}")
+    return ok
+
+
+def run_modes(scale: int, jobs: int, repeat: int) -> list:
+    """
+    Time the serial, thread and process modes of Cleanser.clean on the test
+    dataset repeated scale times
+
+    Returns
+    -------
+    A list of result dicts
+    """
+    path = os.path.join(os.path.dirname(__file__), "..", "tests", "data_with_pii.csv")
+    df = pd.concat([pd.read_csv(path)] * scale, ignore_index=True)
+    megabytes = text_megabytes(df)
+    print(f"{len(df):,} rows, {megabytes:.1f} MB of text, regex module: "
+          f"{'yes' if engine.has_concurrent() else 'no (re holds the GIL)'}", flush=True)
+    modes = (("serial", {}),
+             ("threads", {"n_jobs": jobs, "backend": "threads"}),
+             ("processes", {"n_jobs": jobs, "backend": "processes"}))
+    results = []
+    for fused in (False, True):
+        serial = None
+        for mode, options in modes:
+            cleanser = Cleanser()
+            seconds = min(_timed(lambda: cleanser.clean(df, fused=fused, **options)) for _ in range(repeat))
+            serial = serial or seconds
+            result = {"target": f"Cleanser.clean({mode})", "fused": fused, "rows": len(df), "jobs": jobs,
+                      "seconds": seconds, "mb_per_s": megabytes / seconds, "speedup": serial / seconds}
+            results.append(result)
+            print(f"{result['target']:<28} fused={fused!s:<6} {seconds:>8.3f} s {result['mb_per_s']:>8.2f} MB/s "
+                  f"{result['speedup']:>6.2f}x", flush=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="run a small grid")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best is kept")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare with a previous JSON results file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression (default 0.1)")
+    parser.add_argument("--modes", action="store_true",
+                        help="compare the serial, thread and process modes of Cleanser.clean")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="the workers of --modes (default: the number of CPUs)")
+    parser.add_argument("--scale", type=int, default=2000,
+                        help="the repetitions of the test dataset of --modes (default 2000)")
+    args = parser.parse_args(argv)
+
+    if args.modes and args.compare:
+        parser.error("--compare only applies to the benchmark grid, not to --modes")
+    if args.modes:
+        results = run_modes(args.scale, args.jobs, args.repeat)
+    else:
+        results = run(QUICK_GRID if args.quick else FULL_GRID, args.repeat)
+    meta = {"sanityze": sanityze.__version__, "python": platform.python_version(),
+            "pandas": pd.__version__, "platform": platform.platform(), "time": time.time()}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(results, json.load(f), args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,30 @@
-# read version from installed package
-from importlib.metadata import version
-__version__ = version("sanityze")
\ No newline at end of file
+# the version and the classes are only looked up when first used, importing
+# sanityze stays cheap for the jobs that do not need them
+_EXPORTS = {
+    "Cleanser": "sanityze.cleanser",
+    "CompiledCleanser": "sanityze.compiled",
+    "Spotter": "sanityze.spotters",
+    "CreditCardSpotter": "sanityze.spotters",
+    "EmailSpotter": "sanityze.spotters",
+    "DictionarySpotter": "sanityze.spotters",
+    "FusedSpotter": "sanityze.spotters",
+    "SpanSpotter": "sanityze.spotters",
+}
+
+
+def __getattr__(name):
+    if name == "__version__":
+        # read version from installed package
+        from importlib.metadata import version
+        value = version("sanityze")
+    elif name in _EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    else:
+        raise AttributeError(f"module 'sanityze' has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + ["__version__"] + list(_EXPORTS))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from sanityze.lazy import LazyModule
+asyncio = LazyModule("asyncio")
+pd = LazyModule("pandas")
+
+# marks the end of the batches in the queue of Cleanser.aclean_records()
+DONE = object()
+
+
+async def batch_records(records, batch_size: int, max_delay: float):
+    """
+    Group an async iterable of records into lists of at most batch_size records. A
+    batch is also emitted when max_delay seconds have passed since its first record
+    arrived, so a slow trickle of records is not held back waiting for a full batch
+
+    Parameters
+    ----------
+    records : async iterable
+        The incoming records, dicts or lists of dicts
+    batch_size : int
+        The maximum number of records per batch
+    max_delay : float
+        The maximum number of seconds a record waits for its batch to fill
+
+    Returns
+    -------
+    An async iterator of lists of records, in order
+
+    Examples
+    --------
+    >>> async for batch in batch_records(queue_reader(), 1000, 0.05):
+    ...     frame = pd.DataFrame.from_records(batch)
+
+    """
+    loop = asyncio.get_running_loop()
+    iterator = records.__aiter__()
+    batch = []
+    deadline = None
+    # the pending read is kept when the deadline expires, cancelling it could
+    # lose a record or break the source
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if not batch else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield batch
+                batch = []
+                continue
+            read, pending = pending, None
+            try:
+                item = read.result()
+            except StopAsyncIteration:
+                break
+            if not batch:
+                deadline = loop.time() + max_delay
+            if isinstance(item, dict):
+                batch.append(item)
+            else:
+                batch.extend(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def fill_queue(queue: asyncio.Queue, batches) -> None:
+    """
+    Put the batches of records in the queue as data frames, then DONE. The queue
+    is bounded, so the records are not read faster than they are cleaned. An error
+    of the source is put in the queue to be raised by the consumer
+
+    Parameters
+    ----------
+    queue : asyncio.Queue
+        The queue of data frames to clean
+    batches : async iterable
+        The lists of records, from batch_records()
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    (called by Cleanser.aclean_records())
+
+    """
+    try:
+        async for batch in batches:
+            await queue.put(pd.DataFrame.from_records(batch))
+    except Exception as e:
+        await queue.put(e)
+        return
+    await queue.put(DONE)
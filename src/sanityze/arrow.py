@@ -0,0 +1,220 @@
+from __future__ import annotations
+import re
+from sanityze.lazy import LazyModule
+pd = LazyModule("pandas")
+
+# the characters of the Python \s class (str.isspace()), spelled out for RE2
+# where \s only matches ASCII whitespace
+_SPACE = r"\x{9}-\x{d}\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+# the Python escapes that RE2 reads differently, translated outside and inside
+# a character class (None when it cannot be expressed)
+_ESCAPES = {
+    "s": (f"[{_SPACE}]", _SPACE),
+    "S": (f"[^{_SPACE}]", None),
+    "d": (r"\p{Nd}", r"\p{Nd}"),
+    "D": (r"\P{Nd}", r"\P{Nd}"),
+    # \w and \b are Unicode in Python, ASCII in RE2
+    "w": (None, None),
+    "W": (None, None),
+    "b": (None, None),
+    "B": (None, None),
+    "Z": (None, None),
+}
+# the re flags that have an RE2 inline equivalent
+_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow and pyarrow.compute, which are only needed for Arrow data
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError as e:
+        raise ImportError("pyarrow is required to clean Arrow data, "
+                          "install it with `pip install sanityze[arrow]`") from e
+    return pa, pc
+
+
+def is_table(obj) -> bool:
+    """
+    Check whether an object is a pyarrow.Table, without importing pyarrow
+
+    Parameters
+    ----------
+    obj :
+        The object to check
+
+    Returns
+    -------
+    True if obj is a pyarrow.Table
+
+    """
+    return type(obj).__module__.startswith("pyarrow") and type(obj).__name__ == "Table"
+
+
+def is_string_type(data_type) -> bool:
+    """
+    Check whether an Arrow type is a string type the compute kernels clean
+
+    Parameters
+    ----------
+    data_type : pyarrow.DataType
+        The type to check
+
+    Returns
+    -------
+    True for string and large_string
+
+    """
+    pa, _ = _import_pyarrow()
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def is_arrow_string(dtype) -> bool:
+    """
+    Check whether a pandas dtype stores its strings in Arrow arrays
+
+    Parameters
+    ----------
+    dtype :
+        The dtype of a pandas column
+
+    Returns
+    -------
+    True for string[pyarrow] and pd.ArrowDtype(pa.string()) columns
+
+    Examples
+    --------
+    >>> is_arrow_string(pd.StringDtype("pyarrow"))
+    True
+
+    """
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage == "pyarrow"
+    arrow_dtype = getattr(pd, "ArrowDtype", None)
+    return arrow_dtype is not None and isinstance(dtype, arrow_dtype) and is_string_type(dtype.pyarrow_dtype)
+
+
+def to_arrow(column: pd.Series):
+    """
+    The Arrow array holding an Arrow backed pandas column, without a copy
+
+    Parameters
+    ----------
+    column : pd.Series
+        A column whose dtype is_arrow_string()
+
+    Returns
+    -------
+    A pyarrow.Array or pyarrow.ChunkedArray
+
+    """
+    pa, _ = _import_pyarrow()
+    return pa.array(column.array)
+
+
+def to_series(data, like: pd.Series) -> pd.Series:
+    """
+    Wrap an Arrow array in a pandas column with the dtype, index and name of
+    another column
+
+    Parameters
+    ----------
+    data : pyarrow.Array or pyarrow.ChunkedArray
+        The strings
+    like : pd.Series
+        The column whose dtype is_arrow_string()
+
+    Returns
+    -------
+    The column
+
+    """
+    if isinstance(like.dtype, pd.StringDtype):
+        array = pd.arrays.ArrowStringArray(data)
+    else:
+        array = pd.arrays.ArrowExtensionArray(data)
+    return pd.Series(array, index=like.index, name=like.name)
+
+
+def to_re2(pattern: str, flags: int):
+    """
+    Translate a Python regex to the RE2 syntax of the Arrow compute kernels,
+    keeping its meaning: \\s and \\d are spelled out as their Unicode classes, the
+    flags become inline flags and the whitespace and comments of verbose mode are
+    dropped
+
+    Parameters
+    ----------
+    pattern : str
+        The Python regex
+    flags : int
+        The re flags it is compiled with
+
+    Returns
+    -------
+    The RE2 regex, or None if RE2 cannot express it (lookarounds, backreferences,
+    \\w and \\b...)
+
+    Examples
+    --------
+    >>> to_re2(r"[0-9]{5}", re.IGNORECASE)
+    '(?i)[0-9]{5}'
+    >>> to_re2(r"\\b[0-9]{5}\\b", 0) is None
+    True
+
+    """
+    pa, pc = _import_pyarrow()
+    inline = ""
+    for flag, letter in _FLAGS.items():
+        if flags & flag:
+            inline += letter
+    if flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE | re.VERBOSE):
+        return None
+    verbose = bool(flags & re.VERBOSE)
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape in _ESCAPES:
+                translated = _ESCAPES[escape][1 if in_class else 0]
+                if translated is None:
+                    return None
+                out.append(translated)
+            else:
+                out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if verbose and not in_class and (char.isspace() or char == "#"):
+            # the whitespace and the comments of verbose mode are dropped
+            if char == "#":
+                end = pattern.find("\n", i)
+                i = len(pattern) if end < 0 else end
+            i += 1
+            continue
+        if char == "[" and not in_class:
+            in_class = True
+            out.append(char)
+            i += 1
+            # a ] right after [ or [^ is a literal
+            for literal in ("^", "]"):
+                if pattern.startswith(literal, i):
+                    out.append("\\]" if literal == "]" else literal)
+                    i += 1
+            continue
+        if char == "]" and in_class:
+            in_class = False
+        out.append(char)
+        i += 1
+    translated = (f"(?{inline})" if inline else "") + "".join(out)
+    try:
+        # RE2 rejects what it does not support (lookarounds, backreferences...)
+        pc.match_substring_regex(pa.array([""]), translated)
+    except pa.ArrowInvalid:
+        return None
+    return translated
@@ -0,0 +1,144 @@
+from collections import OrderedDict
+
+
+class MemoCache:
+    """
+    A bounded cache mapping an input string to its cleaned value, used by the
+    Cleanser to run the spotter chain once per distinct string
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of entries kept in the cache
+    policy : str, optional
+        The entry evicted when the cache is full: "lru" evicts the least recently
+        used entry, "fifo" the oldest inserted one (hits do not reorder the cache,
+        which makes them slightly cheaper). The default is "lru".
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups found in the cache
+    misses : int
+        The number of lookups not found in the cache
+    evictions : int
+        The number of entries evicted to make room for new ones
+
+    Examples
+    --------
+    >>> cache = MemoCache(2)
+    >>> cache.put("foo@gaga.com", "EMAILADDRS")
+    >>> cache.get("foo@gaga.com")
+    'EMAILADDRS'
+    >>> cache.info()
+    {'hits': 1, 'misses': 0, 'evictions': 0, 'size': 1, 'maxsize': 2, 'policy': 'lru'}
+
+    """
+    def __init__(self, maxsize: int, policy="lru"):
+        if (maxsize is None or maxsize < 1):
+            raise ValueError("maxsize must be a positive integer in MemoCache")
+        if policy not in ("lru", "fifo"):
+            raise ValueError("policy must be 'lru' or 'fifo' in MemoCache")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self):
+        # the entries are not pickled, a copy sent to a worker process starts empty
+        state = self.__dict__.copy()
+        state["_data"] = OrderedDict()
+        return state
+
+    def get(self, key: str, default=None):
+        """
+        Look up the cleaned value of a string
+
+        Parameters
+        ----------
+        key : str
+            The input string
+        default : optional
+            The value returned when the string is not cached. The default is None.
+
+        Returns
+        -------
+        The cleaned value, or default
+
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Cache the cleaned value of a string, evicting an entry if the cache is full
+
+        Parameters
+        ----------
+        key : str
+            The input string
+        value : str
+            The cleaned value
+
+        Returns
+        -------
+        None
+
+        """
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all the entries, the statistics are kept
+
+        Returns
+        -------
+        None
+
+        """
+        self._data.clear()
+
+    def merge_stats(self, other: "MemoCache") -> None:
+        """
+        Add the statistics of another cache, e.g. the copy used by a worker process
+
+        Parameters
+        ----------
+        other : MemoCache
+            The cache to take the statistics from
+
+        Returns
+        -------
+        None
+
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+
+    def info(self) -> dict:
+        """
+        The statistics of the cache
+
+        Returns
+        -------
+        A dict with the hits, misses, evictions, current size, maxsize and policy
+
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize, "policy": self.policy}
@@ -1,5 +1,27 @@
-import pandas as pd
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import math
+import os
+import time
+from collections import Counter
+from copy import copy as shallow_copy
+from sanityze.lazy import LazyModule
 from sanityze.spotters import * 
+from sanityze import aio, arrow, streaming
+from sanityze.cache import MemoCache
+from sanityze.compiled import CompiledCleanser
+from sanityze.incremental import IncrementalIndex
+from sanityze.plan import CleaningPlan, NO_STRINGS, schema_of, sample_kind
+from sanityze.stats import CleanStats
+from sanityze.scan import ScanResult
+from sanityze.profile import PROFILE_COLUMNS, wilson_interval, hit_cells
+
+asyncio = LazyModule("asyncio")
+futures = LazyModule("concurrent.futures")
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
 
 class Cleanser:
     """
@@ -13,13 +35,52 @@ class Cleanser:
     hash_spotted : bool, optional
         If True, the spotters will hash the values within the columns they spot. 
         The default is False.
+    hash_algorithm : str, optional
+        The algorithm of the default spotters hashing the spotted values, "md5" or
+        "blake2b". The default is "md5".
+    hash_key : str or bytes, optional
+        A secret key for "blake2b", the spotted values are then replaced by keyed
+        pseudonyms. The default is None.
+    cache_size : int, optional
+        If set, the cleaned value of up to cache_size distinct strings is cached, and
+        the spotter chain only runs once per distinct string. Worth it for columns
+        repeating the same values. The default is None (no cache).
+    cache_policy : str, optional
+        The eviction policy of the cache, "lru" or "fifo". The default is "lru".
+
+    Attributes
+    ----------
+    prefilter_skipped : collections.Counter
+        The number of cells each spotter (by uid) skipped thanks to its prefilter,
+        accumulated over all the calls to clean()
+    cache : MemoCache
+        The cache of cleaned strings, None if cache_size is not set. cache.info()
+        returns its hit/miss statistics
     
     """
-    def __init__(self, include_default_spotters=True, hash_spotted = False):
+    def __init__(self, include_default_spotters=True, hash_spotted = False, hash_algorithm="md5", hash_key=None,
+                 cache_size=None, cache_policy="lru"):
         if (include_default_spotters):
-            self.chain = [EmailSpotter("DEFAULTEMAILS",hash_spotted),CreditCardSpotter("DEFAULCCS",hash_spotted)]
+            self.chain = [EmailSpotter("DEFAULTEMAILS",hash_spotted,hash_algorithm,hash_key),
+                          CreditCardSpotter("DEFAULCCS",hash_spotted,hash_algorithm,hash_key)]
         else:
             self.chain = []
+        self.prefilter_skipped = Counter()
+        self.cache = MemoCache(cache_size, cache_policy) if cache_size else None
+        # the cached values depend on the chain and on the fused mode
+        self._cache_fused = None
+        # the uids of the chain, for add_spotter()
+        self._uids = {s.getSpotterUID() for s in self.chain}
+        # the chains run, built once per fused mode and plan, keyed on the spotters
+        self._chains = (None, {})
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # the chains are keyed on the ids of the spotters, which change when the
+        # Cleanser is unpickled (e.g. in a worker), the fused spotters are reused
+        key, chains = self._chains
+        if key is not None:
+            self._chains = (self._chain_key(), chains)
     
     def add_spotter(self, spotter) -> bool:
         """
@@ -40,16 +101,23 @@ class Cleanser:
         >>> c = Cleanser(include_default_spotters=False)
         >>> s1 = EmailSpotter("EMAILS",True)
         >>> c.add_spotter(s1)
+        True
 
         """
         if (spotter is None):
             raise ValueError("spotter cannot be None in Cleanser.add_spotter()")
-        if (spotter in self.chain):
+        # the chain is a public list, the uids are collected again if it was
+        # modified directly
+        if len(self._uids) != len(self.chain):
+            self._uids = {s.getSpotterUID() for s in self.chain}
+        uid = spotter.getSpotterUID()
+        if (uid in self._uids):
             return False
-        for s in self.chain:
-            if (s.getSpotterUID() == spotter.getSpotterUID()):
-                return False
         self.chain.append(spotter)
+        self._uids.add(uid)
+        if self.cache is not None:
+            self.cache.clear()
+        return True
     
     def remove_spotter(self, spotter_id) -> bool:
         """
@@ -78,6 +146,9 @@ class Cleanser:
         for s in self.chain:
             if (s.getSpotterUID() == spotter_id):
                 self.chain.remove(s)
+                self._uids.discard(spotter_id)
+                if self.cache is not None:
+                    self.cache.clear()
                 return True
         return False
     
@@ -104,18 +175,272 @@ class Cleanser:
         if (verbose):
             print(f"- {message}")
 
-    def clean(self, df: pd.DataFrame, verbose=False) -> pd.DataFrame:
+    def _fused_chain(self, chain=None, fused=True) -> list:
         """
-        Sanitizes the data frame using the spotters added to the Cleanser
+        Internal utility function merging the consecutive spotters of the chain
+        that can be fused into FusedSpotters, or SpanSpotters when fused is
+        "spans", keeping the chain order
+        
+        Parameters
+        ----------
+        chain : list, optional
+            The spotters to merge, the chain of the Cleanser by default
+        fused : bool or str, optional
+            The fused mode, as in clean(). The default is True.
+        
+        Returns
+        -------
+        The list of spotters to run, in chain order
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        merger = SpanSpotter if fused == "spans" else FusedSpotter
+        merged = []
+        run = []
+        for spotter in (self.chain if chain is None else chain) + [None]:
+            if spotter is not None and merger.canFuse(spotter):
+                run.append(spotter)
+                continue
+            if len(run) > 1:
+                merged.append(merger(run))
+            else:
+                merged.extend(run)
+            run = []
+            if spotter is not None:
+                merged.append(spotter)
+        return merged
+
+    def plan(self, df: pd.DataFrame, columns=None, exclude=None, spotter_columns=None, sample_size=1000, random_state=0) -> CleaningPlan:
+        """
+        Inspects the schema of the data frame once and plans which columns to clean
+        with which spotters. The plan can be inspected with plan.describe() and passed
+        to clean() for this data frame and every other one with the same schema
         
         Parameters
         ----------
         df : pd.DataFrame
-            The data frame to sanitize
+            The data frame to plan for
+        columns : list, optional
+            Only these columns are cleaned. The default is None (all the columns).
+        exclude : list, optional
+            These columns are never cleaned. The default is None.
+        spotter_columns : dict, optional
+            Maps spotter uids to the only columns they run on, the spotters not in the
+            dict run on every column. The default is None.
+        sample_size : int, optional
+            The number of values sampled from the columns that can hold strings to
+            classify them. The default is 1000.
+        random_state : int, optional
+            The seed of the samples. The default is 0.
+            
+        Returns
+        -------
+        The CleaningPlan
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> plan = c.plan(df, exclude=["notes"], spotter_columns={"CREDITCARD": ["card"]})
+        >>> plan.describe()
+              column   dtype     kind               spotters
+        0      email  object     text             EMAILADDRS
+        1       card  object     text  EMAILADDRS,CREDITCARD
+        2      notes  object excluded
+        3      price   int64    dtype
+        >>> c.clean(df, plan=plan)
+        
+        """
+        if (df is None):
+            raise ValueError("df cannot be None in plan")
+        if not isinstance(df,pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame in plan")
+        spotter_columns = spotter_columns or {}
+        uids = [s.getSpotterUID() for s in self.chain]
+        for name in list(columns or []) + list(exclude or []) + [c for cs in spotter_columns.values() for c in cs]:
+            if name not in df.columns:
+                raise ValueError(f"column {name} is not in the data frame in plan")
+        for uid in spotter_columns:
+            if uid not in uids:
+                raise ValueError(f"spotter {uid} is not in the chain in plan")
+        plan_columns = {}
+        kinds = {}
+        for j, name in enumerate(df.columns):
+            column = df.iloc[:, j]
+            if not self._is_text_column(column):
+                kinds[j] = "dtype"
+            elif (columns is not None and name not in columns) or (exclude is not None and name in exclude):
+                kinds[j] = "excluded"
+            else:
+                spotters = tuple(uid for uid in uids if uid not in spotter_columns or name in spotter_columns[uid])
+                if not spotters:
+                    kinds[j] = "no spotter"
+                else:
+                    kinds[j] = sample_kind(column, sample_size, random_state)
+                    plan_columns[j] = spotters
+        return CleaningPlan(schema_of(df), plan_columns, kinds)
+
+    def profile(self, df: pd.DataFrame, fraction=0.01, min_rows=1000, confidence=0.95, tolerance=None,
+                escalate=False, random_state=0) -> CleaningPlan:
+        """
+        Estimates how often each spotter finds PII in each column from a sample of
+        rows, and plans to clean only the columns where PII was sampled. A planned
+        column is cleaned with the whole chain, a spotter that did not match in the
+        sample can still match in the other rows. Meant for wide tables where most
+        columns never hold PII
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to profile
+        fraction : float, optional
+            The fraction of the rows sampled. The default is 0.01.
+        min_rows : int, optional
+            The minimum number of rows sampled (all of them for a smaller data
+            frame). The default is 1,000.
+        confidence : float, optional
+            The confidence level of the Wilson bounds of the prevalence. The default
+            is 0.95.
+        tolerance : float, optional
+            The prevalence of PII that can be left in a column: a column without a
+            sampled hit is still cleaned, and marked "uncertain", when the upper bound
+            of its prevalence is above it. The default is None, only the columns with
+            sampled hits are cleaned.
+        escalate : bool, optional
+            If True and the sample has any hit, every column is scanned in full and
+            the plan is built from the exact counts. The default is False.
+        random_state : int, optional
+            The seed of the sample. The default is 0.
+            
+        Returns
+        -------
+        A CleaningPlan for clean(), its profile attribute holds the estimates:
+        the sampled string cells, the cells with a hit, the prevalence and its
+        bounds, per column and spotter
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> plan = c.profile(wide_df, fraction=0.05)
+        >>> plan.profile[plan.profile.hits > 0]
+                  column     spotter  cells  hits  prevalence     lower     upper
+        0  email_address  EMAILADDRS   1000   412       0.412  0.381888  0.442788
+        >>> c.clean(wide_df, plan=plan)
+        
+        """
+        if (df is None):
+            raise ValueError("df cannot be None in profile")
+        if not isinstance(df,pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame in profile")
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1] in profile")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be in (0, 1) in profile")
+        n_rows = min(len(df), max(min_rows, math.ceil(fraction * len(df))))
+        sample = df if n_rows >= len(df) else df.sample(n_rows, random_state=random_state)
+        result = self.scan(sample)
+        exact = sample is df
+        if escalate and not exact and result.found():
+            sample = df
+            result = self.scan(df)
+            exact = True
+        hits = hit_cells(result)
+        uids = result.spotters
+        rows = []
+        plan_columns = {}
+        kinds = {}
+        for j, name in enumerate(df.columns):
+            column = sample.iloc[:, j]
+            if not self._is_text_column(column):
+                kinds[j] = "dtype"
+                continue
+            cells = int(column.map(lambda cell: isinstance(cell, str)).sum())
+            flagged = False
+            found = False
+            for k, uid in enumerate(uids):
+                n_hits = hits.get((j, k), 0)
+                prevalence = n_hits / cells if cells else 0.0
+                lower, upper = (prevalence, prevalence) if exact else wilson_interval(n_hits, cells, confidence)
+                rows.append((name, uid, cells, n_hits, prevalence, lower, upper))
+                found = found or n_hits > 0
+                flagged = flagged or n_hits > 0 or (tolerance is not None and upper > tolerance)
+            if flagged:
+                plan_columns[j] = tuple(uids)
+            if found:
+                kinds[j] = "PII found" if exact else "PII sampled"
+            elif flagged:
+                kinds[j] = "uncertain"
+            else:
+                kinds[j] = "no PII found" if exact else "no PII sampled"
+        return CleaningPlan(schema_of(df), plan_columns, kinds, pd.DataFrame(rows, columns=PROFILE_COLUMNS))
+
+    def clean(self, df: pd.DataFrame, verbose=False, fused=False, n_jobs=1, executor=None, inplace=False, copy=True, plan=None,
+              return_stats=False, on_stats=None, backend="processes", count_matches=True) -> pd.DataFrame:
+        """
+        Sanitizes the data frame using the spotters added to the Cleanser
+        
+        Parameters
+        ----------
+        df : pd.DataFrame or pyarrow.Table
+            The data frame to sanitize. The string columns of a pyarrow Table and the
+            Arrow backed string columns of a data frame (string[pyarrow] and
+            pd.ArrowDtype) are cleaned with the Arrow compute kernels, see
+            Spotter.processArrow(), and a Table is returned for a Table
+        verbose: bool, optional
+            If True, the progress is printed per column and spotter. The default is False.
+        fused: bool or str, optional
+            If True, the patterns of consecutive regex based spotters are merged and each
+            cell is scanned once for all of them. When the matches of two spotters
+            overlap the one first in the chain wins, text inserted by a spotter is not
+            scanned again by the next ones. If "spans", consecutive regex based spotters
+            report the spans they replace in the original cell, each one searched between
+            the spans of the spotters earlier in the chain, and the cell is rebuilt once,
+            see SpanSpotter. The default is False.
+        n_jobs: int, optional
+            The number of worker processes cleaning chunks of rows in parallel, -1 uses
+            all the CPUs. The spotters must be picklable. The default is 1 (no workers).
+        executor: concurrent.futures.Executor, optional
+            An executor to run the chunks on instead of a new ProcessPoolExecutor (a
+            ThreadPoolExecutor with backend="threads"), its workers are used as is and
+            n_jobs only sets the number of chunks. The default is None.
+        inplace: bool, optional
+            If True, the columns that change are replaced in df itself and None is
+            returned. The default is False.
+        copy: bool, optional
+            If False, the returned data frame only holds new arrays for the columns
+            that changed and shares the other columns with df (copy on write), so
+            modifying one of them in place modifies df too. The default is True
+            (every column is copied).
+        plan: CleaningPlan, optional
+            A plan from plan(), only its columns are cleaned with their spotters. It
+            must have been built for the schema of df. The default is None (every
+            column that can hold strings is cleaned with all the spotters).
+        return_stats: bool, optional
+            If True, statistics are collected per column and spotter (cells scanned,
+            skipped by the prefilter and changed, matches and time) and returned in a
+            CleanStats alongside the data frame. The default is False, nothing is
+            collected.
+        on_stats: callable, optional
+            Called with the CleanStats at the end of the run, also collects the
+            statistics. The default is None.
+        backend: str, optional
+            "processes" (the default) runs n_jobs worker processes, "threads" runs
+            blocks of the columns on n_jobs threads of this process, for the
+            environments that cannot start processes (Spark executors, notebooks...).
+            The threads match the patterns with the regex module when it is
+            installed, which releases the GIL, and with re otherwise. The cache is
+            not used by the threads.
+        count_matches: bool, optional
+            Whether the statistics count the matches of the spotters, which scans the
+            changed cells a second time. If False, their matches are None. The
+            default is True.
             
         Returns
         -------
-        The sanitized data frame 
+        The sanitized data frame, or None if inplace is True. With return_stats, a
+        tuple of it and the CleanStats
         
         Examples
         --------
@@ -127,29 +452,1432 @@ class Cleanser:
         0	laptop	1200
         1	printer EMAILADDRS	150
         2	tablet	300
-        3	desk 5555 5555 5555 4444	450
+        3	desk CREDITCARD	450
         4	chair	200
         
         """
         if (df is None):
             raise ValueError("df cannot be None in clean")
+        is_table = arrow.is_table(df)
+        if not is_table and not isinstance(df,pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame or a pyarrow Table in clean")
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if (n_jobs is None or n_jobs < 1):
+            raise ValueError("n_jobs must be -1 or a positive integer in clean")
+        if backend not in ("processes", "threads"):
+            raise ValueError("backend must be \"processes\" or \"threads\" in clean")
+        if is_table and (n_jobs > 1 or executor is not None or inplace or plan is not None):
+            raise ValueError("n_jobs, executor, inplace and plan cannot be used with a pyarrow Table in clean")
+        if plan is not None and not plan.matches(df):
+            raise ValueError("plan was built for a data frame with another schema in clean")
+        # the hashes are memoized per run
+        for spotter in self.chain:
+            spotter.resetHashMemo()
+        stats = CleanStats(count_matches) if (return_stats or on_stats is not None) else None
+        if is_table:
+            result = self._clean_table(df, verbose, fused, stats)
+        elif (n_jobs > 1 or executor is not None) and backend == "processes":
+            cleaned = self._clean_parallel(df, n_jobs, executor, stats, verbose=verbose, fused=fused, plan=plan)
+            result = None if inplace else cleaned
+            if inplace:
+                for j in range(df.shape[1]):
+                    if self._is_text_column(df.iloc[:, j]) and not cleaned.iloc[:, j].equals(df.iloc[:, j]):
+                        df.isetitem(j, cleaned.iloc[:, j])
+        else:
+            if n_jobs > 1 or executor is not None:
+                changed = self._clean_threaded(df, n_jobs, executor, verbose, fused, plan, stats)
+            else:
+                changed = self._clean_columns(df, verbose, fused, plan, stats)
+            # inplace replaces the columns of df, the other modes replace them
+            # in a deep or a shallow copy
+            df_copy = df if inplace else df.copy(deep=copy)
+            for j, cleaned_column in changed.items():
+                df_copy.isetitem(j, cleaned_column)
+            result = None if inplace else df_copy
+        if on_stats is not None:
+            on_stats(stats)
+        return (result, stats) if return_stats else result
+
+    def clean_text(self, text: str, fused=False) -> str:
+        """
+        Sanitizes a single string, e.g. a log line, without building a data frame.
+        The spotters run one after the other on the string, skipping the ones
+        whose prefilter rejects it
+        
+        Parameters
+        ----------
+        text : str
+            The string to sanitize
+        fused: bool, optional
+            As in clean()
+            
+        Returns
+        -------
+        The sanitized string
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.clean_text("refund 4556129404313766 for foo@gaga.com")
+        'refund CREDITCARD for EMAILADDRS'
+        
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a str in clean_text")
+        return self._clean_text(text, self._compiled_chain(fused))
+
+    def clean_record(self, record: dict, fused=False) -> dict:
+        """
+        Sanitizes a record, e.g. a parsed JSON object, without building a data frame.
+        The strings are sanitized wherever they are nested in dicts, lists and
+        tuples, the keys and the other values are kept as they are
+        
+        Parameters
+        ----------
+        record : dict
+            The record to sanitize, it is left untouched
+        fused: bool, optional
+            As in clean()
+            
+        Returns
+        -------
+        A sanitized copy of the record
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.clean_record({"id": 7, "contact": {"emails": ["foo@gaga.com"]}})
+        {'id': 7, 'contact': {'emails': ['EMAILADDRS']}}
+        
+        """
+        if not isinstance(record, dict):
+            raise TypeError("record must be a dict in clean_record")
+        return self._clean_value(record, self._compiled_chain(fused))
+
+    def clean_records(self, records: list, fused=False) -> list:
+        """
+        Sanitizes a list of records, as clean_record()
+        
+        Parameters
+        ----------
+        records : list of dict
+            The records to sanitize, they are left untouched
+        fused: bool, optional
+            As in clean()
+            
+        Returns
+        -------
+        A list of the sanitized copies of the records, in order
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.clean_records([{"email": "foo@gaga.com"}, {"email": None}])
+        [{'email': 'EMAILADDRS'}, {'email': None}]
+        
+        """
+        if (records is None):
+            raise ValueError("records cannot be None in clean_records")
+        chain = self._compiled_chain(fused)
+        cleaned = []
+        for record in records:
+            if not isinstance(record, dict):
+                raise TypeError("records must be a list of dict in clean_records")
+            cleaned.append(self._clean_value(record, chain))
+        return cleaned
+
+    def scan(self, df: pd.DataFrame, columns=None, spotters=None, limit=None, counts_only=False, block_size=10_000) -> ScanResult:
+        """
+        Finds where the spotters of the Cleanser would redact PII, without rewriting
+        the data frame. Every spotter looks at the original text, and the columns
+        are scanned by blocks of rows so the scan can stop as soon as limit matches
+        are found, e.g. for an audit gate failing on the first card number
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to scan
+        columns : list, optional
+            The names of the columns to scan. The default is None, all the columns
+            that can hold strings.
+        spotters : list, optional
+            The uids of the spotters to scan for. The default is None, the whole chain.
+        limit : int, optional
+            Stop once this number of matches is found, the result is then marked
+            as stopped. The default is None (scan everything).
+        counts_only : bool, optional
+            If True, only the number of matches per column and spotter is kept, not
+            the matches. The default is False.
+        block_size : int, optional
+            The number of rows scanned between two checks of the limit. The default
+            is 10,000.
+            
+        Returns
+        -------
+        A ScanResult
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.scan(df).to_frame()
+           row         column     spotter  start  end
+        0    0  email_address  EMAILADDRS     34   56
+        >>> if c.scan(df, spotters=["CREDITCARD"], limit=1).found():
+        ...     raise SystemExit("card numbers found")
+        
+        """
+        if (df is None):
+            raise ValueError("df cannot be None in scan")
+        if not isinstance(df,pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame in scan")
+        if (limit is not None and limit < 1):
+            raise ValueError("limit must be a positive integer in scan")
+        if (block_size is None or block_size < 1):
+            raise ValueError("block_size must be a positive integer in scan")
+        uids = [s.getSpotterUID() for s in self.chain]
+        for uid in spotters or []:
+            if uid not in uids:
+                raise ValueError(f"spotter {uid} is not in the chain in scan")
+        for name in columns or []:
+            if name not in df.columns:
+                raise ValueError(f"column {name} is not in the data frame in scan")
+        chain = [s for s in self.chain if spotters is None or s.getSpotterUID() in spotters]
+        result = ScanResult(list(df.columns), [s.getSpotterUID() for s in chain], counts_only)
+        for j, name in enumerate(df.columns):
+            column = df.iloc[:, j]
+            if (columns is not None and name not in columns) or not self._is_text_column(column):
+                continue
+            if not pd.api.types.is_object_dtype(column.dtype):
+                column = column.astype(object)
+            for first in range(0, len(column), block_size):
+                block = column.iloc[first:first + block_size]
+                mask = block.map(lambda cell: isinstance(cell, str)).to_numpy(dtype=bool, na_value=False)
+                if not mask.any():
+                    continue
+                text = block[mask]
+                positions = np.flatnonzero(mask) + first
+                for k, spotter in enumerate(chain):
+                    candidates = spotter.mayContainSeries(text)
+                    if candidates is None:
+                        rows, starts, ends = spotter.findSpans(text)
+                        result.add(j, k, positions[rows], starts, ends)
+                    elif candidates.any():
+                        rows, starts, ends = spotter.findSpans(text[candidates])
+                        result.add(j, k, positions[candidates][rows], starts, ends)
+                if limit is not None and len(result) >= limit:
+                    result.stopped = True
+                    result.finish()
+                    return result
+        result.finish()
+        return result
+
+    def clean_iter(self, frames, verbose=False, fused=False, n_jobs=1, executor=None, copy=True, plan=None,
+                   backend="processes"):
+        """
+        Sanitizes an iterable of data frames lazily, one at a time, so only the
+        current frame and its cleaned copy are held in memory
+        
+        Parameters
+        ----------
+        frames : iterable of pd.DataFrame
+            The data frames to sanitize, e.g. the chunks of pd.read_csv(chunksize=...)
+        verbose, fused, n_jobs, executor, copy, plan, backend : optional
+            As in clean(). With n_jobs, a single process (or thread) pool is shared by
+            all the frames.
+            
+        Returns
+        -------
+        An iterator of the sanitized data frames, in order
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> for chunk in c.clean_iter(pd.read_csv("export.csv", chunksize=100_000)):
+        ...     chunk.to_csv("clean.csv", mode="a", index=False)
+        
+        """
+        if (frames is None):
+            raise ValueError("frames cannot be None in clean_iter")
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if executor is None and n_jobs is not None and n_jobs > 1:
+            pool_class = futures.ThreadPoolExecutor if backend == "threads" else futures.ProcessPoolExecutor
+            with pool_class(max_workers=n_jobs) as pool:
+                for df in frames:
+                    yield self.clean(df, verbose, fused, n_jobs, pool, copy=copy, plan=plan, backend=backend)
+        else:
+            for df in frames:
+                yield self.clean(df, verbose, fused, n_jobs, executor, copy=copy, plan=plan, backend=backend)
+
+    async def aclean(self, df: pd.DataFrame, executor=None, verbose=False, fused=False, plan=None, return_stats=False):
+        """
+        Sanitizes a data frame without blocking the event loop, the cleaning runs
+        in an executor
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        executor : concurrent.futures.Executor, optional
+            The executor running the cleaning. The default is None, the default
+            executor of the loop (threads). With a ProcessPoolExecutor the counters
+            and cache statistics of the worker are merged back into this Cleanser.
+        verbose, fused, plan, return_stats : optional
+            As in clean()
+            
+        Returns
+        -------
+        The sanitized data frame, or a tuple of it and the CleanStats with return_stats
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> cleaned = await c.aclean(df)
+
+        The Cleanser keeps counters and a cache, calls on the same Cleanser should
+        not overlap: await them in turn, or use aclean_records() to clean a stream
+        
+        """
+        if (df is None):
+            raise ValueError("df cannot be None in aclean")
+        loop = asyncio.get_running_loop()
+        options = {"verbose": verbose, "fused": fused, "plan": plan, "return_stats": return_stats}
+        if isinstance(executor, futures.ProcessPoolExecutor):
+            cleaned, worker = await loop.run_in_executor(executor, _clean_chunk, self, df, options)
+            self._merge_counters(worker)
+            return cleaned
+        return await loop.run_in_executor(executor, functools.partial(self.clean, df, **options))
+
+    async def aclean_records(self, records, batch_size=1000, max_delay=0.05, max_pending=2, executor=None,
+                             verbose=False, fused=False, plan=None):
+        """
+        Sanitizes an async stream of records, micro-batched into data frames. The
+        records are read and batched while the previous batch is cleaned in the
+        executor, and at most max_pending batches wait to be cleaned: when the
+        cleaning falls behind the stream is not read any further (backpressure)
+        
+        Parameters
+        ----------
+        records : async iterable
+            The incoming records, dicts (one record) or lists of dicts (a batch)
+        batch_size : int, optional
+            The maximum number of records per data frame. The default is 1,000.
+        max_delay : float, optional
+            The maximum number of seconds a record waits for its batch to fill, which
+            bounds the latency added by the batching. The default is 0.05.
+        max_pending : int, optional
+            The maximum number of batches waiting to be cleaned. The default is 2.
+        executor, verbose, fused, plan : optional
+            As in aclean()
+            
+        Returns
+        -------
+        An async iterator of the sanitized data frames, in order
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> async for frame in c.aclean_records(incoming_json_records()):
+        ...     await sink.write(frame.to_dict("records"))
+        
+        """
+        if (records is None):
+            raise ValueError("records cannot be None in aclean_records")
+        if (batch_size is None or batch_size < 1):
+            raise ValueError("batch_size must be a positive integer in aclean_records")
+        if (max_pending is None or max_pending < 1):
+            raise ValueError("max_pending must be a positive integer in aclean_records")
+        queue = asyncio.Queue(max_pending)
+        producer = asyncio.ensure_future(aio.fill_queue(queue, aio.batch_records(records, batch_size, max_delay)))
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is aio.DONE:
+                    break
+                if isinstance(frame, Exception):
+                    raise frame
+                yield await self.aclean(frame, executor, verbose, fused, plan)
+        finally:
+            producer.cancel()
+
+    def clean_file(self, src, dst, chunksize=100_000, file_format=None, verbose=False, fused=False, n_jobs=1, executor=None, plan=None,
+                   backend="processes") -> int:
+        """
+        Sanitizes a CSV, Parquet, JSON lines or text file chunk by chunk into another
+        file, memory use is bounded by the chunk size instead of the file size
+        
+        Parameters
+        ----------
+        src : str or file-like
+            The file to sanitize
+        dst : str or file-like
+            The file to write, in the same format as src
+        chunksize : int, optional
+            The number of rows read, cleaned and written at a time. The default is 100,000.
+        file_format : str, optional
+            "csv", "parquet", "jsonl" or "text" (one row per line), inferred from the
+            extension of src by default. Parquet needs pyarrow.
+        verbose, fused, n_jobs, executor, plan, backend : optional
+            As in clean(). A plan must match the chunks as read, with every column of
+            a CSV file read as text (object dtype)
+            
+        Returns
+        -------
+        The number of rows written
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.clean_file("export.csv", "export_clean.csv", chunksize=500_000, n_jobs=8)
+        20000000
+        
+        """
+        if (src is None or dst is None):
+            raise ValueError("src and dst cannot be None in clean_file")
+        if (chunksize is None or chunksize < 1):
+            raise ValueError("chunksize must be a positive integer in clean_file")
+        if file_format is None:
+            file_format = streaming.infer_format(src)
+        # keep the column types of the source, a chunk can have all null columns
+        schema = streaming.parquet_schema(src) if file_format == "parquet" else None
+        chunks = streaming.read_chunks(src, file_format, chunksize)
+        with streaming.ChunkWriter(dst, file_format, schema) as writer:
+            # the chunks are only written, their untouched columns need no copy
+            for chunk in self.clean_iter(chunks, verbose, fused, n_jobs, executor, copy=False, plan=plan,
+                                         backend=backend):
+                writer.write(chunk)
+        return writer.rows
+
+    def fingerprint(self, fused=False) -> str:
+        """
+        A digest of everything that determines the output of clean(): the settings
+        of the spotters in chain order, the fused mode and the sanityze version. It
+        changes whenever a spotter is added, removed or configured differently
+        
+        Parameters
+        ----------
+        fused: bool or str, optional
+            The fused mode of the runs, as in clean(). The default is False.
+            
+        Returns
+        -------
+        A hex sha256 digest
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> c.fingerprint() == Cleanser().fingerprint()
+        True
+        
+        """
+        import sanityze
+        config = {"spotters": [spotter.getConfig() for spotter in self.chain],
+                  "fused": fused, "version": sanityze.__version__}
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+    def compile(self, fused=False, plan=None) -> CompiledCleanser:
+        """
+        Freezes the Cleanser into a CompiledCleanser: the chain is validated (not
+        empty, unique uids, patterns that compile, picklable spotters), and the
+        patterns, the fused spotters and the chains of the plan are built once. The
+        CompiledCleanser is immutable and picklable, so it can be shipped to worker
+        processes or saved for the next runs
+        
+        Parameters
+        ----------
+        fused: bool or str, optional
+            The fused mode of the runs, as in clean(). The default is False.
+        plan: CleaningPlan, optional
+            A plan from plan() or profile() the data frames are cleaned with. The
+            default is None (every text column with the whole chain).
+            
+        Returns
+        -------
+        The CompiledCleanser
+        
+        Examples
+        --------
+        >>> compiled = Cleanser().compile(fused=True)
+        >>> compiled.clean(df)
+        >>> compiled.save("cleanser.pkl")
+        
+        """
+        return CompiledCleanser(self, fused, plan)
+
+    def clean_incremental(self, df: pd.DataFrame, index, verbose=False, fused=False, n_jobs=1, executor=None) -> pd.DataFrame:
+        """
+        Sanitizes a data frame that is mostly the same from one run to the next,
+        e.g. a daily export that only appends rows. Every row is hashed, the rows
+        already in the index are taken from it and only the new or modified rows
+        are cleaned, then added to the index. The index is emptied when the
+        fingerprint of the chain or the schema of df changes
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        index : str or IncrementalIndex
+            The index of the rows already cleaned, or the path of its SQLite file.
+            An index opened from a path is closed at the end of the run
+        verbose, fused, n_jobs, executor : optional
+            As in clean(), for the new rows
+            
+        Returns
+        -------
+        The sanitized data frame, the same as clean(df) would return
+        
+        Examples
+        --------
+        >>> c = Cleanser()
+        >>> cleaned = c.clean_incremental(pd.read_csv("export.csv"), "export_index.sqlite")
+        
+        """
+        if (df is None or index is None):
+            raise ValueError("df and index cannot be None in clean_incremental")
         if not isinstance(df,pd.DataFrame):
-            raise TypeError("df must be a pandas DataFrame in clean")
-        # we only operate on a copy of the data frame, leaving 
-        # the original data frame intact
-        df_copy = df.copy() 
-        # iterate thru the data frame cells
-        row_len, col_len = df.shape
-        for i in range(row_len):
-            for j in range(col_len):
-                cell = df.iat[i,j]
-                # iterate thru the spotters and redact content
-                # if the cell is of type string
-                if isinstance(cell, str):
-                    for spotter in self.chain:
-                        self._log(f"{spotter.getSpotterUID()}: Processing cell {cell} ", verbose)
-                        cell = spotter.process(cell)
-                        self._log(f"{spotter.getSpotterUID()}: Processed cell {cell} ", verbose)
-                # update the cell in the copy of the data frame
-                df_copy.iat[i,j] = cell
-        return df_copy
\ No newline at end of file
+            raise TypeError("df must be a pandas DataFrame in clean_incremental")
+        owned = not isinstance(index, IncrementalIndex)
+        if owned:
+            index = IncrementalIndex(index)
+        try:
+            schema = tuple((name, str(dtype)) for name, dtype in df.dtypes.items())
+            index.prepare(self.fingerprint(fused), schema)
+            hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view(np.int64)
+            known = index.lookup(hashes)
+            hit = np.fromiter((h in known for h in hashes.tolist()), dtype=bool, count=len(hashes))
+            new = np.flatnonzero(~hit)
+            index.hits += len(hashes) - len(new)
+            index.misses += len(new)
+            self._log(f"{len(hashes) - len(new)} rows found in the index, {len(new)} to clean", verbose)
+            text = [j for j in range(df.shape[1]) if self._is_text_column(df.iloc[:, j])]
+            cleaned_new = self.clean(df.iloc[new], verbose, fused, n_jobs, executor) if len(new) else None
+            result = df.copy()
+            stored = [None] * len(new)
+            # the rows of the index are laid out once by hash, every hit row points
+            # to its stored row so a column is restored with one fancy assignment
+            keys = np.array(sorted(h for h, row in known.items() if row is not None), dtype=np.int64)
+            rows = [known[h] for h in keys.tolist()]
+            target = np.flatnonzero(hit)
+            source = np.searchsorted(keys, hashes[target]).clip(max=max(len(keys) - 1, 0))
+            found = keys[source] == hashes[target] if len(keys) else np.zeros(len(target), dtype=bool)
+            target, source = target[found], source[found]
+            for k, j in enumerate(text):
+                column = df.iloc[:, j]
+                values = column.to_numpy(dtype=object, copy=True)
+                restored = pd.Series([row[k] for row in rows], dtype=object).to_numpy()
+                take = np.fromiter((v is not None for v in restored), dtype=bool, count=len(rows))[source]
+                values[target[take]] = restored[source[take]]
+                changed = bool(take.any())
+                if cleaned_new is not None:
+                    before = values[new]
+                    after = cleaned_new.iloc[:, j].to_numpy(dtype=object)
+                    # only the cells present on both sides are compared, != is
+                    # ambiguous on pd.NA
+                    before_na, after_na = pd.isna(before), pd.isna(after)
+                    diff = before_na != after_na
+                    both = ~(before_na | after_na)
+                    diff[both] = before[both] != after[both]
+                    for n in np.flatnonzero(diff):
+                        if stored[n] is None:
+                            stored[n] = [None] * len(text)
+                        stored[n][k] = after[n]
+                    values[new] = after
+                    changed = changed or bool(diff.any())
+                if changed:
+                    dtype = "category" if isinstance(column.dtype, pd.CategoricalDtype) else column.dtype
+                    result.isetitem(j, pd.Series(values, index=df.index, name=column.name).astype(dtype))
+            index.add(hashes[new], stored)
+        finally:
+            if owned:
+                index.close()
+        return result
+
+    def _compiled_chain(self, fused: bool, uids=None, concurrent=False) -> list:
+        """
+        Internal utility function returning the chain to run, the fused spotters
+        are only built again when the chain changes
+        
+        Parameters
+        ----------
+        fused: bool or str
+            The fused mode, as in clean()
+        uids: tuple, optional
+            The uids of the spotters a plan runs on a column, the whole chain by default
+        concurrent: bool, optional
+            Whether to return the concurrent copies of the spotters, for the threads
+            (see Spotter.concurrentCopy()). The default is False.
+        
+        Returns
+        -------
+        The list of spotters to run, in chain order
+
+        Examples
+        --------
+        (called by clean(), clean_text(), clean_record() and clean_records())
+
+        """
+        if fused not in (False, True, "spans"):
+            raise ValueError("fused must be True, False or \"spans\" in clean")
+        if self.cache is not None and self._cache_fused != fused:
+            self.cache.clear()
+            self._cache_fused = fused
+        key = self._chain_key()
+        if self._chains[0] != key:
+            # the chain changed, possibly through the public chain list instead of
+            # add_spotter() and remove_spotter(), the cached values are stale
+            if self._chains[0] is not None and self.cache is not None:
+                self.cache.clear()
+            self._chains = (key, {})
+        chains = self._chains[1]
+        # the concurrent copies are kept apart from the chains of the serial runs
+        entry = (fused, uids, True) if concurrent else (fused, uids)
+        chain = chains.get(entry)
+        if chain is None:
+            if concurrent:
+                chain = [s.concurrentCopy() for s in self._compiled_chain(fused, uids)]
+            elif uids is not None:
+                chain = self._planned_chain(uids, fused)
+            else:
+                chain = self._fused_chain(fused=fused) if fused else list(self.chain)
+            chains[entry] = chain
+        return chain
+
+    def _chain_key(self) -> tuple:
+        """
+        Internal utility function, the spotters of the chain by identity
+        """
+        return tuple(id(s) for s in self.chain)
+
+    def _clean_text(self, text: str, chain: list) -> str:
+        """
+        Internal utility function running the chain on one string, through the
+        cache if there is one
+        
+        Parameters
+        ----------
+        text : str
+            The string to sanitize
+        chain : list
+            The spotters to run, from _compiled_chain()
+        
+        Returns
+        -------
+        The sanitized string
+
+        Examples
+        --------
+        (called by clean_text() and _clean_value())
+
+        """
+        if self.cache is not None:
+            cleaned = self.cache.get(text, _MISSING)
+            if cleaned is not _MISSING:
+                return cleaned
+        cleaned = text
+        for spotter in chain:
+            if spotter.mayContain(cleaned):
+                cleaned = spotter.process(cleaned)
+            else:
+                self.prefilter_skipped[spotter.getSpotterUID()] += 1
+        if self.cache is not None:
+            self.cache.put(text, cleaned)
+        return cleaned
+
+    def _clean_value(self, value, chain: list):
+        """
+        Internal utility function sanitizing the strings of a value, walking the
+        nested dicts, lists and tuples
+        
+        Parameters
+        ----------
+        value :
+            The value to sanitize
+        chain : list
+            The spotters to run, from _compiled_chain()
+        
+        Returns
+        -------
+        The sanitized copy of the value, the value itself if it holds no strings
+
+        Examples
+        --------
+        (called by clean_record() and clean_records())
+
+        """
+        if isinstance(value, str):
+            return self._clean_text(value, chain)
+        if isinstance(value, dict):
+            return {key: self._clean_value(item, chain) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._clean_value(item, chain) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._clean_value(item, chain) for item in value)
+        return value
+
+    def _clean_nested(self, column: pd.Series, nested, chain: list, verbose: bool, cached: bool, stats=None):
+        """
+        Internal utility function sanitizing the dicts, lists and tuples of a
+        column (e.g. the nested values of JSON lines), as clean_record(). Their
+        strings are gathered and run through the chain like the strings of a
+        column, so they are counted in the statistics, one by one
+        
+        Parameters
+        ----------
+        column : pd.Series
+            The column to sanitize
+        nested : np.ndarray
+            A boolean array, True for the cells holding a dict, a list or a tuple
+        chain : list
+            The spotters to run, in order
+        verbose: bool
+            The verbosity of the log
+        cached: bool
+            Whether the cache can be used, i.e. chain is the whole chain
+        stats: CleanStats, optional
+            The statistics to collect. The default is None.
+        
+        Returns
+        -------
+        The updated copy of the column, or None if no nested value changed
+
+        Examples
+        --------
+        (called by _clean_column())
+
+        """
+        positions = np.flatnonzero(nested)
+        values = column.iloc[positions]
+        strings = []
+        for value in values:
+            _gather_strings(value, strings)
+        if not strings:
+            return None
+        text = pd.Series(strings, dtype=object)
+        if self.cache is not None and cached:
+            done = self._run_chain_cached(text, chain, column.name, verbose, stats)
+        else:
+            done = self._run_chain(text, chain, column.name, verbose, stats)
+        if done is text or done.equals(text):
+            return None
+        replacements = iter(done.tolist())
+        cleaned = pd.Series([_replace_strings(value, replacements) for value in values], dtype=object)
+        changed = np.fromiter((new != old for new, old in zip(cleaned, values)), dtype=bool, count=len(values))
+        mask = np.zeros(len(column), dtype=bool)
+        mask[positions[changed]] = True
+        return self._put(column, mask, cleaned[changed])
+
+    def _clean_columns(self, df: pd.DataFrame, verbose: bool, fused: bool, plan: CleaningPlan, stats: CleanStats) -> dict:
+        """
+        Internal utility function sanitizing the columns of the data frame in the
+        current process, df is left untouched
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        verbose: bool
+            The verbosity of the log
+        fused: bool
+            Whether to fuse the spotters of the chain
+        plan: CleaningPlan
+            The columns to clean and their spotters, or None for all of them
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        A dict mapping the position of every column that changed to its sanitized copy
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        changed = {}
+        # iterate thru the columns once
+        for j, chain in self._column_chains(df, fused, plan).items():
+            # the cached values are only valid for the whole chain
+            cached = plan is None or len(plan.columns[j]) == len(self.chain)
+            cleaned = self._clean_column(df.iloc[:, j], chain, verbose, cached, stats)
+            if cleaned is not None:
+                changed[j] = cleaned
+        return changed
+
+    def _column_chains(self, df: pd.DataFrame, fused: bool, plan: CleaningPlan, concurrent=False) -> dict:
+        """
+        Internal utility function getting the columns to clean and their spotters
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        fused: bool or str
+            The fused mode, as in clean()
+        plan: CleaningPlan
+            The columns to clean and their spotters, or None for all of them
+        concurrent: bool, optional
+            Whether to run the concurrent copies of the spotters. The default is False.
+        
+        Returns
+        -------
+        A dict mapping the position of every column to clean to its spotters
+
+        Examples
+        --------
+        (called by _clean_columns() and _clean_threaded())
+
+        """
+        if plan is None:
+            chain = self._compiled_chain(fused, concurrent=concurrent)
+            # only the columns that can hold strings are handed to the spotters
+            return {j: chain for j in range(df.shape[1]) if self._is_text_column(df.iloc[:, j])}
+        return {j: self._compiled_chain(fused, uids, concurrent) for j, uids in plan.columns.items()}
+
+    def _clean_threaded(self, df: pd.DataFrame, n_jobs: int, executor, verbose: bool, fused: bool, plan: CleaningPlan,
+                        stats: CleanStats) -> dict:
+        """
+        Internal utility function sanitizing blocks of rows of the columns of the
+        data frame on threads, df is left untouched
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        n_jobs: int
+            The number of threads
+        executor: concurrent.futures.Executor
+            The thread pool to use, or None to start a ThreadPoolExecutor
+        verbose: bool
+            The verbosity of the log
+        fused: bool or str
+            The fused mode, as in clean()
+        plan: CleaningPlan
+            The columns to clean and their spotters, or None for all of them
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        A dict mapping the position of every column that changed to its sanitized copy
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        if isinstance(executor, futures.ProcessPoolExecutor):
+            raise ValueError("executor must run threads with backend=\"threads\" in clean")
+        columns = self._column_chains(df, fused, plan, concurrent=True)
+        if not columns:
+            return {}
+        # a few blocks per thread, so a slow block does not hold up the others
+        n_blocks = -(-n_jobs * 4 // len(columns))
+        blocks = []
+        for j, chain in columns.items():
+            column = df.iloc[:, j]
+            # a categorical column is cleaned through its categories, in one block
+            k = 1 if isinstance(column.dtype, pd.CategoricalDtype) else max(1, min(n_blocks, len(column) // _THREAD_BLOCK))
+            bounds = [len(column) * i // k for i in range(k + 1)]
+            blocks.extend((j, column.iloc[start:stop], chain) for start, stop in zip(bounds[:-1], bounds[1:]))
+
+        def clean_block(block):
+            j, column, chain = block
+            # every thread counts in its own copy, the counters are merged at the end
+            worker = shallow_copy(self)
+            worker.prefilter_skipped = Counter()
+            worker.cache = None
+            worker_stats = CleanStats(stats.count_matches) if stats is not None else None
+            return j, column, worker._clean_column(column, chain, verbose, False, worker_stats), worker, worker_stats
+
+        if executor is None:
+            with futures.ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(clean_block, blocks))
+        else:
+            results = list(executor.map(clean_block, blocks))
+        pieces = {}
+        for j, column, cleaned, worker, worker_stats in results:
+            self._merge_counters(worker)
+            if stats is not None:
+                stats.merge(worker_stats)
+            pieces.setdefault(j, []).append((column, cleaned))
+        changed = {}
+        for j, parts in pieces.items():
+            if any(cleaned is not None for _, cleaned in parts):
+                changed[j] = pd.concat([column if cleaned is None else cleaned for column, cleaned in parts])
+        return changed
+
+    def _planned_chain(self, uids: tuple, fused: bool) -> list:
+        """
+        Internal utility function getting the spotters a plan runs on a column
+        
+        Parameters
+        ----------
+        uids : tuple
+            The uids of the spotters, in chain order
+        fused: bool
+            Whether to fuse the spotters
+        
+        Returns
+        -------
+        The list of spotters to run
+
+        Examples
+        --------
+        (called by _compiled_chain())
+
+        """
+        spotters = {s.getSpotterUID(): s for s in self.chain}
+        missing = [uid for uid in uids if uid not in spotters]
+        if missing:
+            raise ValueError(f"spotters {missing} of the plan are not in the chain in clean")
+        chain = [spotters[uid] for uid in uids]
+        return self._fused_chain(chain, fused) if fused else chain
+
+    def _clean_parallel(self, df: pd.DataFrame, n_jobs: int, executor, stats: CleanStats, **options) -> pd.DataFrame:
+        """
+        Internal utility function sanitizing chunks of rows of the data frame in
+        worker processes and stitching them back in order
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to sanitize
+        n_jobs: int
+            The number of workers
+        executor: concurrent.futures.Executor
+            The executor to use, or None to start a ProcessPoolExecutor
+        stats: CleanStats
+            The statistics to collect from the workers, or None
+        options: 
+            The options of clean() used to clean every chunk
+        
+        Returns
+        -------
+        The sanitized data frame, with the index and dtypes of df
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        # a few chunks per worker, so a slow chunk does not hold up the others
+        n_chunks = min(len(df), n_jobs * 4)
+        options["return_stats"] = stats is not None
+        options["count_matches"] = stats is None or stats.count_matches
+        if n_chunks <= 1:
+            return self._unpack_stats(self.clean(df, **options), stats)
+        bounds = [len(df) * k // n_chunks for k in range(n_chunks + 1)]
+        chunks = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        if executor is None or isinstance(executor, futures.ProcessPoolExecutor):
+            workers = [self] * n_chunks
+        else:
+            # the tasks of other executors (e.g. threads) may share the objects they
+            # get, every task resets the counters and the cache of its own copy
+            workers = [shallow_copy(self) for _ in range(n_chunks)]
+        args = (workers, chunks, [options] * n_chunks)
+        if executor is None:
+            with futures.ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_clean_chunk, *args))
+        else:
+            results = list(executor.map(_clean_chunk, *args))
+        for _, worker in results:
+            self._merge_counters(worker)
+        return pd.concat([self._unpack_stats(chunk, stats) for chunk, _ in results])
+
+    @staticmethod
+    def _unpack_stats(result, stats: CleanStats) -> pd.DataFrame:
+        """
+        Internal utility function merging the statistics returned by clean() on a
+        chunk into stats
+        
+        Parameters
+        ----------
+        result : pd.DataFrame or tuple
+            What clean() returned, a tuple of the chunk and its CleanStats when
+            stats is not None
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        The sanitized chunk
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        if stats is None:
+            return result
+        chunk, chunk_stats = result
+        stats.merge(chunk_stats)
+        return chunk
+
+    def _merge_counters(self, worker: "Cleanser") -> None:
+        """
+        Internal utility function adding the counters of the copy of the Cleanser
+        used by a worker process to this Cleanser
+        
+        Parameters
+        ----------
+        worker : Cleanser
+            The copy returned by the worker
+        
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        self.prefilter_skipped.update(worker.prefilter_skipped)
+        if self.cache is not None and worker.cache is not None:
+            self.cache.merge_stats(worker.cache)
+
+    def _is_text_column(self, column: pd.Series) -> bool:
+        """
+        Internal utility function to check whether a column can hold strings
+        
+        Parameters
+        ----------
+        column : pd.Series
+            The column to check
+        
+        Returns
+        -------
+        True if the column is of object, string, Arrow string or categorical dtype,
+        False otherwise
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        dtype = column.dtype
+        return (pd.api.types.is_object_dtype(dtype)
+                or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+                or arrow.is_arrow_string(dtype))
+
+    def _clean_column(self, column: pd.Series, chain: list, verbose: bool, cached=True, stats=None):
+        """
+        Internal utility function to run the spotters over a whole column
+        
+        Parameters
+        ----------
+        column : pd.Series
+            The column to sanitize, as returned by _is_text_column()
+        chain : list
+            The spotters to run, in order
+        verbose: bool
+            The verbosity of the log
+        cached: bool, optional
+            Whether the cache can be used, i.e. chain is the whole chain. The default is True.
+        stats: CleanStats, optional
+            The statistics to collect. The default is None.
+        
+        Returns
+        -------
+        The sanitized column, or None if the column holds no strings or did not change
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return self._clean_categorical(column, chain, verbose, cached, stats)
+        if arrow.is_arrow_string(column.dtype):
+            cleaned = self._clean_arrow(arrow.to_arrow(column), chain, column.name, verbose, stats)
+            return None if cleaned is None else arrow.to_series(cleaned, column)
+        # only string cells are redacted, everything else (numbers, None, NaN)
+        # is left as is
+        base = column
+        # a string dtype column with missing values still goes through the mask,
+        # the spotters are only handed strings
+        if pd.api.types.infer_dtype(column, skipna=False) == "string" and not column.hasnans:
+            mask = None
+            text = column
+        elif pd.api.types.infer_dtype(column, skipna=True) in NO_STRINGS:
+            return None
+        else:
+            # the strings nested in dicts and lists (JSON objects and arrays) are
+            # sanitized like records
+            nested = column.map(lambda cell: isinstance(cell, (dict, list, tuple))).to_numpy(dtype=bool, na_value=False)
+            if nested.any():
+                cleaned_nested = self._clean_nested(column, nested, chain, verbose, cached, stats)
+                if cleaned_nested is not None:
+                    base = cleaned_nested
+            mask = column.map(lambda cell: isinstance(cell, str)).to_numpy(dtype=bool, na_value=False)
+            if not mask.any():
+                return None if base is column else base
+            text = column[mask]
+        if self.cache is not None and cached:
+            cleaned = self._run_chain_cached(text, chain, column.name, verbose, stats)
+        else:
+            cleaned = self._run_chain(text, chain, column.name, verbose, stats)
+        # the column is not replaced when the spotters left it as it was
+        if cleaned is text or cleaned.equals(text):
+            return None if base is column else base
+        if mask is None:
+            return cleaned
+        return self._put(base, mask, cleaned)
+
+    def _clean_categorical(self, column: pd.Series, chain: list, verbose: bool, cached: bool, stats: CleanStats):
+        """
+        Internal utility function sanitizing a categorical column, only its
+        categories go through the spotters instead of every row
+        
+        Parameters
+        ----------
+        column : pd.Series
+            The categorical column to sanitize
+        chain : list
+            The spotters to run, in order
+        verbose: bool
+            The verbosity of the log
+        cached: bool
+            Whether the cache can be used
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        The sanitized categorical column, or None if no category changed
+
+        Examples
+        --------
+        (called by _clean_column())
+
+        """
+        categories = pd.Series(column.cat.categories, name=column.name)
+        cleaned = self._clean_column(categories, chain, verbose, cached, stats)
+        if cleaned is None or cleaned.equals(categories):
+            return None
+        # different categories can be cleaned to the same value, they are merged
+        codes = column.cat.codes.to_numpy()
+        inverse, uniques = pd.factorize(cleaned)
+        new_codes = np.where(codes >= 0, inverse[codes], -1)
+        values = pd.Categorical.from_codes(new_codes, categories=uniques, ordered=column.cat.ordered)
+        return pd.Series(values, index=column.index, name=column.name)
+
+    def _clean_table(self, table, verbose: bool, fused: bool, stats: CleanStats):
+        """
+        Internal utility function sanitizing the string columns of a pyarrow Table
+        
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The table to sanitize, it is left untouched
+        verbose: bool
+            The verbosity of the log
+        fused: bool
+            Whether to fuse the spotters of the chain
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        The sanitized table, sharing the columns that did not change with table
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        chain = self._compiled_chain(fused)
+        for j, field in enumerate(table.schema):
+            if not arrow.is_string_type(field.type):
+                continue
+            cleaned = self._clean_arrow(table.column(j), chain, field.name, verbose, stats)
+            if cleaned is not None:
+                table = table.set_column(j, field, cleaned)
+        return table
+
+    def _clean_arrow(self, data, chain: list, name, verbose: bool, stats: CleanStats):
+        """
+        Internal utility function running the spotters over the chunks of an Arrow
+        array of strings
+        
+        Parameters
+        ----------
+        data : pyarrow.Array or pyarrow.ChunkedArray
+            The strings to sanitize
+        chain : list
+            The spotters to run, in order
+        name : str
+            The name of the column, for the log and the statistics
+        verbose: bool
+            The verbosity of the log
+        stats: CleanStats
+            The statistics to collect, or None
+        
+        Returns
+        -------
+        The sanitized pyarrow.ChunkedArray, or None if nothing changed
+
+        Examples
+        --------
+        (called by _clean_column() and _clean_table())
+
+        """
+        pa, _ = arrow._import_pyarrow()
+        chunks = data.chunks if isinstance(data, pa.ChunkedArray) else [data]
+        cleaned = [self._run_chain_arrow(chunk, chain, name, verbose, stats) for chunk in chunks]
+        if all(new is old for new, old in zip(cleaned, chunks)):
+            return None
+        return pa.chunked_array(cleaned, type=data.type)
+
+    def _run_chain_arrow(self, array, chain: list, name, verbose: bool, stats=None):
+        """
+        Internal utility function running the spotters one after the other over an
+        Arrow array. Only the cells kept by the prefilter of a spotter are handed to
+        it, and its output is scattered back into the array
+        
+        Parameters
+        ----------
+        array : pyarrow.Array
+            The strings to sanitize, nulls included
+        chain : list
+            The spotters to run, in order
+        name : str
+            The name of the column, for the log and the statistics
+        verbose: bool
+            The verbosity of the log
+        stats: CleanStats, optional
+            The statistics to collect, the matches are not counted. The default is None.
+        
+        Returns
+        -------
+        The sanitized pyarrow.Array, array itself if no spotter ran
+
+        Examples
+        --------
+        (called by _clean_arrow())
+
+        """
+        _, pc = arrow._import_pyarrow()
+        for spotter in chain:
+            uid = spotter.getSpotterUID()
+            start = time.perf_counter() if stats is not None else 0.0
+            candidates = spotter.mayContainArrow(array)
+            if candidates is None:
+                candidates = pc.is_valid(array)
+            count = pc.sum(candidates).as_py() or 0
+            scanned = len(array) - array.null_count
+            skipped = scanned - count
+            if skipped:
+                self.prefilter_skipped[uid] += skipped
+            changed = 0
+            if count:
+                self._log(f"{uid}: Processing column {name} ({count} cells) ", verbose)
+                todo = array if count == len(array) else pc.filter(array, candidates)
+                done = spotter.processArrow(todo)
+                if stats is not None:
+                    changed = pc.sum(pc.not_equal(todo, done)).as_py() or 0
+                array = done if todo is array else pc.replace_with_mask(array, candidates, done)
+                self._log(f"{uid}: Processed column {name} ", verbose)
+            if stats is not None:
+                stats.add(name, uid, scanned, skipped, changed, None, time.perf_counter() - start)
+        return array
+
+    def _run_chain(self, text: pd.Series, chain: list, name, verbose: bool, stats=None) -> pd.Series:
+        """
+        Internal utility function running the spotters over a series of strings
+        
+        Parameters
+        ----------
+        text : pd.Series
+            The strings to sanitize
+        chain : list
+            The spotters to run, in order
+        name : str
+            The name of the column, for the log and the statistics
+        verbose: bool
+            The verbosity of the log
+        stats: CleanStats, optional
+            The statistics to collect. The default is None.
+        
+        Returns
+        -------
+        The sanitized strings
+
+        Examples
+        --------
+        (called by _clean_column())
+
+        """
+        for spotter in chain:
+            uid = spotter.getSpotterUID()
+            start = time.perf_counter() if stats is not None else 0.0
+            # the cells rejected by the prefilter are not handed to the spotter
+            candidates = spotter.mayContainSeries(text)
+            skipped = 0
+            if candidates is None or candidates.all():
+                todo = text
+            else:
+                skipped = int(len(candidates) - candidates.sum())
+                self.prefilter_skipped[uid] += skipped
+                todo = text[candidates] if skipped < len(candidates) else None
+            done = None
+            if todo is not None:
+                self._log(f"{uid}: Processing column {name} ({len(todo)} cells) ", verbose)
+                done = spotter.processSeries(todo)
+                self._log(f"{uid}: Processed column {name} ", verbose)
+            scanned = len(text)
+            if done is not None:
+                text = done if todo is text else self._put(text, candidates, done)
+            if stats is not None:
+                seconds = time.perf_counter() - start
+                changed = 0
+                matches = 0 if stats.count_matches else None
+                if done is not None:
+                    changed = int((todo.to_numpy(dtype=object) != done.to_numpy(dtype=object)).sum())
+                    if stats.count_matches:
+                        matches = spotter.countMatches(todo)
+                stats.add(name, uid, scanned, skipped, changed, matches, seconds)
+        return text
+
+    def _run_chain_cached(self, text: pd.Series, chain: list, name, verbose: bool, stats=None) -> pd.Series:
+        """
+        Internal utility function running the spotters once per distinct string,
+        looking the strings up in the cache first
+        
+        Parameters
+        ----------
+        text : pd.Series
+            The strings to sanitize
+        chain : list
+            The spotters to run, in order
+        name : str
+            The name of the column, for the log and the statistics
+        verbose: bool
+            The verbosity of the log
+        stats: CleanStats, optional
+            The statistics to collect. The default is None.
+        
+        Returns
+        -------
+        The sanitized strings
+
+        Examples
+        --------
+        (called by _clean_column())
+
+        """
+        codes, uniques = pd.factorize(text)
+        uniques = np.asarray(uniques, dtype=object)
+        results = np.empty(len(uniques), dtype=object)
+        missing = []
+        for k, value in enumerate(uniques):
+            cached = self.cache.get(value, _MISSING)
+            if cached is _MISSING:
+                missing.append(k)
+            else:
+                results[k] = cached
+        if missing:
+            todo = pd.Series(uniques[missing], dtype=text.dtype)
+            done = self._run_chain(todo, chain, name, verbose, stats).to_numpy(dtype=object)
+            results[missing] = done
+            for k, value in zip(missing, done):
+                self.cache.put(uniques[k], value)
+        cleaned = results[codes]
+        # factorize gives the missing values the code -1, they are kept as they are
+        absent = codes == -1
+        cleaned[absent] = text.to_numpy(dtype=object)[absent]
+        return pd.Series(cleaned, index=text.index, name=text.name, dtype=text.dtype)
+
+    def _put(self, series: pd.Series, mask, values: pd.Series) -> pd.Series:
+        """
+        Internal utility function returning a copy of the series with the masked
+        cells replaced, by position
+        
+        Parameters
+        ----------
+        series : pd.Series
+            The series to copy
+        mask : np.ndarray
+            A boolean array, True for the cells to replace
+        values : pd.Series
+            The new values of the masked cells, in order
+        
+        Returns
+        -------
+        The updated copy of the series, with the same index and dtype
+
+        Examples
+        --------
+        (called by clean())
+
+        """
+        new_values = series.to_numpy(dtype=object, copy=True)
+        new_values[mask] = values.to_numpy(dtype=object)
+        return pd.Series(new_values, index=series.index, name=series.name, dtype=series.dtype)
+
+
+def _gather_strings(value, strings: list) -> None:
+    """
+    Internal utility function appending the strings of a value to strings,
+    walking the nested dicts, lists and tuples in the order of _replace_strings()
+    """
+    if isinstance(value, str):
+        strings.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _gather_strings(item, strings)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _gather_strings(item, strings)
+
+
+def _replace_strings(value, replacements):
+    """
+    Internal utility function copying a value with its strings taken in turn
+    from the replacements iterator, as gathered by _gather_strings()
+    """
+    if isinstance(value, str):
+        return next(replacements)
+    if isinstance(value, dict):
+        return {key: _replace_strings(item, replacements) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_strings(item, replacements) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_replace_strings(item, replacements) for item in value)
+    return value
+
+
+# marks the strings not found in the cache
+_MISSING = object()
+# the minimum number of rows of the blocks cleaned by the threads
+_THREAD_BLOCK = 1000
+
+
+def _clean_chunk(cleanser: Cleanser, chunk: pd.DataFrame, options: dict):
+    """
+    Worker entry point of Cleanser.clean() with n_jobs, sanitizes one chunk of rows
+    
+    Parameters
+    ----------
+    cleanser : Cleanser
+        The (unpickled copy of the) Cleanser to use
+    chunk : pd.DataFrame
+        The rows to sanitize
+    options : dict
+        The options of clean()
+    
+    Returns
+    -------
+    The sanitized chunk and the worker copy of the Cleanser, holding the counters
+    collected while cleaning it
+
+    Examples
+    --------
+    (called by Cleanser.clean())
+
+    """
+    cleanser.prefilter_skipped = Counter()
+    if cleanser.cache is not None:
+        cleanser.cache = MemoCache(cleanser.cache.maxsize, cleanser.cache.policy)
+    return cleanser.clean(chunk, copy=False, **options), cleanser
@@ -0,0 +1,264 @@
+from __future__ import annotations
+import argparse
+import io
+import os
+import sys
+import time
+from sanityze import streaming
+from sanityze.lazy import LazyModule
+futures = LazyModule("concurrent.futures")
+
+# the spotters selectable with --spotters
+SPOTTERS = ("email", "creditcard")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    The parser of the command line arguments of the sanityze command
+
+    Returns
+    -------
+    The argparse.ArgumentParser
+
+    Examples
+    --------
+    (called by main())
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="sanityze",
+        description="Redact the PII of CSV, JSON lines, Parquet or text files and write them to stdout. "
+                    "The files are read chunk by chunk, so memory use is bounded by --chunksize.")
+    parser.add_argument("files", nargs="*", metavar="FILE",
+                        help="the files to redact, in order. Reads stdin when there is none or for -")
+    parser.add_argument("-f", "--format", choices=sorted(set(streaming.FORMATS.values())),
+                        help="the format of the input and the output, inferred from the extension of the "
+                             "files by default. stdin is read as text unless set")
+    parser.add_argument("-s", "--spotters", default=",".join(SPOTTERS),
+                        help=f"comma separated spotters to run, among {', '.join(SPOTTERS)}. Default: all")
+    parser.add_argument("--terms", metavar="FILE",
+                        help="a file of terms to redact (names, account ids...), one per line, "
+                             "replaced by TERM")
+    parser.add_argument("--hash", action="store_true",
+                        help="replace the spotted values by their hash instead of the spotter uid")
+    parser.add_argument("--hash-algorithm", choices=("md5", "blake2b"), default="md5",
+                        help="the hash algorithm of --hash. Default: md5")
+    parser.add_argument("--hash-key-env", metavar="VAR",
+                        help="the environment variable holding the secret key of blake2b, so the key "
+                             "does not show in the process list")
+    merging = parser.add_mutually_exclusive_group()
+    merging.add_argument("--fused", action="store_true",
+                         help="scan every cell once for all the regex based spotters")
+    merging.add_argument("--spans", action="store_true",
+                         help="apply the replacements of all the regex based spotters to every cell at once")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="the number of worker processes, -1 for all the CPUs. Default: 1")
+    parser.add_argument("--threads", action="store_true",
+                        help="run the --jobs workers as threads instead of processes, for the "
+                             "environments that cannot start processes")
+    parser.add_argument("-c", "--chunksize", type=int, default=100_000,
+                        help="the number of rows (lines for text) read and cleaned at a time. Default: 100000")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="do not print the throughput summary to stderr")
+    return parser
+
+
+def build_cleanser(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """
+    The Cleanser running the spotters selected on the command line
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed arguments
+    parser : argparse.ArgumentParser
+        The parser, reporting the invalid arguments
+
+    Returns
+    -------
+    The Cleanser
+
+    Examples
+    --------
+    (called by main())
+
+    """
+    from sanityze.cleanser import Cleanser
+    from sanityze.spotters import CreditCardSpotter, DictionarySpotter, EmailSpotter
+    names = [name.strip().lower() for name in args.spotters.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SPOTTERS))
+    if unknown:
+        parser.error(f"unknown spotters {', '.join(unknown)}, use {', '.join(SPOTTERS)}")
+    key = None
+    if args.hash_key_env is not None:
+        key = os.environ.get(args.hash_key_env)
+        if key is None:
+            parser.error(f"the environment variable {args.hash_key_env} is not set")
+    if key is not None and args.hash_algorithm != "blake2b":
+        parser.error("a hash key can only be used with --hash-algorithm blake2b")
+    hashing = (args.hash, args.hash_algorithm, key)
+    cleanser = Cleanser(include_default_spotters=False)
+    if "email" in names:
+        cleanser.add_spotter(EmailSpotter("EMAILS", *hashing))
+    if "creditcard" in names:
+        cleanser.add_spotter(CreditCardSpotter("CREDITCARDS", *hashing))
+    if args.terms is not None:
+        with open(args.terms, encoding="utf-8") as terms:
+            cleanser.add_spotter(DictionarySpotter("TERM", terms.read().splitlines(), hashSpotted=args.hash,
+                                                   hashAlgorithm=args.hash_algorithm, hashKey=key))
+    if not cleanser.chain:
+        parser.error("no spotter selected")
+    return cleanser
+
+
+def open_input(path: str, file_format: str):
+    """
+    The source read_chunks() reads a file or stdin ("-") from. Parquet needs to
+    seek to its footer, so it is read from stdin into memory first
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, or "-" for stdin
+    file_format : str
+        The format of the file
+
+    Returns
+    -------
+    A path or a file-like
+
+    Examples
+    --------
+    (called by main())
+
+    """
+    if path != "-":
+        return path
+    if file_format == "parquet":
+        return io.BytesIO(sys.stdin.buffer.read())
+    return sys.stdin
+
+
+def summary(rows: int, size, seconds: float, stats) -> str:
+    """
+    The throughput summary printed at the end of a run
+
+    Parameters
+    ----------
+    rows : int
+        The number of rows written
+    size : int
+        The number of bytes read, None when unknown (stdin)
+    seconds : float
+        The wall clock time of the run
+    stats : CleanStats
+        The statistics of the run
+
+    Returns
+    -------
+    The summary, one line per spotter after the totals
+
+    Examples
+    --------
+    >>> print(summary(20, 2048, 0.01, stats))
+    sanityze: 20 rows, 2.0 KiB in 0.010 s, 2,000 rows/s, 0.20 MiB/s
+      EMAILADDRS  20 cells changed
+      CREDITCARD  3 cells changed
+
+    """
+    seconds = max(seconds, 1e-9)
+    line = f"sanityze: {rows:,} rows"
+    if size is not None:
+        line += f", {size / 1024:,.1f} KiB"
+    line += f" in {seconds:.3f} s, {rows / seconds:,.0f} rows/s"
+    if size is not None:
+        line += f", {size / 1024 ** 2 / seconds:,.2f} MiB/s"
+    lines = [line]
+    by_spotter = {}
+    for (_, uid), record in stats.records.items():
+        by_spotter[uid] = by_spotter.get(uid, 0) + record.changed
+    width = max((len(uid) for uid in by_spotter), default=0)
+    for uid, changed in by_spotter.items():
+        lines.append(f"  {uid:<{width}}  {changed:,} cells changed")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """
+    The sanityze command: redact files or stdin to stdout
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The arguments, sys.argv[1:] by default
+
+    Returns
+    -------
+    The exit status
+
+    Examples
+    --------
+    $ sanityze --hash --jobs 8 export.csv > export_clean.csv
+    $ tail -f app.log | sanityze --chunksize 1 --quiet
+
+    """
+    from sanityze.stats import CleanStats
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunksize < 1:
+        parser.error("--chunksize must be a positive integer")
+    jobs = (os.cpu_count() or 1) if args.jobs == -1 else args.jobs
+    if jobs < 1:
+        parser.error("--jobs must be -1 or a positive integer")
+    paths = args.files or ["-"]
+    formats = []
+    for path in paths:
+        if args.format is not None:
+            formats.append(args.format)
+        elif path == "-":
+            formats.append("text")
+        else:
+            try:
+                formats.append(streaming.infer_format(path))
+            except ValueError as e:
+                parser.error(f"{e} with --format")
+    if len(set(formats)) > 1:
+        parser.error("the files must all have the same format, they are written to a single output")
+    cleanser = build_cleanser(args, parser)
+    output = sys.stdout.buffer if formats[0] == "parquet" else sys.stdout
+    fused = "spans" if args.spans else args.fused
+    stats = CleanStats()
+    size = 0
+    start = time.perf_counter()
+    backend = "threads" if args.threads else "processes"
+    pool_class = futures.ThreadPoolExecutor if args.threads else futures.ProcessPoolExecutor
+    pool = pool_class(max_workers=jobs) if jobs > 1 else None
+    try:
+        with streaming.ChunkWriter(output, formats[0]) as writer:
+            for path, file_format in zip(paths, formats):
+                size = None if size is None or path == "-" else size + os.path.getsize(path)
+                for chunk in streaming.read_chunks(open_input(path, file_format), file_format, args.chunksize):
+                    # the summary only needs the changed cells, the matches are not counted
+                    cleaned = cleanser.clean(chunk, fused=fused, n_jobs=jobs, executor=pool, copy=False,
+                                             on_stats=None if args.quiet else stats.merge, backend=backend,
+                                             count_matches=False)
+                    writer.write(cleaned)
+                    output.flush()
+    except BrokenPipeError:
+        # the reader of stdout went away (e.g. head), stop quietly without
+        # failing again when stdout is flushed at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"sanityze: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not args.quiet:
+        print(summary(writer.rows, size, time.perf_counter() - start, stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
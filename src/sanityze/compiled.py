@@ -0,0 +1,186 @@
+from __future__ import annotations
+import copy
+import pickle
+from sanityze.lazy import LazyModule
+pd = LazyModule("pandas")
+
+
+class CompiledCleanser:
+    """
+    A frozen copy of a Cleanser built by Cleanser.compile(): its chain was
+    validated, the patterns and prefilters of the spotters are compiled and the
+    fused spotters and the chains of the plan are built once. It cannot be
+    modified, later changes to the Cleanser do not affect it, and it pickles with
+    everything it precomputed, so worker processes and the next batch jobs load
+    it ready to run
+
+    Attributes
+    ----------
+    spotters : tuple
+        The uids of the spotters, in chain order
+    fused : bool or str
+        The fused mode, as in Cleanser.clean()
+    plan : CleaningPlan
+        The plan the data frames are cleaned with, None for every text column
+    fingerprint : str
+        The fingerprint of the chain, see Cleanser.fingerprint()
+
+    Methods
+    -------
+    clean(df)
+        return the sanitized data frame
+
+    clean_text(text)
+        return the sanitized string
+
+    save(path)
+        write the compiled cleanser to a file
+
+    load(path)
+        read a compiled cleanser from a file
+
+    Examples
+    --------
+    >>> compiled = Cleanser(hash_spotted=True).compile(fused=True)
+    >>> compiled.save("cleanser.pkl")
+    >>> CompiledCleanser.load("cleanser.pkl").clean(df)
+
+    """
+    def __init__(self, cleanser, fused=False, plan=None):
+        cleanser = copy.deepcopy(cleanser)
+        cleanser.prefilter_skipped.clear()
+        if cleanser.cache is not None:
+            cleanser.cache.clear()
+        uids = [s.getSpotterUID() for s in cleanser.chain]
+        if not uids:
+            raise ValueError("the chain is empty in compile")
+        if len(set(uids)) != len(uids):
+            raise ValueError(f"the uids of the spotters {uids} are not unique in compile")
+        for spotter in cleanser.chain:
+            try:
+                if spotter.pattern is not None:
+                    spotter.getPattern()
+                if spotter.prefilter is not None:
+                    spotter.getPrefilter()
+            except Exception as e:
+                raise ValueError(f"the patterns of spotter {spotter.getSpotterUID()} do not compile in compile: {e}") from e
+        # build the chains once, they are pickled with the Cleanser
+        cleanser._compiled_chain(fused)
+        if plan is not None:
+            for columns_uids in plan.columns.values():
+                cleanser._compiled_chain(fused, columns_uids)
+        object.__setattr__(self, "_cleanser", cleanser)
+        object.__setattr__(self, "spotters", tuple(uids))
+        object.__setattr__(self, "fused", fused)
+        object.__setattr__(self, "plan", plan)
+        object.__setattr__(self, "fingerprint", cleanser.fingerprint(fused))
+        try:
+            pickle.dumps(self)
+        except Exception as e:
+            raise ValueError(f"the chain cannot be pickled in compile: {e}") from e
+
+    def __setattr__(self, name, value):
+        raise AttributeError("a CompiledCleanser cannot be modified, compile the Cleanser again")
+
+    def __delattr__(self, name):
+        raise AttributeError("a CompiledCleanser cannot be modified, compile the Cleanser again")
+
+    def __repr__(self) -> str:
+        return f"CompiledCleanser(spotters={self.spotters!r}, fused={self.fused!r}, plan={self.plan is not None})"
+
+    def clean(self, df: pd.DataFrame, verbose=False, n_jobs=1, executor=None, inplace=False, copy=True,
+              return_stats=False, on_stats=None, backend="processes", count_matches=True):
+        """
+        Sanitizes the data frame with the compiled chain, see Cleanser.clean()
+
+        Parameters
+        ----------
+        df : pd.DataFrame or pyarrow.Table
+            The data frame to sanitize, with the schema of the plan if there is one
+        verbose, n_jobs, executor, inplace, copy, return_stats, on_stats, backend, count_matches : optional
+            As in Cleanser.clean()
+
+        Returns
+        -------
+        The sanitized data frame, as Cleanser.clean()
+
+        """
+        return self._cleanser.clean(df, verbose, self.fused, n_jobs, executor, inplace, copy, self.plan,
+                                    return_stats, on_stats, backend, count_matches)
+
+    def clean_text(self, text: str) -> str:
+        """
+        Sanitizes a single string, see Cleanser.clean_text()
+
+        Parameters
+        ----------
+        text : str
+            The string to sanitize
+
+        Returns
+        -------
+        The sanitized string
+
+        """
+        return self._cleanser.clean_text(text, self.fused)
+
+    def clean_records(self, records: list) -> list:
+        """
+        Sanitizes a list of records, see Cleanser.clean_records()
+
+        Parameters
+        ----------
+        records : list of dict
+            The records to sanitize
+
+        Returns
+        -------
+        The list of the sanitized records
+
+        """
+        return self._cleanser.clean_records(records, self.fused)
+
+    def save(self, path) -> None:
+        """
+        Write the compiled cleanser to a file with pickle
+
+        Parameters
+        ----------
+        path : str or file-like
+            The file to write
+
+        Returns
+        -------
+        None
+
+        """
+        if hasattr(path, "write"):
+            pickle.dump(self, path, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path) -> "CompiledCleanser":
+        """
+        Read a compiled cleanser written by save(). Like any pickle, only load
+        files from a trusted source
+
+        Parameters
+        ----------
+        path : str or file-like
+            The file to read
+
+        Returns
+        -------
+        The CompiledCleanser
+
+        """
+        if hasattr(path, "read"):
+            compiled = pickle.load(path)
+        else:
+            with open(path, "rb") as f:
+                compiled = pickle.load(f)
+        if not isinstance(compiled, CompiledCleanser):
+            raise TypeError(f"{path} does not hold a CompiledCleanser in load")
+        return compiled
@@ -0,0 +1,283 @@
+from __future__ import annotations
+import array
+import re
+import sys
+import _sre
+try:
+    from re import _compiler as _sre_compiler, _parser as _sre_parser
+except ImportError:
+    # before Python 3.11
+    import sre_compile as _sre_compiler, sre_parse as _sre_parser
+from sanityze.lazy import LazyModule
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# the re flags and their names in the regex module, where some values differ
+_FLAGS = ("IGNORECASE", "MULTILINE", "DOTALL", "VERBOSE", "ASCII", "UNICODE")
+
+# the programs of the re engine are only valid for the interpreter that built them
+_PROGRAM_VERSION = (sys.implementation.name, sys.version_info[:2], getattr(_sre, "MAGIC", None), _sre.CODESIZE)
+_CODE_TYPE = next((code for code in "IL" if array.array(code).itemsize == _sre.CODESIZE), None)
+
+
+def _import_regex():
+    """
+    Import the regex module, an optional dependency, None if it is not installed
+    """
+    try:
+        import regex
+    except ImportError:
+        return None
+    return regex
+
+
+def has_concurrent() -> bool:
+    """
+    Check whether the patterns can run without holding the GIL
+
+    Returns
+    -------
+    True if the regex module is installed
+
+    """
+    return _import_regex() is not None
+
+
+class ConcurrentPattern:
+    """
+    A pattern compiled with the regex module, whose matching releases the GIL so
+    several threads can scan strings at the same time (the Python callbacks of
+    the replacements still take it). It offers the methods of re.Pattern the
+    spotters use
+
+    Parameters
+    ----------
+    compiled : regex.Pattern
+        The pattern, compiled with the regex module
+
+    Examples
+    --------
+    >>> compile_concurrent(r"[0-9]{5}", 0).sub("ZIP", "Zip 12345")
+    'Zip ZIP'
+
+    """
+    def __init__(self, compiled):
+        self._compiled = compiled
+        self.pattern = compiled.pattern
+        self.flags = compiled.flags
+        self.groups = compiled.groups
+        self.groupindex = compiled.groupindex
+
+    def __reduce__(self):
+        # compiled again from the source in the process unpickling it
+        return _recompile, (self.pattern, self.flags)
+
+    def search(self, string, pos=0, endpos=None):
+        return self._compiled.search(string, pos, endpos, concurrent=True)
+
+    def fullmatch(self, string, pos=0, endpos=None):
+        return self._compiled.fullmatch(string, pos, endpos, concurrent=True)
+
+    def finditer(self, string, pos=0, endpos=None):
+        return self._compiled.finditer(string, pos, endpos, concurrent=True)
+
+    def findall(self, string, pos=0, endpos=None):
+        return self._compiled.findall(string, pos, endpos, concurrent=True)
+
+    def sub(self, repl, string, count=0):
+        return self._compiled.sub(repl, string, count, concurrent=True)
+
+
+def _recompile(pattern: str, flags: int) -> ConcurrentPattern:
+    """
+    Internal utility function unpickling a ConcurrentPattern
+    """
+    return ConcurrentPattern(_import_regex().compile(pattern, flags))
+
+
+def compile_concurrent(pattern: str, flags: int):
+    """
+    Compile a Python regex with the regex module, so matching it releases the GIL
+
+    Parameters
+    ----------
+    pattern : str
+        The Python regex
+    flags : int
+        The re flags it is compiled with
+
+    Returns
+    -------
+    A ConcurrentPattern, or None when the regex module is not installed or does
+    not read the pattern like re
+
+    """
+    regex = _import_regex()
+    if regex is None:
+        return None
+    translated = 0
+    for name in _FLAGS:
+        if flags & getattr(re, name):
+            translated |= getattr(regex, name)
+    if flags & ~sum(getattr(re, name) for name in _FLAGS):
+        return None
+    try:
+        # VERSION0 is the re compatible syntax
+        return ConcurrentPattern(regex.compile(pattern, translated | regex.VERSION0))
+    except regex.error:
+        return None
+
+
+def compile_program(pattern: str, flags: int):
+    """
+    Compile a Python regex with re, keeping the program the re engine runs so
+    it can be stored (pickled) and loaded again by load_program() without
+    parsing and compiling the pattern again
+
+    Parameters
+    ----------
+    pattern : str
+        The Python regex
+    flags : int
+        The re flags it is compiled with
+
+    Returns
+    -------
+    The compiled re.Pattern and its program, None for the program on the
+    interpreters whose re engine does not run one (only CPython does)
+
+    Examples
+    --------
+    >>> compiled, program = compile_program(r"[0-9]{5}", 0)
+    >>> load_program(program).sub("ZIP", "Zip 12345")
+    'Zip ZIP'
+
+    """
+    if sys.implementation.name != "cpython" or _CODE_TYPE is None:
+        return re.compile(pattern, flags), None
+    # the steps of re.compile(), with the code kept
+    parsed = _sre_parser.parse(pattern, flags)
+    code = _sre_compiler._code(parsed, flags)
+    groupindex = dict(parsed.state.groupdict)
+    indexgroup = [None] * parsed.state.groups
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    program = (_PROGRAM_VERSION, pattern, flags | parsed.state.flags, array.array(_CODE_TYPE, code),
+               parsed.state.groups - 1, groupindex, tuple(indexgroup))
+    return load_program(program), program
+
+
+def load_program(program):
+    """
+    Load a program built by compile_program()
+
+    Parameters
+    ----------
+    program : tuple
+        The program, possibly unpickled
+
+    Returns
+    -------
+    The re.Pattern running it, or None when the program was built by another
+    version of the interpreter and the pattern must be compiled again
+
+    """
+    if program is None or program[0] != _PROGRAM_VERSION:
+        return None
+    _, pattern, flags, code, groups, groupindex, indexgroup = program
+    return _sre.compile(pattern, flags, code.tolist(), groups, groupindex, indexgroup)
+
+
+def contains(series: pd.Series, pattern) -> np.ndarray:
+    """
+    Search a pattern in every string of a column
+
+    Parameters
+    ----------
+    series : pd.Series
+        The strings, the cells that are not a str (None, NaN, pd.NA) are skipped as
+        with the .str methods
+    pattern : re.Pattern or ConcurrentPattern
+        The pattern
+
+    Returns
+    -------
+    A boolean array, True for the cells where the pattern is found
+
+    """
+    if isinstance(pattern, re.Pattern):
+        return series.str.contains(pattern, regex=True).to_numpy(dtype=bool, na_value=False)
+    search = pattern.search
+    return np.fromiter((isinstance(text, str) and search(text) is not None for text in series), dtype=bool,
+                       count=len(series))
+
+
+def replace(series: pd.Series, pattern, repl) -> pd.Series:
+    """
+    Substitute a pattern in every string of a column
+
+    Parameters
+    ----------
+    series : pd.Series
+        The strings, the cells that are not a str (None, NaN, pd.NA) are skipped as
+        with the .str methods
+    pattern : re.Pattern or ConcurrentPattern
+        The pattern
+    repl : str or callable
+        The replacement, as in re.sub()
+
+    Returns
+    -------
+    The new strings, with the index of series
+
+    """
+    if isinstance(pattern, re.Pattern):
+        return series.str.replace(pattern, repl, regex=True)
+    sub = pattern.sub
+    return pd.Series([sub(repl, text) if isinstance(text, str) else text for text in series], index=series.index,
+                     name=series.name, dtype=object)
+
+
+def findall(series: pd.Series, pattern) -> pd.Series:
+    """
+    Find all the matches of a pattern in every string of a column
+
+    Parameters
+    ----------
+    series : pd.Series
+        The strings, the cells that are not a str (None, NaN, pd.NA) are skipped as
+        with the .str methods
+    pattern : re.Pattern or ConcurrentPattern
+        The pattern, without groups
+
+    Returns
+    -------
+    The lists of the matched strings, with the index of series
+
+    """
+    if isinstance(pattern, re.Pattern):
+        return series.str.findall(pattern)
+    return pd.Series([pattern.findall(text) if isinstance(text, str) else text for text in series],
+                     index=series.index, name=series.name, dtype=object)
+
+
+def count(series: pd.Series, pattern) -> int:
+    """
+    Count the matches of a pattern in a column
+
+    Parameters
+    ----------
+    series : pd.Series
+        The strings, the cells that are not a str (None, NaN, pd.NA) are skipped as
+        with the .str methods
+    pattern : re.Pattern or ConcurrentPattern
+        The pattern
+
+    Returns
+    -------
+    The number of matches
+
+    """
+    if isinstance(pattern, re.Pattern):
+        return int(series.str.count(pattern).sum())
+    return sum(sum(1 for _ in pattern.finditer(text)) for text in series if isinstance(text, str))
@@ -0,0 +1,91 @@
+import hashlib
+
+# hash algorithms a TokenHasher can use
+ALGORITHMS = ("md5", "blake2b")
+
+
+class TokenHasher:
+    """
+    Hashes the tokens spotted by a Spotter when hashSpotted is True. The hashes of
+    the tokens seen during a run are memoized, so a repeated identifier is only
+    hashed once
+
+    Parameters
+    ----------
+    algorithm : str, optional
+        "md5" (the default, compatible with the previous versions) or "blake2b".
+    key : str or bytes, optional
+        A secret key for "blake2b" (up to 64 bytes). With a key the hashes are keyed
+        pseudonyms that cannot be reversed by hashing guessed values without it.
+        The default is None (no key).
+    memo_size : int, optional
+        The maximum number of memoized hashes, the memo is emptied when it is full.
+        The default is 65,536.
+
+    Examples
+    --------
+    >>> TokenHasher()("foo@gaga.com")
+    '38cca18a520b5ac4a93f52498d5dbb0e'
+    >>> TokenHasher("blake2b", key="secret")("foo@gaga.com")
+    '35c63610a6e1543cb9a71029446cf226'
+
+    """
+    def __init__(self, algorithm="md5", key=None, memo_size=65536):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {ALGORITHMS} in TokenHasher")
+        if key is not None and algorithm != "blake2b":
+            raise ValueError("a key can only be used with the blake2b algorithm in TokenHasher")
+        if isinstance(key, str):
+            key = key.encode()
+        self.algorithm = algorithm
+        self.key = key
+        self.memo_size = memo_size
+        self._memo = {}
+        # keying blake2b costs a compression round, the keyed state is
+        # built once and copied for every token
+        if algorithm == "md5":
+            self._base = hashlib.md5()
+        else:
+            self._base = hashlib.blake2b(key=key or b"", digest_size=16)
+
+    def __getstate__(self):
+        # hashlib objects cannot be pickled, they are rebuilt from the settings
+        return {"algorithm": self.algorithm, "key": self.key, "memo_size": self.memo_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["algorithm"], state["key"], state["memo_size"])
+
+    def __call__(self, token: str) -> str:
+        """
+        Hash a token
+
+        Parameters
+        ----------
+        token : str
+            The spotted text
+
+        Returns
+        -------
+        The hexadecimal digest of the token, 32 characters for both algorithms
+
+        """
+        digest = self._memo.get(token)
+        if digest is None:
+            h = self._base.copy()
+            h.update(token.encode())
+            digest = h.hexdigest()
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[token] = digest
+        return digest
+
+    def reset(self) -> None:
+        """
+        Forget the memoized hashes, called at the start of every run
+
+        Returns
+        -------
+        None
+
+        """
+        self._memo.clear()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import json
+from sanityze.lazy import LazyModule
+np = LazyModule("numpy")
+sqlite3 = LazyModule("sqlite3")
+
+
+class IncrementalIndex:
+    """
+    A persistent index of the rows already cleaned by Cleanser.clean_incremental(),
+    stored in a SQLite file. Every row is keyed by a 64 bit hash of its values and
+    maps to the cleaned values of its text cells, or to nothing when cleaning left
+    the row unchanged. The index is tied to a chain fingerprint and a schema, and
+    emptied when they change
+
+    Parameters
+    ----------
+    path : str
+        The SQLite file, created if it does not exist
+
+    Attributes
+    ----------
+    hits : int
+        The number of rows found in the index, over all the runs
+    misses : int
+        The number of rows cleaned and added to the index, over all the runs
+
+    Examples
+    --------
+    >>> with IncrementalIndex("clean_index.sqlite") as index:
+    ...     cleaned = Cleanser().clean_incremental(df, index)
+    ...     index.hits, index.misses
+    (1000000, 2500)
+
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS rows (hash INTEGER PRIMARY KEY, cleaned TEXT)")
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def prepare(self, fingerprint: str, schema: tuple) -> bool:
+        """
+        Check that the index was built by the same chain for the same columns, and
+        empty it otherwise
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the chain, from Cleanser.fingerprint()
+        schema : tuple
+            The (name, dtype) pairs of the data frame
+
+        Returns
+        -------
+        True if the index was kept, False if it was emptied
+
+        """
+        key = json.dumps({"fingerprint": fingerprint, "schema": [[str(n), d] for n, d in schema]})
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'chain'").fetchone()
+        if row is not None and row[0] == key:
+            return True
+        with self._db:
+            self._db.execute("DELETE FROM rows")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('chain', ?)", (key,))
+        return False
+
+    def lookup(self, hashes: np.ndarray) -> dict:
+        """
+        Find the rows already cleaned
+
+        Parameters
+        ----------
+        hashes : np.ndarray
+            The int64 hashes of the rows
+
+        Returns
+        -------
+        A dict mapping the hash of every known row to the list of the cleaned values
+        of its text cells (None for a cell left unchanged), or to None when the
+        whole row was left unchanged
+
+        """
+        with self._db:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (hash INTEGER PRIMARY KEY)")
+            self._db.execute("DELETE FROM wanted")
+            self._db.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((int(h),) for h in np.unique(hashes)))
+            found = self._db.execute("SELECT rows.hash, rows.cleaned FROM rows JOIN wanted USING (hash)").fetchall()
+        return {h: None if cleaned is None else json.loads(cleaned) for h, cleaned in found}
+
+    def add(self, hashes: np.ndarray, cleaned: list) -> None:
+        """
+        Add cleaned rows to the index
+
+        Parameters
+        ----------
+        hashes : np.ndarray
+            The int64 hashes of the rows
+        cleaned : list
+            For every row, the list of the cleaned values of its text cells (None for
+            a cell left unchanged), or None when the whole row was left unchanged
+
+        Returns
+        -------
+        None
+
+        """
+        rows = ((int(h), None if values is None else json.dumps(values)) for h, values in zip(hashes, cleaned))
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?)", rows)
+
+    def close(self) -> None:
+        """
+        Close the SQLite file
+
+        Returns
+        -------
+        None
+
+        """
+        self._db.close()
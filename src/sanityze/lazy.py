@@ -0,0 +1,33 @@
+import importlib
+
+
+class LazyModule:
+    """
+    A stand in for a module that is only imported when one of its attributes is
+    first used, so importing sanityze does not pay for pandas and numpy when only
+    strings are cleaned
+
+    Parameters
+    ----------
+    name : str
+        The name of the module, e.g. "pandas"
+
+    Examples
+    --------
+    >>> pd = LazyModule("pandas")
+    >>> pd.Series([1, 2]).sum()
+    3
+
+    """
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+
+    def __getattr__(self, attr: str):
+        # only called for the attributes not cached yet
+        value = getattr(importlib.import_module(self._name), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from sanityze.lazy import LazyModule
+pd = LazyModule("pandas")
+
+# values of pd.api.types.infer_dtype() for columns that hold no strings
+NO_STRINGS = frozenset(["empty", "integer", "floating", "mixed-integer-float", "decimal", "complex",
+                        "boolean", "datetime64", "datetime", "date", "timedelta64", "timedelta",
+                        "time", "period", "interval", "bytes"])
+
+
+class CleaningPlan:
+    """
+    The columns of a data frame schema the Cleanser cleans, and the spotters it
+    runs on each of them. A plan is built once by Cleanser.plan() and can be
+    reused for every data frame with the same schema (column names and dtypes)
+
+    Attributes
+    ----------
+    schema : tuple
+        The (name, dtype) of every column of the data frame the plan was built for
+    columns : dict
+        Maps the position of every column to clean to the uids of its spotters, in
+        chain order
+    kinds : dict
+        Maps the position of every column to what the plan found about it: "text" (all
+        the sampled values are strings), "mixed" (some are), "no strings sampled"
+        (the column is only cleaned if it holds strings after all), or the reason it
+        is skipped: "dtype", "excluded" or "no spotter". A plan built by
+        Cleanser.profile() has "PII sampled" and "no PII sampled" instead (or "PII
+        found" and "no PII found" after a full scan), and "uncertain" for a column
+        whose sample cannot rule out a prevalence above the tolerance
+    profile : pd.DataFrame
+        For a plan built by Cleanser.profile(), the estimated prevalence of every
+        spotter in every text column with its confidence bounds, None otherwise
+
+    Methods
+    -------
+    matches(df)
+        return whether the plan can be applied to the data frame
+
+    describe()
+        return the plan as a data frame, one row per column
+
+    Examples
+    --------
+    >>> c = Cleanser()
+    >>> plan = c.plan(df, exclude=["notes"], spotter_columns={"CREDITCARD": ["card"]})
+    >>> plan.describe()
+          column   dtype     kind               spotters
+    0      email  object     text             EMAILADDRS
+    1       card  object     text  EMAILADDRS,CREDITCARD
+    2      notes  object excluded
+    3      price   int64    dtype
+    >>> c.clean(df, plan=plan)
+
+    """
+    def __init__(self, schema: tuple, columns: dict, kinds: dict, profile=None):
+        self.schema = schema
+        self.columns = columns
+        self.kinds = kinds
+        self.profile = profile
+
+    def __repr__(self) -> str:
+        return f"CleaningPlan({len(self.columns)} of {len(self.schema)} columns to clean)"
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """
+        Check whether the data frame has the schema the plan was built for
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The data frame to check
+
+        Returns
+        -------
+        True if the column names and dtypes are the same, False otherwise
+
+        """
+        return self.schema == schema_of(df)
+
+    def describe(self) -> pd.DataFrame:
+        """
+        Describe the plan, one row per column of the schema
+
+        Returns
+        -------
+        A data frame with the column name, dtype, kind and the spotters that run on it
+
+        """
+        return pd.DataFrame({
+            "column": [name for name, _ in self.schema],
+            "dtype": [dtype for _, dtype in self.schema],
+            "kind": [self.kinds[j] for j in range(len(self.schema))],
+            "spotters": [",".join(self.columns.get(j, ())) for j in range(len(self.schema))],
+        })
+
+
+def schema_of(df: pd.DataFrame) -> tuple:
+    """
+    The schema of a data frame, as stored in a CleaningPlan
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data frame
+
+    Returns
+    -------
+    A tuple of (name, dtype) pairs, the dtypes as strings
+
+    """
+    return tuple((name, str(dtype)) for name, dtype in df.dtypes.items())
+
+
+def sample_kind(column: pd.Series, sample_size: int, random_state: int) -> str:
+    """
+    Classify a column that can hold strings from a sample of its values
+
+    Parameters
+    ----------
+    column : pd.Series
+        The column to classify
+    sample_size : int
+        The number of values to sample
+    random_state : int
+        The seed of the sample
+
+    Returns
+    -------
+    "text", "mixed" or "no strings sampled"
+
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = pd.Series(column.cat.categories)
+    if len(column) > sample_size:
+        column = column.sample(sample_size, random_state=random_state)
+    kind = pd.api.types.infer_dtype(column, skipna=True)
+    if kind == "string":
+        return "text"
+    if kind in NO_STRINGS:
+        return "no strings sampled"
+    return "mixed"
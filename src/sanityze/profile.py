@@ -0,0 +1,66 @@
+from __future__ import annotations
+import math
+from statistics import NormalDist
+from sanityze.lazy import LazyModule
+np = LazyModule("numpy")
+
+# columns of CleaningPlan.profile, one row per column and spotter
+PROFILE_COLUMNS = ["column", "spotter", "cells", "hits", "prevalence", "lower", "upper"]
+
+
+def wilson_interval(hits: int, cells: int, confidence: float) -> tuple:
+    """
+    The Wilson score interval of a proportion, which stays meaningful for the
+    small proportions and the zero hits typical of PII in a sample
+
+    Parameters
+    ----------
+    hits : int
+        The number of sampled cells holding PII
+    cells : int
+        The number of sampled cells
+    confidence : float
+        The confidence level of the interval, e.g. 0.95
+
+    Returns
+    -------
+    A tuple (lower, upper) of proportions, (0.0, 1.0) when nothing was sampled
+
+    Examples
+    --------
+    >>> wilson_interval(0, 1000, 0.95)
+    (0.0, 0.0038267584855551217)
+
+    """
+    if cells == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = hits / cells
+    denominator = 1 + z * z / cells
+    center = (p + z * z / (2 * cells)) / denominator
+    half = z * math.sqrt(p * (1 - p) / cells + z * z / (4 * cells * cells)) / denominator
+    lower = 0.0 if hits == 0 else max(0.0, center - half)
+    upper = 1.0 if hits == cells else min(1.0, center + half)
+    return lower, upper
+
+
+def hit_cells(result) -> dict:
+    """
+    The number of distinct cells with a match, per column and spotter, of a scan
+
+    Parameters
+    ----------
+    result : ScanResult
+        The result of Cleanser.scan(), with the matches (not counts_only)
+
+    Returns
+    -------
+    A dict mapping (column position, spotter position) to the number of cells
+
+    """
+    if len(result.rows) == 0:
+        return {}
+    keys = np.unique(np.stack([result.column_codes.astype(np.int64), result.spotter_codes.astype(np.int64),
+                               result.rows]), axis=1)
+    pairs, counts = np.unique(keys[:2], axis=1, return_counts=True)
+    return {(int(j), int(k)): int(n) for (j, k), n in zip(pairs.T, counts)}
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from sanityze.lazy import LazyModule
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+
+class ScanResult:
+    """
+    Where Cleanser.scan() found PII, without rewriting the data. Every match is
+    stored in array columns: the row position, the column and spotter codes, and the
+    start and end of the match in the cell (-1 for the spotters that cannot report
+    their spans, i.e. the ones overriding process())
+
+    Attributes
+    ----------
+    columns : list
+        The names of the columns of the data frame, indexed by column_codes
+    spotters : list
+        The uids of the spotters scanned for, indexed by spotter_codes
+    rows, column_codes, spotter_codes, starts, ends : np.ndarray
+        One entry per match, empty with counts_only
+    counts : dict
+        Maps (column name, spotter uid) to the number of matches
+    stopped : bool
+        True if the scan stopped early because the limit was reached, the
+        matches and counts then only cover the part of the data scanned
+
+    Methods
+    -------
+    found()
+        return whether any PII was found
+
+    to_frame()
+        return the matches as a data frame, one row per match
+
+    count_frame()
+        return the number of matches per column and spotter
+
+    Examples
+    --------
+    >>> result = Cleanser().scan(df)
+    >>> result.to_frame()
+       row         column     spotter  start  end
+    0    0  email_address  EMAILADDRS     34   56
+    >>> Cleanser().scan(df, spotters=["CREDITCARD"], limit=1).found()
+    True
+
+    """
+    COLUMNS = ["row", "column", "spotter", "start", "end"]
+
+    def __init__(self, columns: list, spotters: list, counts_only=False):
+        self.columns = columns
+        self.spotters = spotters
+        self.counts_only = counts_only
+        self.counts = {}
+        self.stopped = False
+        self._total = 0
+        self._parts = []
+        self.finish()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __repr__(self) -> str:
+        return f"ScanResult({self._total} matches{', stopped' if self.stopped else ''})"
+
+    def add(self, column: int, spotter: int, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> None:
+        """
+        Add the matches of a spotter in a block of a column
+
+        Parameters
+        ----------
+        column : int
+            The position of the column
+        spotter : int
+            The position of the spotter in spotters
+        rows, starts, ends : np.ndarray
+            The row positions and spans of the matches
+
+        Returns
+        -------
+        None
+
+        """
+        if len(rows) == 0:
+            return
+        key = (self.columns[column], self.spotters[spotter])
+        self.counts[key] = self.counts.get(key, 0) + len(rows)
+        self._total += len(rows)
+        if not self.counts_only:
+            self._parts.append((rows, np.full(len(rows), column, dtype=np.int32),
+                                np.full(len(rows), spotter, dtype=np.int32), starts, ends))
+
+    def finish(self) -> None:
+        """
+        Concatenate the matches added so far into the array attributes, called
+        at the end of the scan
+
+        Returns
+        -------
+        None
+
+        """
+        parts = list(zip(*self._parts)) if self._parts else [[]] * 5
+        dtypes = (np.int64, np.int32, np.int32, np.int64, np.int64)
+        self.rows, self.column_codes, self.spotter_codes, self.starts, self.ends = (
+            np.concatenate(part).astype(dtype, copy=False) if len(part) else np.empty(0, dtype=dtype)
+            for part, dtype in zip(parts, dtypes))
+        self._parts = []
+
+    def found(self) -> bool:
+        """
+        Whether any PII was found
+
+        Returns
+        -------
+        True if there is at least one match
+
+        """
+        return self._total > 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The matches as a data frame
+
+        Returns
+        -------
+        A data frame with one row per match: the row position, the column name, the
+        spotter uid and the span of the match
+
+        """
+        return pd.DataFrame({
+            "row": self.rows,
+            "column": _object_array(self.columns)[self.column_codes],
+            "spotter": _object_array(self.spotters)[self.spotter_codes],
+            "start": self.starts,
+            "end": self.ends,
+        })
+
+    def count_frame(self) -> pd.DataFrame:
+        """
+        The number of matches per column and spotter
+
+        Returns
+        -------
+        A data frame with the column name, the spotter uid and the number of matches
+
+        """
+        rows = [(column, uid, n) for (column, uid), n in self.counts.items()]
+        return pd.DataFrame(rows, columns=["column", "spotter", "matches"])
+
+
+def _object_array(values: list) -> np.ndarray:
+    """
+    Internal utility function, a 1-d object array of the values, tuples included
+    """
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
@@ -1,5 +1,13 @@
-import re
+from __future__ import annotations
+import copy
 import hashlib
+import re
+from sanityze.hashing import TokenHasher
+from sanityze import arrow, engine
+from sanityze.lazy import LazyModule
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
 
 class Spotter():
     """
@@ -11,6 +19,10 @@ class Spotter():
         uid of the spotter
     hashSpotted : bool, optional
         False by default, whether to hash or replace the spotted sensitive information
+    hashAlgorithm : str, optional
+        "md5" by default, or "blake2b", the algorithm hashing the spotted text
+    hashKey : str or bytes, optional
+        None by default, a secret key for "blake2b" to hash the spotted text into keyed pseudonyms
 
     Methods
     -------
@@ -20,21 +32,50 @@ class Spotter():
     isHashSpotted()
         return whether the hashSpotted is True or False
     
+    getPattern()
+        return the compiled pattern declared by the subclass, compiled once and cached
+
+    replacement(match)
+        return the text replacing one match of the pattern
+
+    isFusable()
+        return whether the spotter can be scanned together with others in a FusedSpotter
+
+    mayContain(text)
+        return False when the text cannot contain anything the spotter would modify
+
     process(text)
         process the text depending on the hashSpotted value, if it is hash, replace it with hash
         otherwise, replace it with some default value
 
     Examples
     --------
-    Spotter should be initialized in a subclass level, therefore, skipping examples in the parent class
-    >>> 
+    Spotter should be initialized in a subclass level, therefore, skipping examples in the parent class.
+    A subclass only needs to declare its regex in `pattern` (and optionally `flags`),
+    the base class compiles it once and uses it in process() and processSeries()
+    >>> class ZipSpotter(Spotter):
+    ...     pattern = r"\b[0-9]{5}\b"
+    ...     def getSpotterUID(self):
+    ...         return "ZIPCODE"
+    >>> ZipSpotter("ZIPS").process("Zip 90210")
+    'Zip ZIPCODE'
 
     """
     # please add the following line in the subclass
     # spotter_uid = "<uid of the spotter>"
-    def __init__(self, uid: str, hashSpotted=False):
+
+    # the regex of the text to spot and the re flags to compile it with,
+    # declared by the subclasses that are regex based
+    pattern = None
+    flags = 0
+    # a cheap regex that must be found in any text the spotter can modify,
+    # compiled with the same flags as pattern
+    prefilter = None
+
+    def __init__(self, uid: str, hashSpotted=False, hashAlgorithm="md5", hashKey=None):
         self.uid = uid
         self.hashSpotted = hashSpotted
+        self.hasher = TokenHasher(hashAlgorithm, hashKey)
 
     def getSpotterUID(self) -> str:
         """Getting the spotter uid
@@ -66,9 +107,224 @@ class Spotter():
         """
         return self.hashSpotted
 
+    def getConfig(self) -> dict:
+        """Getting the settings that determine the output of the spotter, used to
+        fingerprint the chain of a Cleanser. The hash key is only included as a digest
+
+        Returns
+        -------
+        config : dict
+            the class, uid, pattern, flags, prefilter and hashing settings of the spotter
+
+        Examples
+        --------
+        >>> EmailSpotter("EMAILS", False).getConfig()["uid"]
+        'EMAILADDRS'
+        """
+        key = self.hasher.key
+        return {
+            "class": f"{type(self).__module__}.{type(self).__qualname__}",
+            "uid": self.getSpotterUID(),
+            "pattern": self.pattern,
+            "flags": int(self.flags),
+            "prefilter": self.prefilter,
+            "hashSpotted": bool(self.isHashSpotted()),
+            "hashAlgorithm": self.hasher.algorithm,
+            "hashKey": None if key is None else hashlib.sha256(key).hexdigest(),
+        }
+
+    def getPattern(self) -> re.Pattern:
+        """Getting the compiled pattern of the spotter. The pattern is compiled
+        on the first call and cached on the spotter, so it is never recompiled
+        while processing cells
+
+        Returns
+        -------
+        pattern : re.Pattern
+            the compiled `pattern` of the spotter, or None if the spotter
+            does not declare one
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.getPattern() is ee.getPattern()
+        True
+        """
+        compiled = self.__dict__.get("_compiledPattern")
+        if compiled is None and self.pattern is not None:
+            compiled = re.compile(self.pattern, self.flags)
+            self._compiledPattern = compiled
+        return compiled
+
+    def getPrefilter(self) -> re.Pattern:
+        """Getting the compiled prefilter of the spotter, compiled on the first call
+        and cached on the spotter like getPattern()
+
+        Returns
+        -------
+        prefilter : re.Pattern
+            the compiled `prefilter` of the spotter, or None if the spotter
+            does not declare one
+
+        Examples
+        --------
+        >>> EmailSpotter("EMAILS", False).getPrefilter().search("no email here")
+        None
+        """
+        compiled = self.__dict__.get("_compiledPrefilter")
+        if compiled is None and self.prefilter is not None:
+            compiled = re.compile(self.prefilter, self.flags)
+            self._compiledPrefilter = compiled
+        return compiled
+
+    def concurrentCopy(self) -> "Spotter":
+        """Getting a copy of the spotter whose pattern and prefilter are compiled
+        with the regex module, which releases the GIL while matching, for the
+        threads of Cleanser.clean(backend="threads"). The copy shares the hasher
+        and the settings of the spotter
+
+        Returns
+        -------
+        spotter : Spotter
+            the copy, or the spotter itself when the regex module is not installed
+            or cannot compile its patterns like re
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.concurrentCopy().process("foo@gaga.com")
+        'EMAILADDRS'
+        """
+        compiled = {}
+        for attribute, pattern in (("_compiledPattern", self.getPattern()), ("_compiledPrefilter", self.getPrefilter())):
+            if pattern is not None:
+                concurrent = engine.compile_concurrent(pattern.pattern, pattern.flags)
+                if concurrent is not None:
+                    compiled[attribute] = concurrent
+        if not compiled:
+            return self
+        spotter = copy.copy(self)
+        spotter.__dict__.update(compiled)
+        return spotter
+
+    def mayContain(self, text: str) -> bool:
+        """Cheap rejection test run before process(), a False answer guarantees
+        process() would return the text unchanged. By default the declared
+        prefilter is searched, spotters without prefilter always return True
+
+        Parameters
+        ----------
+        text : str
+            The text to be tested
+
+        Returns
+        -------
+        may_contain : bool
+            False if the text can be skipped
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.mayContain("Okay")
+        False
+        """
+        prefilter = self.getPrefilter()
+        return prefilter is None or prefilter.search(text) is not None
+
+    def mayContainSeries(self, series: pd.Series):
+        """Running mayContain() over a whole column of strings at once
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be tested, every cell must be a str
+
+        Returns
+        -------
+        may_contain : np.ndarray
+            a boolean array, False for the cells that can be skipped, or None when
+            the spotter has no prefilter and every cell must be processed
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.mayContainSeries(pd.Series(["abcd1234@gmail.com", "Okay"]))
+        array([ True, False])
+        """
+        prefilter = self.getPrefilter()
+        if prefilter is not None:
+            return engine.contains(series, prefilter)
+        if type(self).mayContain is not Spotter.mayContain:
+            return series.map(self.mayContain).to_numpy(dtype=bool, na_value=False)
+        return None
+
+    def replacement(self, match: re.Match) -> str:
+        """Getting the text replacing one match of the pattern, the hash of the
+        match (and only of the match) if hashSpotted is True, the spotter uid otherwise
+
+        Parameters
+        ----------
+        match : re.Match
+            the match of the spotter pattern
+
+        Returns
+        -------
+        new_text : str
+            the replacement of the match
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.replacement(ee.getPattern().search("abcd1234@gmail.com"))
+        'EMAILADDRS'
+        """
+        if self.isHashSpotted():
+            return self.hasher(match.group())
+        return self.getSpotterUID()
+
+    def resetHashMemo(self) -> None:
+        """Forgetting the hashes memoized by the spotter, the Cleanser calls it at the
+        start of every run
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> EmailSpotter("EMAILS", True).resetHashMemo()
+        """
+        self.hasher.reset()
+
+    def isFusable(self) -> bool:
+        """Getting whether the replacements of the spotter only depend on the matched
+        text, so its pattern can be scanned together with other spotters in a FusedSpotter
+
+        Returns
+        -------
+        fusable : bool
+            True by default
+
+        Examples
+        --------
+        >>> EmailSpotter("EMAILS", True).isFusable()
+        True
+        """
+        return True
+
+    def _getRepl(self):
+        """Getting the repl argument for re.sub, a plain string when the
+        replacement does not depend on the match so no Python callback is
+        needed per match
+        """
+        if self.isHashSpotted():
+            return self.replacement
+        return self.getSpotterUID().replace("\\", "\\\\")
+
     def process(self, text: str) -> str:
         """Process the given text, if hashSpotted is True, replace the spotted text with hash,
-        otherwise, replace the spotted text with some default values
+        otherwise, replace the spotted text with some default values. Subclasses that
+        are not regex based must override this method
         
         Parameters
         ----------
@@ -89,30 +345,274 @@ class Spotter():
         0	laptop	1200
         1	printer EMAILADDRS	150
         2	tablet	300
-        3	desk 5555 5555 5555 4444	450
+        3	desk CREDITCARD	450
         4	chair	200
 
         
         """
-        # # to be implemented in the specific spotter level
-        # if self.isHashSpotted():
-        #     new_text = "hash"
-        # else:
-        #     new_text = ""
-        # return new_text
-        pass
+        pattern = self.getPattern()
+        if pattern is None:
+            raise NotImplementedError("Spotter subclasses must declare a pattern or override process()")
+        return pattern.sub(self._getRepl(), text)
+
+    def processSeries(self, series: pd.Series) -> pd.Series:
+        """Process a whole column of strings at once, the result must be the same
+        as calling process() on every cell. Regex based spotters run a single
+        batched substitution, the others map process() over the series
+        
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be spotted & modified, every cell must be a str
+
+        Returns
+        -------
+        new_series : pd.Series
+            the series with the spotted text replaced
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.processSeries(pd.Series(["abcd1234@gmail.com", "Okay"]))
+        0    EMAILADDRS
+        1          Okay
+        dtype: object
+
+        """
+        pattern = self.getPattern()
+        if pattern is None or type(self).process is not Spotter.process:
+            return series.map(self.process)
+        return engine.replace(series, pattern, self._getRepl())
+
+    def spans(self, text: str):
+        """Finding the parts of one text the spotter replaces and their replacements,
+        without building the new text, for span based redaction (see SpanSpotter).
+        Matches whose replacement is the matched text itself are left out
+
+        Parameters
+        ----------
+        text : str
+            The text to be spotted
+
+        Returns
+        -------
+        spans : list
+            the (start, end, new_text) of every replacement, in order, or None for
+            the spotters that are not regex based (override process())
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.spans("mail foo@gaga.com")
+        [(5, 17, 'EMAILADDRS')]
+        """
+        pattern = self.getPattern()
+        if pattern is None or type(self).process is not Spotter.process:
+            return None
+        repl = self._getRepl()
+        if not callable(repl):
+            uid = self.getSpotterUID()
+            return [(match.start(), match.end(), uid) for match in pattern.finditer(text)]
+        spans = []
+        for match in pattern.finditer(text):
+            new_text = repl(match)
+            if new_text != match.group():
+                spans.append((match.start(), match.end(), new_text))
+        return spans
+
+    def findSpans(self, series: pd.Series):
+        """Finding what the spotter would replace in a column of strings, without
+        replacing it, for Cleanser.scan()
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        spans : tuple of np.ndarray
+            the positions in series of the cells, and the start and end of every
+            match. Spotters without a pattern or overriding process() report the
+            cells process() changes, with -1 as start and end
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.findSpans(pd.Series(["Okay", "a@gmail.com b@gmail.com"]))
+        (array([1, 1]), array([ 0, 12]), array([11, 23]))
+        """
+        pattern = self.getPattern()
+        if pattern is None or type(self).process is not Spotter.process:
+            rows = np.flatnonzero((series.map(self.process) != series).to_numpy(dtype=bool))
+            return rows, np.full(len(rows), -1), np.full(len(rows), -1)
+        return _spans(series, pattern)
+
+    def getArrowPattern(self):
+        """Getting the pattern of the spotter in the RE2 syntax of the Arrow compute
+        kernels, translated on the first call and cached like getPattern()
+
+        Returns
+        -------
+        pattern : str
+            the translated `pattern`, or None if the spotter does not declare one
+            or RE2 cannot express it
+
+        Examples
+        --------
+        >>> ZipSpotter("ZIPS").getArrowPattern()
+        '[0-9]{5}'
+        """
+        return self._arrowTranslation("_arrowPattern", self.pattern)
+
+    def getArrowPrefilter(self):
+        """Getting the prefilter of the spotter in the RE2 syntax, like getArrowPattern()
+
+        Returns
+        -------
+        prefilter : str
+            the translated `prefilter`, or None if the spotter does not declare one
+            or RE2 cannot express it
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").getArrowPrefilter()
+        '[0-9](?:[ -]?[0-9]){12}'
+        """
+        return self._arrowTranslation("_arrowPrefilter", self.prefilter)
+
+    def _arrowTranslation(self, attribute: str, regex: str):
+        """
+        Internal utility function caching the RE2 translation of a regex on the
+        spotter, False when there is none
+        """
+        translated = self.__dict__.get(attribute)
+        if translated is None:
+            translated = False if regex is None else (arrow.to_re2(regex, self.flags) or False)
+            self.__dict__[attribute] = translated
+        return translated or None
+
+    def mayContainArrow(self, array):
+        """Running mayContain() over an Arrow array of strings, the prefilter runs in
+        an Arrow compute kernel when RE2 can express it, so the rejected cells are
+        never converted to Python strings
+
+        Parameters
+        ----------
+        array : pyarrow.Array
+            The strings to be tested, nulls included
+
+        Returns
+        -------
+        may_contain : pyarrow.BooleanArray
+            False for the null cells and the cells that can be skipped, or None when
+            the spotter has no prefilter and every string must be processed
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.mayContainArrow(pa.array(["abcd1234@gmail.com", "Okay", None]))
+        [true, false, false]
+        """
+        pa, pc = arrow._import_pyarrow()
+        prefilter = self.getArrowPrefilter()
+        if prefilter is not None:
+            return pc.fill_null(pc.match_substring_regex(array, prefilter), False)
+        if self.prefilter is None and type(self).mayContain is Spotter.mayContain:
+            return None
+        # the prefilter has to run in Python on the strings
+        valid = pc.is_valid(array)
+        may_contain = self.mayContainSeries(pc.filter(array, valid).to_pandas())
+        if may_contain is None:
+            return valid
+        mask = np.zeros(len(array), dtype=bool)
+        mask[np.flatnonzero(valid.to_numpy(zero_copy_only=False))] = may_contain
+        return pa.array(mask)
+
+    def processArrow(self, array):
+        """Process an Arrow array of strings, through the replace_substring_regex
+        kernel when the spotter replaces its matches with its uid and RE2 can express
+        its pattern. The others (hashing, validating the matches...) fall back to
+        processSeries() on the Python strings of the array
+
+        Parameters
+        ----------
+        array : pyarrow.Array
+            The strings to be spotted & modified, without nulls
+
+        Returns
+        -------
+        new_array : pyarrow.Array
+            the array with the spotted text replaced, of the same type
+
+        Examples
+        --------
+        >>> ZipSpotter("ZIPS").processArrow(pa.array(["Zip 90210"]))
+        ["Zip ZIPCODE"]
+        """
+        pa, pc = arrow._import_pyarrow()
+        pattern = self.getArrowPattern()
+        if pattern is not None and self._replacesWithUID():
+            return pc.replace_substring_regex(array, pattern=pattern, replacement=self._getRepl())
+        return pa.array(self.processSeries(array.to_pandas()), type=array.type)
+
+    def _replacesWithUID(self) -> bool:
+        """
+        Internal utility function, True if every match is replaced with the uid by
+        the base class implementation
+        """
+        cls = type(self)
+        return (not self.isHashSpotted()
+                and cls.process is Spotter.process and cls.processSeries is Spotter.processSeries
+                and cls.replacement is Spotter.replacement and cls._getRepl is Spotter._getRepl)
+
+    def countMatches(self, series: pd.Series):
+        """Counting the matches of the pattern in a column of strings, for the
+        statistics of Cleanser.clean(df, return_stats=True)
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        matches : int
+            the number of matches, or None if the spotter has no pattern or
+            overrides process()
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
+        >>> ee.countMatches(pd.Series(["a@gmail.com b@gmail.com", "Okay"]))
+        2
+        """
+        pattern = self.getPattern()
+        if pattern is None or type(self).process is not Spotter.process:
+            return None
+        return engine.count(series, pattern)
 
 
 class CreditCardSpotter(Spotter):
     """
-    The Credit Card Spotter Subclass
+    The Credit Card Spotter Subclass. Candidate card numbers are whole runs of at
+    least 13 digits, possibly separated by single spaces or dashes ("5555 5555 5555
+    4444", "5555-5555-5555-4444"), found in one scan of the text. Only the candidates
+    that pass the Luhn checksum and then match the prefix and length of a card brand
+    are replaced, so random digit strings are left alone. A candidate that fails is
+    searched for cards between its separators, so a card next to a CVV or to other
+    digits ("4556129404313766 123", "1234 5555-5555-5555-4444") is still replaced
 
     Attributes
     ----------
     uid : str
         uid of the spotter, "CREDITCARD"
     hashSpotted : bool, optional
-        False by default, whether to hash or replace the spotted sensitive information
+        False by default, whether to hash or replace the spotted sensitive information.
+        The digits of the card are hashed without the separators, so a card gets the
+        same hash however it is written
+    validateLuhn : bool, optional
+        True by default, whether the candidates must pass the Luhn checksum
 
     Methods
     -------
@@ -121,6 +621,9 @@ class CreditCardSpotter(Spotter):
     
     isHashSpotted()
         return whether the hashSpotted is True or False
+
+    isCardNumber(digits)
+        return whether a string of digits is a card number
     
     process(text)
         process the text depending on the hashSpotted value, if hashSpotted is True, replace the spotted credit card number with hash
@@ -130,9 +633,35 @@ class CreditCardSpotter(Spotter):
     --------
     >>> CreditCardSpotter("CREDITCARDS",True)
     <sanityze.spotters.CreditCardSpotter object at 0x000001207F7B5880>
-
+    >>> CreditCardSpotter("CREDITCARDS").process("desk 5555 5555 5555 4444, 5555 5555 5555 4445")
+    'desk CREDITCARD, 5555 5555 5555 4445'
     
     """
+    # candidate card numbers, whole runs of 13 digits or more with their separators
+    pattern = r"(?<![0-9])(?<![0-9][ -])[0-9](?:[ -]?[0-9]){12,}(?![ -]?[0-9])"
+    # all the card numbers have at least 13 digits
+    prefilter = r"[0-9](?:[ -]?[0-9]){12}"
+
+    # Regexes from:
+    # http://www.regular-expressions.info/creditcard.html
+
+    # taken from the alphagov fork of scrubadub: https://github.com/alphagov/scrubadub
+
+    # credit card brands, matched against the digits of the candidates that pass the checksum
+    brandPattern = re.compile(
+        r"(?:4[0-9]{12}(?:[0-9]{3})?"  		# Visa
+        r"|(?:5[1-5][0-9]{2}"          		# MasterCard
+        r"|222[1-9]|22[3-9][0-9]|2[3-6][0-9]{2}|27[01][0-9]|2720)[0-9]{12}"
+        r"|3[47][0-9]{13}"             		# American Express
+        r"|3(?:0[0-5]|[68][0-9])[0-9]{13}"   	# Diners Club
+        r"|6(?:011|5[0-9]{2})[0-9]{12}"      	# Discover
+        r"|(?:2131|1800|35\d{3})\d{11})"      	# JCB
+    , re.VERBOSE)
+
+    def __init__(self, uid: str, hashSpotted=False, hashAlgorithm="md5", hashKey=None, validateLuhn=True):
+        super().__init__(uid, hashSpotted, hashAlgorithm, hashKey)
+        self.validateLuhn = validateLuhn
+
     def getSpotterUID(self) -> str:
         """Getting the credit card spotter uid
 
@@ -150,99 +679,718 @@ class CreditCardSpotter(Spotter):
         """
         return "CREDITCARD"
 
-    def process(self, text: str) -> str:
-        """Process the given text, if hashSpotted is True, replace the spotted credit card number with hash,
-        otherwise, replace the spotted credit card number with some default values
-        
-        Parameters
-        ----------
-        text : str
-            The text to be spotted & modified
+    def getConfig(self) -> dict:
+        """Getting the settings of the spotter, see Spotter.getConfig()
 
         Returns
         -------
-        new_text : str
-            the text with credit card number replaced by a hash or the default string value
-        
+        config : dict
+            the settings of Spotter.getConfig() and validateLuhn
+
         Examples
         --------
-        >>> cc = CreditCardSpotter("CREDITCARDS", False)
-        >>> cc.process("4556129404313766")
-        CREDITCARD
-
+        >>> CreditCardSpotter("CREDITCARDS").getConfig()["validateLuhn"]
+        True
         """
-        # Regexes from:
-        # http://www.regular-expressions.info/creditcard.html
-
-        # taken from the alphagov fork of scrubadub: https://github.com/alphagov/scrubadub
+        return {**super().getConfig(), "validateLuhn": self.validateLuhn}
 
-        # credit card patterns to match
-        cc_pattern = re.compile((
-            r"(?:4[0-9]{12}(?:[0-9]{3})?"  		# Visa
-            r"|(?:5[1-5][0-9]{2}"          		# MasterCard
-            r"|222[1-9]|22[3-9][0-9]|2[3-6][0-9]{2}|27[01][0-9]|2720)[0-9]{12}"
-            r"|3[47][0-9]{13}"             		# American Express
-            r"|3(?:0[0-5]|[68][0-9])[0-9]{13}"   	# Diners Club
-            r"|6(?:011|5[0-9]{2})[0-9]{12}"      	# Discover
-            r"|(?:2131|1800|35\d{3})\d{11})"      	# JCB
-         ), re.VERBOSE)
+    def isCardNumber(self, digits: str) -> bool:
+        """Checking whether a string of digits is a card number, it must pass the
+        Luhn checksum (if validateLuhn is True) and match a card brand
 
-        # sets replacement value based on output of isHashSpotted()
-        if self.isHashSpotted():
-            replacement = hashlib.md5(text.encode()).hexdigest()
-        else:
-            replacement = self.getSpotterUID()
-        
-        # replaces cc number with replacement value
-        clean_str = re.sub(cc_pattern, replacement, text)
-
-        return(clean_str)
+        Parameters
+        ----------
+        digits : str
+            the digits of a candidate, without separators
 
+        Returns
+        -------
+        is_card : bool
 
-class EmailSpotter(Spotter):
-    """
-    The Email Spotter Subclass
+        Examples
+        --------
+        >>> cc = CreditCardSpotter("CREDITCARDS")
+        >>> cc.isCardNumber("4556129404313766"), cc.isCardNumber("4556129404313767")
+        (True, False)
+        """
+        if self.validateLuhn and not _luhn_check(digits):
+            return False
+        return self.brandPattern.fullmatch(digits) is not None
 
-    Attributes
-    ----------
-    uid : str
-        uid of the spotter, "EMAILADDRS"
-    hashSpotted : bool, optional
-        False by default, whether to hash or replace the spotted sensitive information
+    def replacement(self, match: re.Match) -> str:
+        """Getting the text replacing one candidate, the candidate itself when it
+        is not a card number
 
-    Methods
-    -------
-    getSpotterUID()
-        return the Spotter uid, "EMAILADDRS"
-    
-    isHashSpotted()
-        return whether the hashSpotted is True or False
-    
-    process(text)
-        process the text depending on the hashSpotted value, if hashSpotted is True, replace the spotted email with hash
-        otherwise, replace the spotted email with some default value
-    """
-    def getSpotterUID(self) -> str:
-        """Getting the email spotter uid
+        Parameters
+        ----------
+        match : re.Match
+            the match of the candidate pattern
 
         Returns
         -------
-        "EMAILADDRS" : str
-            a fixed str value for EmailSpotter
+        new_text : str
+            the uid or the hash of the digits for a card number, the candidate
+            otherwise
 
         Examples
         --------
-        >>> ee = EmailSpotter("EMAILS", False)
+        >>> cc = CreditCardSpotter("CREDITCARDS")
+        >>> cc.replacement(cc.getPattern().search("5555-5555-5555-4444"))
+        'CREDITCARD'
+        """
+        return self._redact(match.group(), self.cardParts(match.group()))
+
+    def cardParts(self, candidate: str) -> list:
+        """Finding the card numbers in one candidate: the candidate itself when it
+        is a card number, otherwise the runs of 13 to 19 of its digits that start
+        and end at its separators (a card followed by a CVV, or by the digits of
+        the hash of another spotter)
+
+        Parameters
+        ----------
+        candidate : str
+            a match of the candidate pattern, with its separators
+
+        Returns
+        -------
+        parts : list
+            the (start, end, digits) of every card number in the candidate, in order
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").cardParts("4556129404313766 123")
+        [(0, 16, '4556129404313766')]
+        """
+        digits = _strip_separators(candidate)
+        if len(digits) <= 19 and self.isCardNumber(digits):
+            return [(0, len(candidate), digits)]
+        return self._subCards(candidate)
+
+    def _subCards(self, candidate: str) -> list:
+        """
+        Internal utility function finding the card numbers between the separators
+        of a candidate that is not a card number, the leftmost and then the longest
+        first
+        """
+        separators = [i for i, char in enumerate(candidate) if char in " -"]
+        if not separators:
+            return []
+        starts = [0] + [i + 1 for i in separators]
+        ends = separators + [len(candidate)]
+        # the number of separators before starts[k] and ends[k] is k
+        parts = []
+        position = 0
+        for k, start in enumerate(starts):
+            if start < position:
+                continue
+            for m in range(len(ends) - 1, k - 1, -1):
+                count = ends[m] - start - (m - k)
+                if count < 13:
+                    break
+                if count > 19 or (k == 0 and m == len(ends) - 1):
+                    continue
+                digits = _strip_separators(candidate[start:ends[m]])
+                if self.isCardNumber(digits):
+                    parts.append((start, ends[m], digits))
+                    position = ends[m]
+                    break
+        return parts
+
+    def _redact(self, candidate: str, parts: list) -> str:
+        """
+        Internal utility function replacing the card numbers found in a candidate
+        """
+        pieces = []
+        position = 0
+        for start, end, digits in parts:
+            pieces.append(candidate[position:start])
+            pieces.append(self.hasher(digits) if self.isHashSpotted() else self.getSpotterUID())
+            position = end
+        pieces.append(candidate[position:])
+        return "".join(pieces)
+
+    def _getRepl(self):
+        """
+        Internal utility function, the candidates have to be checked one by one
+        """
+        return self.replacement
+
+    def spans(self, text: str) -> list:
+        """Finding the card numbers of one text, see Spotter.spans(). The spans
+        are the card numbers themselves, not the candidates holding them
+
+        Parameters
+        ----------
+        text : str
+            The text to be spotted
+
+        Returns
+        -------
+        spans : list
+            the (start, end, new_text) of every card number, in order
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").spans("4556129404313766 123")
+        [(0, 16, 'CREDITCARD')]
+        """
+        spans = []
+        for match in self.getPattern().finditer(text):
+            for start, end, digits in self.cardParts(match.group()):
+                new_text = self.hasher(digits) if self.isHashSpotted() else self.getSpotterUID()
+                spans.append((match.start() + start, match.start() + end, new_text))
+        return spans
+
+    def cardNumbers(self, series: pd.Series) -> dict:
+        """Finding the candidates of a column of strings that are card numbers. The
+        candidates are found with one scan per cell, the distinct ones are checked
+        with a vectorized Luhn checksum and only the survivors are matched against
+        the brands
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        cards : dict
+            maps every card number (as written, with its separators) to its digits
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").cardNumbers(pd.Series(["5555 5555 5555 4444", "1111111111111111"]))
+        {'5555 5555 5555 4444': '5555555555554444'}
+        """
+        cards = self._scan(series)[1]
+        return {c[start:end]: d for c, parts in cards.items() for start, end, d in parts}
+
+    def _scan(self, series: pd.Series):
+        """
+        Internal utility function behind cardNumbers(), returning the candidates
+        found in every cell and the card numbers of the candidates holding some
+        (see cardParts())
+        """
+        found = engine.findall(series, self.getPattern())
+        candidates = list({c for cell in found for c in cell})
+        if not candidates:
+            return found, {}
+        digits = [_strip_separators(c) for c in candidates]
+        # the runs longer than a card are only searched between their separators
+        valid = np.fromiter((len(d) <= 19 for d in digits), dtype=bool, count=len(digits))
+        if self.validateLuhn and valid.any():
+            valid[valid] = _luhn_valid([d for d, ok in zip(digits, valid) if ok])
+        brand = self.brandPattern.fullmatch
+        cards = {}
+        for c, d, ok in zip(candidates, digits, valid):
+            if ok and brand(d) is not None:
+                cards[c] = [(0, len(c), d)]
+            elif len(d) > 13:
+                # the failed candidates are rare, they are searched one by one
+                parts = self._subCards(c)
+                if parts:
+                    cards[c] = parts
+        return found, cards
+
+    def processSeries(self, series: pd.Series) -> pd.Series:
+        """Process a whole column of strings at once, the cells holding a card
+        number (see cardNumbers()) are the only ones substituted
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be spotted & modified, every cell must be a str
+
+        Returns
+        -------
+        new_series : pd.Series
+            the series with the card numbers replaced
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").processSeries(pd.Series(["5555 5555 5555 4444", "1111111111111111"]))
+        0          CREDITCARD
+        1    1111111111111111
+        dtype: object
+        """
+        found, cards = self._scan(series)
+        if not cards:
+            return series
+        def repl(match):
+            parts = cards.get(match.group())
+            return match.group() if parts is None else self._redact(match.group(), parts)
+        has_card = np.fromiter((any(c in cards for c in cell) for cell in found), dtype=bool, count=len(found))
+        if has_card.all():
+            return engine.replace(series, self.getPattern(), repl)
+        result = series.copy()
+        result[has_card] = engine.replace(series[has_card], self.getPattern(), repl)
+        return result
+
+    def countMatches(self, series: pd.Series) -> int:
+        """Counting the card numbers in a column of strings
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        matches : int
+            the number of candidates that are card numbers
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").countMatches(pd.Series(["4556129404313766 1111111111111111"]))
+        1
+        """
+        found, cards = self._scan(series)
+        return sum(len(cards.get(c, ())) for cell in found for c in cell)
+
+    def findSpans(self, series: pd.Series):
+        """Finding the card numbers of a column of strings, see Spotter.findSpans()
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        spans : tuple of np.ndarray
+            the positions in series of the cells, and the start and end of every
+            card number
+
+        Examples
+        --------
+        >>> CreditCardSpotter("CREDITCARDS").findSpans(pd.Series(["4556129404313766 1111111111111111"]))
+        (array([0]), array([0]), array([16]))
+        """
+        found, cards = self._scan(series)
+        if not cards:
+            return _spans(series.iloc[:0], self.getPattern())
+        has_card = np.fromiter((any(c in cards for c in cell) for cell in found), dtype=bool, count=len(found))
+        rows, starts, ends = [], [], []
+        for i, text in zip(np.flatnonzero(has_card), series[has_card]):
+            for match in self.getPattern().finditer(text):
+                for start, end, _ in cards.get(match.group(), ()):
+                    rows.append(i)
+                    starts.append(match.start() + start)
+                    ends.append(match.start() + end)
+        return np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def _spans(series: pd.Series, pattern: re.Pattern, keep=None):
+    """
+    Internal utility function, the cell positions and spans of the matches of a
+    pattern in a column of strings, the matches rejected by keep left out
+    """
+    rows, starts, ends = [], [], []
+    for i, text in enumerate(series):
+        for match in pattern.finditer(text):
+            if keep is None or keep(match):
+                rows.append(i)
+                starts.append(match.start())
+                ends.append(match.end())
+    return np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def _strip_separators(candidate: str) -> str:
+    """
+    Internal utility function, the digits of a candidate card number
+    """
+    return candidate.replace(" ", "").replace("-", "")
+
+
+def _luhn_check(digits: str) -> bool:
+    """
+    Internal utility function running the Luhn checksum on one number, in pure
+    Python so that strings are cleaned without numpy
+    """
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        value = ord(digit) - 48
+        if i % 2:
+            value = value * 2 - 9 if value > 4 else value * 2
+        total += value
+    return total % 10 == 0
+
+
+def _luhn_valid(numbers) -> np.ndarray:
+    """
+    Internal utility function running the Luhn checksum on strings of up to 19
+    digits at once. The numbers are left padded with zeros, which does not
+    change their checksum, and viewed as a matrix of digits
+
+    Returns
+    -------
+    A boolean array, True for the numbers passing the checksum
+    """
+    padded = np.char.zfill(np.asarray(numbers, dtype="U19"), 19)
+    digits = padded.view(np.uint32).reshape(len(padded), 19).astype(np.int64) - ord("0")
+    # every second digit from the right, the check digit excluded, is doubled
+    doubled = digits[:, -2::-2] * 2
+    total = digits[:, ::-2].sum(axis=1) + (doubled - 9 * (doubled > 9)).sum(axis=1)
+    return total % 10 == 0
+
+
+class EmailSpotter(Spotter):
+    """
+    The Email Spotter Subclass
+
+    Attributes
+    ----------
+    uid : str
+        uid of the spotter, "EMAILADDRS"
+    hashSpotted : bool, optional
+        False by default, whether to hash or replace the spotted sensitive information
+
+    Methods
+    -------
+    getSpotterUID()
+        return the Spotter uid, "EMAILADDRS"
+    
+    isHashSpotted()
+        return whether the hashSpotted is True or False
+    
+    process(text)
+        process the text depending on the hashSpotted value, if hashSpotted is True, replace the spotted email with hash
+        otherwise, replace the spotted email with some default value
+    """
+    # email regex (adapted from [https://scrubadub.readthedocs.io/en/stable/_modules/scrubadub/detectors/email.html#EmailDetector:~:text=regex%20%3D%20re,.IGNORECASE)])
+    pattern = (
+        r"\b[a-z0-9!#$%&'*+\/=?^_`{|}~-]"             # start with this character
+        r"(?:"
+        r"    [\.a-z0-9!#$%&'*+\/=?^_`{|}~-]{0,62}"   # valid next characters (max length 64 chars before @)
+        r"    [a-z0-9!#$%&'*+\/=?^_`{|}~-]"           # end with this character
+        r")?"
+        r"(?:@|\sat\s)"                               # @ or the word 'at' instead
+        r"[a-z0-9]"                                   # domain starts like this
+        r"(?:"
+        r"    (?=[a-z0-9-]*(\.|\sdot\s))"             # A lookahead to ensure there is a dot in the domain
+        r"    (?:\.|\sdot\s|[a-z0-9-]){0,251}"        # might have a '.' or the word 'dot' instead
+        r"    [a-z0-9]"                               # domain has max 253 chars, ends with one of these
+        r")+\b"
+    )
+    flags = re.VERBOSE | re.IGNORECASE
+    # an email needs an @ or the word 'at'
+    prefilter = r"@|\sat\s"
+
+    def getSpotterUID(self) -> str:
+        """Getting the email spotter uid
+
+        Returns
+        -------
+        "EMAILADDRS" : str
+            a fixed str value for EmailSpotter
+
+        Examples
+        --------
+        >>> ee = EmailSpotter("EMAILS", False)
         >>> ee.getSpotterUID()
         EMAILADDRS
 
         """
         return "EMAILADDRS"
 
+
+class DictionarySpotter(Spotter):
+    """
+    A Spotter redacting the terms of a list of known identifiers (customer names,
+    account ids, host names...). The terms are stored in a trie which is compiled
+    to a single regex, every branch of it starting with a distinct character, so a
+    text is scanned once whatever the number of terms instead of trying a giant
+    alternation term by term. When several terms match at the same position the
+    longest one wins
+
+    Attributes
+    ----------
+    uid : str
+        uid of the spotter, replacing the spotted terms
+    terms : iterable of str
+        the terms to spot, the empty ones are ignored
+    ignoreCase : bool, optional
+        True by default, whether the terms are matched regardless of case
+    wordBoundaries : bool, optional
+        True by default, whether a term only matches when it is not preceded or
+        followed by a letter, digit or underscore
+    hashSpotted : bool, optional
+        False by default, whether to hash or replace the spotted sensitive information
+
+    Methods
+    -------
+    getSpotterUID()
+        return the Spotter uid
+
+    termCount()
+        return the number of distinct terms
+
+    getPattern()
+        return the compiled pattern, loaded from its stored program once unpickled
+
+    process(text)
+        replace the spotted terms with the uid or their hash
+
+    Examples
+    --------
+    >>> ds = DictionarySpotter("CUSTOMER", ["Jacob King", "Chloe Lavoie"])
+    >>> ds.process("Call jacob king back")
+    'Call CUSTOMER back'
+
+    A DictionarySpotter can be pickled with its compiled pattern (the program of
+    the re engine), loading it with the same version of Python neither builds
+    the trie nor compiles the regex again. Another version compiles the pattern
+    on first use, and the fused modes of Cleanser.clean() compile the merged
+    pattern of the chain
+    >>> pickle.dump(ds, open("customers.pkl", "wb"))
+
+    """
+    def __init__(self, uid: str, terms, ignoreCase=True, wordBoundaries=True,
+                 hashSpotted=False, hashAlgorithm="md5", hashKey=None):
+        super().__init__(uid, hashSpotted, hashAlgorithm, hashKey)
+        unique = {term.lower() if ignoreCase else term for term in terms if term}
+        if not unique:
+            raise ValueError("terms must hold at least one non empty string in DictionarySpotter")
+        self.ignoreCase = ignoreCase
+        self.wordBoundaries = wordBoundaries
+        self._termCount = len(unique)
+        self.flags = re.IGNORECASE if ignoreCase else 0
+        pattern = _trie_pattern(_build_trie(unique))
+        self.pattern = rf"(?<!\w){pattern}(?!\w)" if wordBoundaries else pattern
+
+    def __getstate__(self):
+        # compiled patterns do not pickle, the program of the re engine is stored
+        # instead so loading the spotter does not compile the pattern again
+        if self.__dict__.get("_program") is None:
+            self.getPattern()
+        state = self.__dict__.copy()
+        state.pop("_compiledPattern", None)
+        return state
+
+    def getPattern(self) -> re.Pattern:
+        """Getting the compiled pattern of the spotter, loaded from the stored
+        program of the re engine when the spotter was unpickled by the same
+        version of Python, compiled on the first call otherwise
+
+        Returns
+        -------
+        pattern : re.Pattern
+            the compiled `pattern` of the spotter
+
+        Examples
+        --------
+        >>> ds = DictionarySpotter("CUSTOMER", ["Jacob King", "Chloe Lavoie"])
+        >>> ds.getPattern() is ds.getPattern()
+        True
+        """
+        compiled = self.__dict__.get("_compiledPattern")
+        if compiled is None:
+            compiled = engine.load_program(self.__dict__.get("_program"))
+            if compiled is None:
+                compiled, self._program = engine.compile_program(self.pattern, self.flags)
+            self._compiledPattern = compiled
+        return compiled
+
+    def termCount(self) -> int:
+        """Getting the number of distinct terms of the spotter
+
+        Returns
+        -------
+        count : int
+            the number of distinct terms, once lower cased with ignoreCase
+
+        Examples
+        --------
+        >>> DictionarySpotter("CUSTOMER", ["Jacob", "JACOB", "Chloe"]).termCount()
+        2
+        """
+        return self._termCount
+
+
+def _build_trie(terms) -> dict:
+    """
+    Internal utility function storing terms in a trie, a dict per node mapping
+    the next character to the child node, "" marking the end of a term
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = None
+    return trie
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Internal utility function compiling a trie to a regex matching its terms,
+    longest first. The chains of single children are written out iteratively,
+    so only the branching nodes recurse
+    """
+    prefix = []
+    while len(node) == 1 and "" not in node:
+        (char, node), = node.items()
+        prefix.append(re.escape(char))
+    ends = "" in node
+    leaves = []
+    branches = []
+    for char, child in node.items():
+        if char == "":
+            continue
+        if len(child) == 1 and "" in child:
+            leaves.append(re.escape(char))
+        else:
+            branches.append(re.escape(char) + _trie_pattern(child))
+    if leaves:
+        branches.append(leaves[0] if len(leaves) == 1 else "[" + "".join(leaves) + "]")
+    if not branches:
+        body = ""
+    elif ends:
+        # the longer terms are tried first, the node term is the fallback
+        body = "(?:" + "|".join(branches) + ")?"
+    elif len(branches) == 1:
+        body = branches[0]
+    else:
+        body = "(?:" + "|".join(branches) + ")"
+    return "".join(prefix) + body
+
+
+class FusedSpotter(Spotter):
+    """
+    A Spotter merging the patterns of several regex based spotters into a single
+    alternation, so a text is scanned once instead of once per spotter. Every match
+    is handed back to the spotter owning it for its replacement. The overlaps are
+    resolved by chain order, as in a SpanSpotter: when another spotter has a match
+    starting inside a match of the alternation, or a match is left as it is by its
+    spotter (e.g. a number failing the Luhn checksum), the text is redacted again
+    span by span. Text inserted by a spotter is not scanned
+    again by the next ones, unlike in the sequential chain
+
+    Attributes
+    ----------
+    spotters : list
+        the merged spotters, in chain order. When the matches of two spotters
+        overlap the first one in the list wins
+
+    Methods
+    -------
+    canFuse(spotter)
+        return whether the spotter can be merged in a FusedSpotter
+
+    getSpotterUID()
+        return the uids of the merged spotters joined with "+"
+
+    process(text)
+        replace the matches of all the merged spotters in a single pass
+
+    Examples
+    --------
+    >>> fs = FusedSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")])
+    >>> fs.process("foo@gaga.com 4556129404313766")
+    'EMAILADDRS CREDITCARD'
+
+    """
+    # inline flags that can be scoped to one branch of the alternation
+    _SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+    # the global inline flags leading a pattern, they are already in its compiled
+    # flags and cannot stay inside a branch
+    _GLOBAL_FLAGS = re.compile(r"\A(?:\(\?[aiLmsux]+\))+")
+
+    def __init__(self, spotters: list):
+        super().__init__("+".join(s.getSpotterUID() for s in spotters), False)
+        self.spotters = list(spotters)
+        branches = []
+        # maps the group index of every branch to the spotter owning it
+        self._owners = {}
+        group = 1
+        for spotter in self.spotters:
+            if not FusedSpotter.canFuse(spotter):
+                raise ValueError(f"{spotter.getSpotterUID()} cannot be fused in FusedSpotter")
+            compiled = spotter.getPattern()
+            scoped = "".join(letter for flag, letter in self._SCOPED_FLAGS.items() if compiled.flags & flag)
+            # the newline ends a trailing verbose comment before the closing parenthesis,
+            # outside of verbose mode it would be matched literally
+            end = "\n" if "x" in scoped else ""
+            source = FusedSpotter._GLOBAL_FLAGS.sub("", compiled.pattern)
+            branches.append(f"(?{scoped}:({source}{end}))" if scoped else f"({source})")
+            self._owners[group] = spotter
+            group += compiled.groups + 1
+        self.pattern = "|".join(branches)
+
+    @staticmethod
+    def canFuse(spotter: Spotter) -> bool:
+        """Checking whether a spotter can be merged in a FusedSpotter, it has to be
+        regex based (declare a pattern without overriding process()), use only flags
+        that can be scoped (given as flags or as global inline flags like "(?i)")
+        and have no named groups or backreferences
+
+        Parameters
+        ----------
+        spotter : Spotter
+            the spotter to check
+
+        Returns
+        -------
+        can_fuse : bool
+
+        Examples
+        --------
+        >>> FusedSpotter.canFuse(EmailSpotter("EMAILS"))
+        True
+        """
+        if type(spotter).process is not Spotter.process or not spotter.isFusable():
+            return False
+        compiled = spotter.getPattern()
+        if compiled is None or compiled.groupindex:
+            return False
+        allowed = re.UNICODE
+        for flag in FusedSpotter._SCOPED_FLAGS:
+            allowed |= flag
+        if compiled.flags & ~allowed:
+            return False
+        return re.search(r"\\[1-9]|\(\?P=", compiled.pattern) is None
+
+    def getSpotterUID(self) -> str:
+        """Getting the fused spotter uid
+
+        Returns
+        -------
+        self.uid : str
+            the uids of the merged spotters joined with "+"
+
+        Examples
+        --------
+        >>> FusedSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")]).getSpotterUID()
+        'EMAILADDRS+CREDITCARD'
+        """
+        return self.uid
+
+    def replacement(self, match: re.Match) -> str:
+        """Getting the replacement of one match from the spotter owning it
+
+        Parameters
+        ----------
+        match : re.Match
+            the match of the merged pattern
+
+        Returns
+        -------
+        new_text : str
+            the replacement given by the owning spotter
+
+        Examples
+        --------
+        (called by process())
+        """
+        spotter = self._owners[match.lastindex]
+        # the owner gets a match of its own pattern, so it can use its own groups
+        own = spotter.getPattern().fullmatch(match.string, match.start(), match.end())
+        return spotter.replacement(own if own is not None else match)
+
     def process(self, text: str) -> str:
-        """Process the given text, if hashSpotted is True, replace the spotted email with hash,
-        otherwise, replace the spotted email with some default values
-        
+        """Replace the matches of all the merged spotters in a single pass, see
+        the class documentation for the overlaps
+
         Parameters
         ----------
         text : str
@@ -251,37 +1399,396 @@ class EmailSpotter(Spotter):
         Returns
         -------
         new_text : str
-            the text with email replaced by a hash or the default string value
 
         Examples
         --------
-        >>> ee = EmailSpotter("EMAILS", False)
-        >>> ee.process("abcd1234@gmail.com")
-        EMAILADDRS
+        >>> FusedSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")]).process("4556 1294 0431 3766@x.com")
+        '4556 1294 0431 EMAILADDRS'
+        """
+        conflicts = set()
+        new_text = self.getPattern().sub(self._checkedRepl(conflicts), text)
+        return _redact_spans(text, self.spotters) if conflicts else new_text
+
+    def processSeries(self, series: pd.Series) -> pd.Series:
+        """Process a whole column of strings in a single pass, the cells whose
+        matches overlap are redacted again span by span
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be spotted & modified, every cell must be a str
+
+        Returns
+        -------
+        new_series : pd.Series
+
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        conflicts = set()
+        result = engine.replace(series, self.getPattern(), self._checkedRepl(conflicts))
+        if conflicts:
+            redo = np.fromiter((text in conflicts for text in series), dtype=bool, count=len(series))
+            result = result.copy()
+            result[redo] = [_redact_spans(text, self.spotters) for text in series[redo]]
+        return result
+
+    def spans(self, text: str):
+        """Finding the parts of one text the merged spotters replace, see Spotter.spans()
 
+        Parameters
+        ----------
+        text : str
+            The text to be spotted
+
+        Returns
+        -------
+        spans : list
+            the (start, end, new_text) of every replacement, in order
+
+        Examples
+        --------
+        >>> FusedSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")]).spans("mail foo@gaga.com")
+        [(5, 17, 'EMAILADDRS')]
         """
-        # base preprocessing (if needed)
-                
-        # email regex (adapted from [https://scrubadub.readthedocs.io/en/stable/_modules/scrubadub/detectors/email.html#EmailDetector:~:text=regex%20%3D%20re,.IGNORECASE)])
-        regex = re.compile((
-            r"\b[a-z0-9!#$%&'*+\/=?^_`{|}~-]"             # start with this character
-            r"(?:"
-            r"    [\.a-z0-9!#$%&'*+\/=?^_`{|}~-]{0,62}"   # valid next characters (max length 64 chars before @)
-            r"    [a-z0-9!#$%&'*+\/=?^_`{|}~-]"           # end with this character
-            r")?"
-            r"(?:@|\sat\s)"                               # @ or the word 'at' instead
-            r"[a-z0-9]"                                   # domain starts like this
-            r"(?:"
-            r"    (?=[a-z0-9-]*(\.|\sdot\s))"             # A lookahead to ensure there is a dot in the domain
-            r"    (?:\.|\sdot\s|[a-z0-9-]){0,251}"        # might have a '.' or the word 'dot' instead
-            r"    [a-z0-9]"                               # domain has max 253 chars, ends with one of these
-            r")+\b"
-        ), re.VERBOSE | re.IGNORECASE)
-        
-        if self.isHashSpotted():            
-            text = re.sub(regex, lambda x:hashlib.md5(x.group().encode()).hexdigest(), text)
-            new_text = text
-        else:
-            new_text = re.sub(regex, self.getSpotterUID(), text)
+        conflicts = set()
+        repl = self._checkedRepl(conflicts)
+        spans = []
+        for match in self.getPattern().finditer(text):
+            new_text = repl(match)
+            if conflicts:
+                return _merged_spans(text, self.spotters)
+            if new_text != match.group():
+                spans.append((match.start(), match.end(), new_text))
+        return spans
+
+    def countMatches(self, series: pd.Series):
+        """Counting the matches of the merged pattern in a column of strings, see
+        Spotter.countMatches()
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be searched, every cell must be a str
+
+        Returns
+        -------
+        matches : int
+
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        return engine.count(series, self.getPattern())
+
+    def _checkedRepl(self, conflicts: set):
+        """
+        Internal utility function, the replacement function of the merged pattern.
+        It adds to conflicts the texts where a match is left as it is by its spotter
+        or another spotter has a match starting inside it, those texts have to be
+        redacted span by span. The searches of the other spotters are reused from
+        one match to the next, so a text is scanned about once per spotter at most
+        """
+        ranks = {id(spotter): rank for rank, spotter in enumerate(self.spotters)}
+        # the text being substituted and the next match of every spotter in it
+        current = [None, {}]
+
+        def repl(match):
+            new_text = self.replacement(match)
+            text = match.string
+            if current[0] is not text:
+                current[0] = text
+                current[1] = {}
+            if text in conflicts:
+                return new_text
+            if new_text == match.group():
+                conflicts.add(text)
+                return new_text
+            found = current[1]
+            start = match.start()
+            owner = ranks[id(self._owners[match.lastindex])]
+            for rank in range(len(self.spotters)):
+                if rank == owner:
+                    continue
+                following = found.get(rank, _UNSEARCHED)
+                if following is _UNSEARCHED or (following is not None and following.start() < start):
+                    following = self.spotters[rank].getPattern().search(text, start)
+                    found[rank] = following
+                if following is not None and following.start() < match.end():
+                    conflicts.add(text)
+                    break
+            return new_text
+
+        return repl
+
+    def mayContain(self, text: str) -> bool:
+        """A text can be skipped when all the merged spotters would skip it
+
+        Parameters
+        ----------
+        text : str
+            The text to be tested
+
+        Returns
+        -------
+        may_contain : bool
+            False if the text can be skipped
+
+        Examples
+        --------
+        >>> FusedSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")]).mayContain("Okay")
+        False
+        """
+        return any(spotter.mayContain(text) for spotter in self.spotters)
+
+    def mayContainSeries(self, series: pd.Series):
+        """Running mayContain() over a whole column of strings at once
+
+        Parameters
+        ----------
+        series : pd.Series
+            The strings to be tested, every cell must be a str
+
+        Returns
+        -------
+        may_contain : np.ndarray
+            a boolean array, False for the cells all the merged spotters skip, or None
+            when one of them has no prefilter
 
-        return new_text
\ No newline at end of file
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        may_contain = None
+        for spotter in self.spotters:
+            mask = spotter.mayContainSeries(series)
+            if mask is None:
+                return None
+            may_contain = mask if may_contain is None else may_contain | mask
+        return may_contain
+
+    def mayContainArrow(self, array):
+        """An Arrow cell can be skipped when all the merged spotters would skip it
+
+        Parameters
+        ----------
+        array : pyarrow.Array
+            The strings to be tested, nulls included
+
+        Returns
+        -------
+        may_contain : pyarrow.BooleanArray
+            the union of the masks of the merged spotters, or None when one of
+            them has no prefilter
+
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        _, pc = arrow._import_pyarrow()
+        may_contain = None
+        for spotter in self.spotters:
+            mask = spotter.mayContainArrow(array)
+            if mask is None:
+                return None
+            may_contain = mask if may_contain is None else pc.or_(may_contain, mask)
+        return may_contain
+
+    def concurrentCopy(self) -> "Spotter":
+        """Getting a copy of the fused spotter running the concurrent copies of the
+        merged spotters, see Spotter.concurrentCopy()
+
+        Returns
+        -------
+        spotter : FusedSpotter
+
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        spotter = Spotter.concurrentCopy(self)
+        if spotter is self:
+            spotter = copy.copy(self)
+        copies = {id(s): s.concurrentCopy() for s in self.spotters}
+        spotter.spotters = [copies[id(s)] for s in self.spotters]
+        if "_owners" in self.__dict__:
+            spotter._owners = {group: copies[id(s)] for group, s in self._owners.items()}
+        return spotter
+
+    def resetHashMemo(self) -> None:
+        """Forgetting the hashes memoized by the merged spotters
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        (called by Cleanser.clean())
+        """
+        for spotter in self.spotters:
+            spotter.resetHashMemo()
+
+    def _getRepl(self):
+        """
+        Internal utility function, every match has to be handed to the spotter
+        owning it
+        """
+        return self.replacement
+
+
+class SpanSpotter(FusedSpotter):
+    """
+    A Spotter running several regex based spotters on the same text and applying
+    their replacements at once: every spotter reports the spans it would replace
+    in the original text, searched between the spans of the spotters earlier in
+    the chain, and the new text is built once with a join instead of once per
+    spotter. Like in a FusedSpotter, text inserted by a spotter is not scanned
+    again by the next ones
+
+    Attributes
+    ----------
+    spotters : list
+        the merged spotters, in chain order. When the spans of two spotters
+        overlap the one first in the list wins
+
+    Methods
+    -------
+    canFuse(spotter)
+        return whether the spotter can be merged in a SpanSpotter
+
+    getSpotterUID()
+        return the uids of the merged spotters joined with "+"
+
+    process(text)
+        replace the spans of all the merged spotters at once
+
+    Examples
+    --------
+    >>> ss = SpanSpotter([EmailSpotter("EMAILS"), CreditCardSpotter("CREDITCARDS")])
+    >>> ss.process("foo@gaga.com 4556129404313766")
+    'EMAILADDRS CREDITCARD'
+
+    """
+    # the spans are merged cell by cell, without the merged pattern of a FusedSpotter
+    processSeries = Spotter.processSeries
+    countMatches = Spotter.countMatches
+
+    def __init__(self, spotters: list):
+        Spotter.__init__(self, "+".join(s.getSpotterUID() for s in spotters), False)
+        self.spotters = list(spotters)
+        for spotter in self.spotters:
+            if not SpanSpotter.canFuse(spotter):
+                raise ValueError(f"{spotter.getSpotterUID()} cannot be merged in SpanSpotter")
+
+    @staticmethod
+    def canFuse(spotter: Spotter) -> bool:
+        """Checking whether a spotter can be merged in a SpanSpotter, it has to be
+        regex based (declare a pattern without overriding process())
+
+        Parameters
+        ----------
+        spotter : Spotter
+            the spotter to check
+
+        Returns
+        -------
+        can_fuse : bool
+
+        Examples
+        --------
+        >>> SpanSpotter.canFuse(DictionarySpotter("NAMES", ["Jacob King"]))
+        True
+        """
+        if type(spotter) is FusedSpotter:
+            return True
+        return type(spotter).process is Spotter.process and spotter.pattern is not None
+
+    def spans(self, text: str):
+        """Finding the parts of one text the merged spotters replace, see Spotter.spans()
+
+        Parameters
+        ----------
+        text : str
+            The text to be spotted
+
+        Returns
+        -------
+        spans : list
+            the (start, end, new_text) of every replacement, in order
+
+        Examples
+        --------
+        >>> SpanSpotter([DictionarySpotter("NAME", ["foo"]), EmailSpotter("EMAILS")]).spans("foo@gaga.com")
+        [(0, 3, 'NAME')]
+        """
+        return _merged_spans(text, self.spotters)
+
+    def process(self, text: str) -> str:
+        """Replace the spans of all the merged spotters, resolving the overlaps by
+        chain order, and build the new text once
+
+        Parameters
+        ----------
+        text : str
+            The text to be spotted & modified
+
+        Returns
+        -------
+        new_text : str
+
+        Examples
+        --------
+        >>> SpanSpotter([DictionarySpotter("NAME", ["foo"]), EmailSpotter("EMAILS")]).process("foo@gaga.com")
+        'NAME@gaga.com'
+        """
+        return _redact_spans(text, self.spotters)
+
+
+# marks the spotters not searched yet by FusedSpotter._checkedRepl()
+_UNSEARCHED = object()
+
+
+def _merged_spans(text: str, spotters: list) -> list:
+    """
+    Internal utility function, the spans the spotters replace in a text with the
+    overlaps resolved by chain order: a spotter is searched in the parts of the
+    text left between the spans of the spotters before it, as if those had been
+    replaced already
+    """
+    merged = []
+    for spotter in spotters:
+        if not spotter.mayContain(text):
+            continue
+        if not merged:
+            merged = spotter.spans(text)
+            continue
+        spans = []
+        position = 0
+        for start, end, _ in merged + [(len(text), len(text), None)]:
+            if position < start:
+                spans.extend((position + s, position + e, new_text)
+                             for s, e, new_text in spotter.spans(text[position:start]))
+            position = end
+        if spans:
+            merged = sorted(merged + spans)
+    return merged
+
+
+def _redact_spans(text: str, spotters: list) -> str:
+    """
+    Internal utility function replacing the spans the spotters report in a text,
+    the new text is built once with a join
+    """
+    merged = _merged_spans(text, spotters)
+    if not merged:
+        return text
+    parts = []
+    position = 0
+    for start, end, new_text in merged:
+        parts.append(text[position:start])
+        parts.append(new_text)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
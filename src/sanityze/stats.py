@@ -0,0 +1,141 @@
+from __future__ import annotations
+from sanityze.lazy import LazyModule
+pd = LazyModule("pandas")
+
+
+class SpotterStats:
+    """
+    What one spotter did on one column
+
+    Attributes
+    ----------
+    scanned : int
+        The number of string cells handed to the spotter, prefilter included
+    skipped : int
+        The number of cells the prefilter of the spotter rejected
+    changed : int
+        The number of cells the spotter modified
+    matches : int
+        The number of matches of the spotter pattern, None for the spotters
+        without a pattern
+    seconds : float
+        The cumulative time spent in the prefilter and the spotter
+    """
+    __slots__ = ("scanned", "skipped", "changed", "matches", "seconds")
+
+    def __init__(self):
+        self.scanned = 0
+        self.skipped = 0
+        self.changed = 0
+        self.matches = 0
+        self.seconds = 0.0
+
+    def __repr__(self) -> str:
+        return ("SpotterStats(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__) + ")")
+
+
+class CleanStats:
+    """
+    The statistics collected by Cleanser.clean(df, return_stats=True), per column
+    and per spotter
+
+    Parameters
+    ----------
+    count_matches : bool, optional
+        Whether the matches of the spotters are counted, see
+        Cleanser.clean(count_matches=...). The default is True.
+
+    Attributes
+    ----------
+    records : dict
+        Maps (column name, spotter uid) to a SpotterStats
+
+    Methods
+    -------
+    to_frame()
+        return the statistics as a data frame, one row per column and spotter
+
+    by_spotter()
+        return the statistics summed per spotter
+
+    Examples
+    --------
+    >>> cleaned, stats = Cleanser().clean(df, return_stats=True)
+    >>> stats.to_frame()
+              column     spotter  scanned  skipped  changed  matches   seconds
+    0  email_address  EMAILADDRS       20        0       20       20  0.000411
+    1  email_address  CREDITCARD       20       20        0        0  0.000052
+    """
+    COLUMNS = ["column", "spotter", "scanned", "skipped", "changed", "matches", "seconds"]
+
+    def __init__(self, count_matches=True):
+        self.records = {}
+        self.count_matches = count_matches
+
+    def __repr__(self) -> str:
+        return f"CleanStats({len(self.records)} records)"
+
+    def add(self, column, uid: str, scanned=0, skipped=0, changed=0, matches=0, seconds=0.0) -> None:
+        """
+        Add to the statistics of a spotter on a column
+
+        Parameters
+        ----------
+        column : str
+            The name of the column
+        uid : str
+            The uid of the spotter
+        scanned, skipped, changed, matches, seconds : optional
+            The amounts to add, see SpotterStats. matches is None when the spotter
+            cannot count its matches
+
+        Returns
+        -------
+        None
+        """
+        record = self.records.get((column, uid))
+        if record is None:
+            record = self.records[(column, uid)] = SpotterStats()
+        record.scanned += scanned
+        record.skipped += skipped
+        record.changed += changed
+        record.matches = None if matches is None or record.matches is None else record.matches + matches
+        record.seconds += seconds
+
+    def merge(self, other: "CleanStats") -> None:
+        """
+        Add the statistics of another CleanStats, e.g. the ones of a worker process
+
+        Parameters
+        ----------
+        other : CleanStats
+            The statistics to add
+
+        Returns
+        -------
+        None
+        """
+        for (column, uid), r in other.records.items():
+            self.add(column, uid, r.scanned, r.skipped, r.changed, r.matches, r.seconds)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The statistics as a data frame
+
+        Returns
+        -------
+        A data frame with one row per column and spotter
+        """
+        rows = [(column, uid, r.scanned, r.skipped, r.changed, r.matches, r.seconds)
+                for (column, uid), r in self.records.items()]
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+    def by_spotter(self) -> pd.DataFrame:
+        """
+        The statistics summed over the columns
+
+        Returns
+        -------
+        A data frame indexed by spotter uid
+        """
+        return self.to_frame().drop(columns="column").groupby("spotter", sort=False).sum(min_count=1)
@@ -0,0 +1,253 @@
+from __future__ import annotations
+import os
+from sanityze.lazy import LazyModule
+pd = LazyModule("pandas")
+
+# file formats supported by Cleanser.clean_file(), by extension
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".jsonl": "jsonl", ".ndjson": "jsonl",
+           ".txt": "text", ".log": "text"}
+# the column holding the lines of a text file
+TEXT_COLUMN = "line"
+
+
+def infer_format(path: str) -> str:
+    """
+    Infer the file format from the extension of the path
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, a compression extension (e.g. .csv.gz) is ignored
+
+    Returns
+    -------
+    The name of the format, one of the values of FORMATS
+
+    Examples
+    --------
+    >>> infer_format("export.csv.gz")
+    'csv'
+
+    """
+    name = str(path).lower()
+    for compression in (".gz", ".bz2", ".zip", ".xz", ".zst"):
+        if name.endswith(compression):
+            name = name[:-len(compression)]
+    for extension, file_format in FORMATS.items():
+        if name.endswith(extension):
+            return file_format
+    raise ValueError(f"cannot infer the format of {path}, use one of {sorted(set(FORMATS.values()))}")
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow.parquet, which is only needed for Parquet files
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow is required to read and write Parquet files, "
+                          "install it with `pip install sanityze[arrow]`") from e
+    return pq
+
+
+def read_chunks(src, file_format: str, chunksize: int):
+    """
+    Read a file as an iterator of data frames of at most chunksize rows, so only
+    one chunk is held in memory at a time. CSV cells are all read as text: the dtypes
+    pandas would infer can change from one chunk to the next, e.g. a column of card
+    numbers read as int64 in a chunk would not be cleaned, and the cells are written
+    back exactly as they were read
+
+    Parameters
+    ----------
+    src : str or file-like
+        The file to read
+    file_format : str
+        The format of the file, "csv", "parquet", "jsonl" (one JSON object per line)
+        or "text" (one row per line, in a column named "line")
+    chunksize : int
+        The maximum number of rows per chunk
+
+    Returns
+    -------
+    An iterator of pd.DataFrame
+
+    Examples
+    --------
+    >>> for chunk in read_chunks("tests/data_with_pii.csv", "csv", 5):
+    ...     print(chunk.shape)
+    (5, 8)
+    (5, 8)
+    (5, 8)
+    (5, 8)
+
+    """
+    if file_format == "csv":
+        with pd.read_csv(src, chunksize=chunksize, dtype=str, keep_default_na=False) as reader:
+            yield from reader
+    elif file_format == "parquet":
+        pq = _import_pyarrow()
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif file_format == "jsonl":
+        with pd.read_json(src, lines=True, chunksize=chunksize, dtype=False, convert_dates=False) as reader:
+            yield from reader
+    elif file_format == "text":
+        with _open_text(src, "r") as lines:
+            chunk = []
+            for line in lines:
+                chunk.append(line[:-1] if line.endswith("\n") else line)
+                if len(chunk) == chunksize:
+                    yield pd.DataFrame({TEXT_COLUMN: chunk}, dtype=object)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame({TEXT_COLUMN: chunk}, dtype=object)
+    else:
+        raise ValueError(f"unsupported file format {file_format}")
+
+
+class ChunkWriter:
+    """
+    Write data frames one after the other to a single file, to be used as a
+    context manager
+
+    Parameters
+    ----------
+    dst : str or file-like
+        The file to write
+    file_format : str
+        The format of the file, "csv", "parquet", "jsonl" or "text" (the first
+        column is written, one line per row)
+    schema : pyarrow.Schema, optional
+        For Parquet, the schema of the file. By default the schema of the first
+        chunk is used, which can be too narrow if a column is all null in it
+
+    Examples
+    --------
+    >>> with ChunkWriter("clean.csv", "csv") as writer:
+    ...     for chunk in read_chunks("tests/data_with_pii.csv", "csv", 5):
+    ...         writer.write(chunk)
+
+    """
+    def __init__(self, dst, file_format: str, schema=None):
+        if file_format not in FORMATS.values():
+            raise ValueError(f"unsupported file format {file_format}")
+        self.dst = dst
+        self.file_format = file_format
+        self.schema = schema
+        self.rows = 0
+        self._writer = None
+        self._text = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Append a chunk to the file, the first chunk sets the columns
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The chunk to write, its index is not written
+
+        Returns
+        -------
+        None
+
+        """
+        if self.file_format == "csv":
+            df.to_csv(self.dst, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        elif self.file_format in ("jsonl", "text"):
+            if self._text is None:
+                self._text = _open_text(self.dst, "w")
+            if self.file_format == "jsonl":
+                lines = df.to_json(orient="records", lines=True, force_ascii=False) if len(df) else ""
+            else:
+                lines = "".join(line + "\n" for line in df.iloc[:, 0].astype(str))
+            if lines:
+                self._text.write(lines if lines.endswith("\n") else lines + "\n")
+        else:
+            import pyarrow as pa
+            pq = _import_pyarrow()
+            if self._writer is None:
+                if self.schema is None:
+                    self.schema = pa.Schema.from_pandas(df, preserve_index=False)
+                self._writer = pq.ParquetWriter(self.dst, self.schema)
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """
+        Flush and close the file
+
+        Returns
+        -------
+        None
+
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._text is not None:
+            self._text.close()
+            self._text = None
+
+
+def parquet_schema(src):
+    """
+    Read the schema of a Parquet file without the pandas index columns, to write
+    a cleaned copy of it with the same column types
+
+    Parameters
+    ----------
+    src : str or file-like
+        The Parquet file
+
+    Returns
+    -------
+    The pyarrow.Schema of the data columns
+
+    Examples
+    --------
+    >>> parquet_schema("export.parquet")
+    email: string
+    balance: int64
+
+    """
+    pq = _import_pyarrow()
+    schema = pq.read_schema(src)
+    index_columns = schema.pandas_metadata.get("index_columns", []) if schema.pandas_metadata else []
+    for name in index_columns:
+        if isinstance(name, str) and name in schema.names:
+            schema = schema.remove(schema.get_field_index(name))
+    return schema
+
+
+class _open_text:
+    """
+    Internal utility context manager opening a path as UTF-8 text, or using a
+    file-like as is without closing it (e.g. sys.stdin and sys.stdout)
+    """
+    def __init__(self, file, mode: str):
+        self._owned = isinstance(file, (str, os.PathLike))
+        self.file = open(file, mode, encoding="utf-8", newline="\n" if mode == "w" else None) if self._owned else file
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+
+    def close(self) -> None:
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
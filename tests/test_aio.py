@@ -0,0 +1,55 @@
+from sanityze.cleanser import *
+from sanityze.aio import batch_records
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import pytest
+
+async def trickle(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+async def collect(aiterator):
+    return [item async for item in aiterator]
+
+# test that aclean gives the same result as clean, in threads and in a process
+def test_aclean():
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'engineer', '4556129404313766']})
+    c = Cleanser()
+    assert asyncio.run(c.aclean(df)).equals(Cleanser().clean(df))
+    with ProcessPoolExecutor(1) as pool:
+        assert asyncio.run(c.aclean(df, executor=pool)).equals(Cleanser().clean(df))
+    assert c.prefilter_skipped['CREDITCARD'] == 4, "The counters of the worker should be merged"
+    cleaned, stats = asyncio.run(c.aclean(df, return_stats=True))
+    assert stats.records[('notes', 'EMAILADDRS')].changed == 1
+
+# test the batching by size and by delay
+def test_batch_records():
+    records = [{'n': i} for i in range(5)]
+    batches = asyncio.run(collect(batch_records(trickle(records), 2, 10.0)))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    batches = asyncio.run(collect(batch_records(trickle([records[:3], records[3]]), 10, 10.0)))
+    assert [len(b) for b in batches] == [4]
+    # a record arriving after the delay starts a new batch
+    batches = asyncio.run(collect(batch_records(trickle(records, 0.05), 10, 0.01)))
+    assert sum(len(b) for b in batches) == 5 and len(batches) > 1
+
+# test that the records are cleaned in order
+def test_aclean_records():
+    records = [{'id': i, 'notes': f'user{i}@gaga.com' if i % 2 else 'engineer'} for i in range(25)]
+    frames = asyncio.run(collect(Cleanser().aclean_records(trickle(records), batch_size=10)))
+    assert [len(f) for f in frames] == [10, 10, 5]
+    cleaned = pd.concat(frames, ignore_index=True)
+    assert cleaned['id'].tolist() == list(range(25))
+    assert set(cleaned['notes']) == {'EMAILADDRS', 'engineer'}
+
+# test that the errors of the source are raised and the arguments checked
+def test_aclean_records_errors():
+    async def failing():
+        yield {'notes': 'foo@gaga.com'}
+        raise RuntimeError("source failed")
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(Cleanser().aclean_records(failing(), batch_size=1)))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(Cleanser().aclean_records(trickle([]), batch_size=0)))
@@ -0,0 +1,56 @@
+from sanityze.cleanser import *
+from sanityze.spotters import *
+from sanityze.arrow import to_re2
+import re
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+cells = ["foo@gaga.com and 4556129404313766", None, "engineer", "5555 5555 5555 4444", "x at gaga dot com"]
+
+class ZipSpotter(Spotter):
+    pattern = r"[0-9]{5}"
+    def getSpotterUID(self):
+        return "ZIPCODE"
+
+# test the translation of the Python regexes to RE2
+def test_to_re2():
+    assert to_re2(r"[0-9]{5}", re.IGNORECASE) == "(?i)[0-9]{5}"
+    assert to_re2(r"a b  # comment", re.VERBOSE) == "ab"
+    assert to_re2(r"[\d]", 0) == r"[\p{Nd}]"
+    assert to_re2(r"\b[0-9]{5}\b", 0) is None, "\\b is Unicode in Python only"
+    assert to_re2(r"(?<![0-9])1", 0) is None, "RE2 has no lookbehind"
+    assert re.fullmatch(r"\s", " ") and to_re2(r"\s", 0) is not None
+
+# test that a Table is cleaned like a data frame and keeps its other columns
+def test_clean_table():
+    table = pa.table({'notes': cells, 'n': list(range(5))})
+    expected = Cleanser().clean(pd.DataFrame({'notes': cells}))['notes'].tolist()
+    cleaned, stats = Cleanser().clean(table, return_stats=True)
+    assert isinstance(cleaned, pa.Table)
+    assert cleaned.column('notes').to_pylist() == expected
+    assert cleaned.column('n').to_pylist() == list(range(5))
+    assert stats.records[('notes', 'EMAILADDRS')].skipped == 2
+    with pytest.raises(ValueError):
+        Cleanser().clean(table, n_jobs=2)
+
+# test the Arrow backed string columns of a data frame
+def test_clean_arrow_columns():
+    expected = Cleanser(hash_spotted=True).clean(pd.DataFrame({'notes': cells}))['notes']
+    for dtype in ["string[pyarrow]", pd.ArrowDtype(pa.string())]:
+        df = pd.DataFrame({'notes': pd.Series(cells, dtype=dtype)})
+        cleaned = Cleanser(hash_spotted=True).clean(df)
+        assert cleaned['notes'].dtype == df['notes'].dtype
+        assert cleaned['notes'].astype(object).where(cleaned['notes'].notna(), None).tolist() == expected.tolist()
+
+# test that the spotters replacing with their uid run in the kernel, the others in Python
+def test_process_arrow_kernel(monkeypatch):
+    array = pa.array(["Zip 90210", "none"])
+    def fail(self, series):
+        raise AssertionError("processSeries should not be called")
+    monkeypatch.setattr(Spotter, "processSeries", fail)
+    assert ZipSpotter("ZIPS").processArrow(array).to_pylist() == ["Zip ZIPCODE", "none"]
+    monkeypatch.undo()
+    hashed = ZipSpotter("ZIPS", True).processArrow(array).to_pylist()
+    assert hashed == [ZipSpotter("ZIPS", True).process("Zip 90210"), "none"]
+    assert EmailSpotter("EMAILS").mayContainArrow(pa.array(["a@b.com", "Okay", None])).to_pylist() == [True, False, False]
@@ -0,0 +1,60 @@
+from sanityze.cleanser import *
+from sanityze.cache import MemoCache
+import pytest
+
+# test the lru and fifo evictions
+def test_memo_cache_eviction():
+    for policy, kept in [("lru", "a"), ("fifo", "b")]:
+        cache = MemoCache(2, policy)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        assert cache.get("a") == "A"
+        cache.put("c", "C")
+        assert cache.get(kept) is not None, f"{policy} should have kept {kept}"
+        assert cache.info()["evictions"] == 1
+        assert len(cache) == 2
+
+# test that the cache does not change the results and counts hits and misses
+def test_cleanser_with_cache():
+    df = pd.DataFrame({'title': ['foo@gaga.com', 'engineer', 'foo@gaga.com', None, 'engineer'],
+                       'notes': ['engineer', 'foo@gaga.com', 'x', 'y', 'z']})
+    c = Cleanser(include_default_spotters=True, cache_size=100)
+    assert c.clean(df).equals(Cleanser().clean(df))
+    assert c.cache.info()["misses"] == 5, "Each distinct string should be looked up once"
+    assert c.cache.info()["hits"] == 2, "The second column should reuse the first column values"
+    c.clean(df)
+    assert c.cache.info()["hits"] == 9
+
+# test that only the categories of a categorical column are cleaned
+def test_clean_categorical():
+    df = pd.DataFrame({'title': pd.Categorical(['foo@gaga.com', 'engineer', 'bar@gaga.com', None, 'engineer'])})
+    output_df = Cleanser().clean(df)
+    assert isinstance(output_df['title'].dtype, pd.CategoricalDtype)
+    assert list(output_df['title'].cat.categories) == ['EMAILADDRS', 'engineer']
+    assert output_df['title'].tolist()[:3] == ['EMAILADDRS', 'engineer', 'EMAILADDRS']
+    assert output_df['title'].isna().tolist() == [False, False, False, True, False]
+    df_without_pii = pd.DataFrame({'title': pd.Categorical(['engineer', 'nurse'])})
+    assert Cleanser().clean(df_without_pii).equals(df_without_pii)
+    with pytest.raises(ValueError):
+        MemoCache(0)
+
+# test that the cache is cleared when the chain list is changed directly
+def test_cache_chain_changed():
+    df = pd.DataFrame({'notes': ['call Jacob King', 'foo@gaga.com']})
+    c = Cleanser(include_default_spotters=True, cache_size=100)
+    assert c.clean(df)['notes'].tolist() == ['call Jacob King', 'EMAILADDRS']
+    c.chain.append(DictionarySpotter("NAME", ["Jacob King"]))
+    assert c.clean(df)['notes'].tolist() == ['call NAME', 'EMAILADDRS']
+    assert c.clean_text('call Jacob King') == 'call NAME'
+    c.chain.pop()
+    assert c.clean_text('call Jacob King') == 'call Jacob King'
+
+# test that the missing values of a string column stay missing with the cache
+@pytest.mark.parametrize("fused", [False, True, "spans"])
+def test_cache_string_dtype_with_na(fused):
+    df = pd.DataFrame({'notes': pd.Series(['a@b.com', pd.NA, 'engineer', pd.NA], dtype="string")})
+    c = Cleanser(include_default_spotters=True, cache_size=100)
+    output_df = c.clean(df, fused=fused)
+    assert output_df['notes'].dtype == "string"
+    assert output_df['notes'].isna().tolist() == [False, True, False, True]
+    assert output_df.equals(Cleanser().clean(df, fused=fused))
@@ -114,4 +114,127 @@ def test_print_log_1():
 def test_print_log_2():
     c = Cleanser(include_default_spotters=True)
     c._log("foo",False)
-    assert(True,"Cleanser should have not printed the log properly")
\ No newline at end of file
+    assert(True,"Cleanser should have not printed the log properly")
+# test that the column-wise clean matches running the chain cell by cell
+def test_clean_matches_cell_by_cell():
+    df = pd.DataFrame({'notes': ['foo@gaga.com', None, 42, 'card 4556129404313766', float('nan')],
+                       'text': pd.Series(['a@b.com', None, 'x', 'y', 'z'], dtype="string"),
+                       'price': [1, 2, 3, 4, 5]})
+    for hash_spotted in [False, True]:
+        c = Cleanser(include_default_spotters=True, hash_spotted=hash_spotted)
+        expected = df.copy()
+        for i in range(df.shape[0]):
+            for j in range(df.shape[1]):
+                cell = df.iat[i, j]
+                if isinstance(cell, str):
+                    for spotter in c.chain:
+                        cell = spotter.process(cell)
+                    expected.iat[i, j] = cell
+        output_df = c.clean(df)
+        assert output_df.equals(expected), "Cleanser should match the cell by cell results"
+        assert output_df.dtypes.equals(df.dtypes), "Cleanser should preserve the column dtypes"
+
+# test that the spotters overriding process() are never handed the missing values
+def test_clean_string_dtype_with_na():
+    class UpperSpotter(Spotter):
+        def process(self, text):
+            return text.upper() if "@" in text else text
+    df = pd.DataFrame({'text': pd.Series(['a@b.com', pd.NA, 'x'], dtype="string")})
+    c = Cleanser(include_default_spotters=False)
+    c.add_spotter(UpperSpotter("UPPER"))
+    output_df = c.clean(df)
+    assert output_df['text'].dtype == "string"
+    assert output_df['text'].tolist()[::2] == ['A@B.COM', 'x'] and output_df['text'].isna().tolist() == [False, True, False]
+
+# test that the fused scanner gives the same results as the sequential chain
+def test_fused_clean_matches_sequential():
+    df = pd.read_csv('tests/data_with_pii.csv')
+    for hash_spotted in [False, True]:
+        c = Cleanser(include_default_spotters=True, hash_spotted=hash_spotted)
+        assert c.clean(df, fused=True).equals(c.clean(df)), "Fused clean should match the sequential clean"
+    assert input_df.pipe(Cleanser().clean, fused=True).equals(expected_df)
+
+# test that the fused scanner resolves overlaps by chain order on random cells
+def test_fused_clean_overlaps():
+    rng = np.random.default_rng(0)
+    pieces = ["4556 1294 0431 3766", "4556129404313766", "378282246310005", "5555-5555-5555-4444", "123", "x",
+              "foo@gaga.com", "1234 5678 9012 3456", "Jacob King", "@x.com", "4556 1294 0431 3766@x.com", "King@gaga.com",
+              "dot@12.5555-5555-5555-44445555-5555-5555-4444", "5555-5555-5555-4444-"]
+    cells = [" ".join(rng.choice(pieces, size=rng.integers(1, 7))) for _ in range(3000)]
+    df = pd.DataFrame({'notes': cells})
+    c = Cleanser(include_default_spotters=True)
+    c.add_spotter(DictionarySpotter("NAME", ["Jacob King"]))
+    sequential = c.clean(df)
+    assert c.clean(df, fused=True).equals(sequential)
+    assert c.clean(df, fused="spans").equals(sequential)
+    assert [c.clean_text(cell, fused=True) for cell in cells[:300]] == list(sequential['notes'][:300])
+    assert c.clean_text("4556 1294 0431 3766@x.com", fused=True) == "4556 1294 0431 EMAILADDRS"
+    # a card starting inside the match of an email
+    for fused in (False, True, "spans"):
+        assert c.clean_text("bar@mail.org4556-1294 5555-5555-5555-4444", fused=fused) == "EMAILADDRS CREDITCARD"
+    # a card after an email whose digit run starts inside the email
+    cell = "dot@12.5555-5555-5555-44445555-5555-5555-4444 5555-5555-5555-4444-"
+    for hash_spotted in [False, True]:
+        hashing = Cleanser(include_default_spotters=True, hash_spotted=hash_spotted)
+        sequential = hashing.clean_text(cell)
+        assert "5555-5555-5555-4444" not in sequential
+        assert hashing.clean_text(cell, fused=True) == sequential
+        assert hashing.clean_text(cell, fused="spans") == sequential
+
+# test that only the consecutive fusable spotters are merged
+def test_fused_chain():
+    c = Cleanser(include_default_spotters=True)
+    chain = c._fused_chain()
+    assert len(chain) == 1 and isinstance(chain[0], FusedSpotter)
+    assert chain[0].spotters == c.chain
+    c = Cleanser(include_default_spotters=True, hash_spotted=True)
+    assert len(c._fused_chain()) == 1, "Hashing spotters only hash their matches, they can be fused"
+
+# test that the prefilters skip the cells without PII and count them
+def test_prefilter_skipped():
+    c = Cleanser(include_default_spotters=True)
+    output_df = c.clean(input_df)
+    assert output_df.equals(expected_df)
+    assert c.prefilter_skipped["EMAILADDRS"] == 2, "Only the cell with an @ should reach the EmailSpotter"
+    assert c.prefilter_skipped["CREDITCARD"] == 2, "Only the cell with 13 digits should reach the CreditCardSpotter"
+    c.clean(input_df, fused=True)
+    assert c.prefilter_skipped["EMAILADDRS+CREDITCARD"] == 1
+
+# test that cleaning in worker processes gives the same results as the serial path
+def test_parallel_clean_matches_serial():
+    df = pd.read_csv('tests/data_with_pii.csv')
+    df.index = df.index * 3
+    for hash_spotted in [False, True]:
+        c = Cleanser(include_default_spotters=True, hash_spotted=hash_spotted)
+        serial = c.clean(df)
+        parallel = c.clean(df, n_jobs=2)
+        assert parallel.equals(serial), "Parallel clean should match the serial clean"
+        assert parallel.index.equals(df.index)
+    c_serial, c_parallel = Cleanser(), Cleanser()
+    c_serial.clean(df)
+    c_parallel.clean(df, n_jobs=2)
+    assert c_parallel.prefilter_skipped == c_serial.prefilter_skipped, "Workers should report their prefilter counters"
+
+# test that an invalid n_jobs is rejected
+def test_clean_with_invalid_n_jobs():
+    c = Cleanser(include_default_spotters=True)
+    with pytest.raises(ValueError):
+        c.clean(input_df, n_jobs=0)
+
+# test cleaning in place
+def test_clean_inplace():
+    for n_jobs in [1, 2]:
+        df = input_df.copy()
+        assert Cleanser().clean(df, inplace=True, n_jobs=n_jobs) is None
+        assert df.equals(expected_df), "The data frame should have been cleaned in place"
+
+# test that copy=False only allocates the columns that change
+def test_clean_copy_on_write():
+    df = input_df.copy()
+    df['title'] = ['engineer', 'nurse', 'pilot']
+    output_df = Cleanser().clean(df, copy=False)
+    assert output_df.equals(expected_df.assign(title=df['title']))
+    assert df.equals(input_df.assign(title=df['title'])), "The input should be left intact"
+    assert np.shares_memory(output_df['price'].to_numpy(), df['price'].to_numpy())
+    assert np.shares_memory(output_df['title'].to_numpy(), df['title'].to_numpy()), "Unchanged text columns should be shared"
+    assert not np.shares_memory(Cleanser().clean(df)['price'].to_numpy(), df['price'].to_numpy())
@@ -0,0 +1,60 @@
+from sanityze.cleanser import *
+from sanityze.cli import main
+import io
+import pytest
+
+# test that a CSV file is redacted to stdout chunk by chunk
+def test_cli_csv(capsys):
+    assert main(['tests/data_with_pii.csv', '--chunksize', '7']) == 0
+    out, err = capsys.readouterr()
+    expected = Cleanser().clean(pd.read_csv('tests/data_with_pii.csv', dtype=str, keep_default_na=False))
+    assert pd.read_csv(io.StringIO(out), dtype=str, keep_default_na=False).equals(expected)
+    assert err.startswith("sanityze: 20 rows")
+    assert "EMAILADDRS  20 cells changed" in err
+
+# test the spotter selection and the hash mode
+def test_cli_spotters(capsys):
+    assert main(['tests/data_with_pii.csv', '--spotters', 'email', '--hash', '--quiet']) == 0
+    out, err = capsys.readouterr()
+    assert err == ""
+    out = pd.read_csv(io.StringIO(out), dtype=str)
+    source = pd.read_csv('tests/data_with_pii.csv', dtype=str)
+    assert not out['email_address'].str.contains('@').any()
+    assert out['email_address'].str.contains('[0-9a-f]{32}').all()
+    assert out['visa_cc'].equals(source['visa_cc'])
+
+# test that the nested values of JSON lines are redacted
+def test_cli_jsonl_nested(capsys, tmp_path):
+    (tmp_path / "data.jsonl").write_text('{"user":{"email":"foo@gaga.com"},"tags":["bar@gaga.com"]}\n')
+    assert main([str(tmp_path / "data.jsonl"), '-q']) == 0
+    assert capsys.readouterr().out == '{"user":{"email":"EMAILADDRS"},"tags":["EMAILADDRS"]}\n'
+    (tmp_path / "cards.jsonl").write_text('{"l":["4556129404313766"]}\n')
+    assert main([str(tmp_path / "cards.jsonl")]) == 0
+    captured = capsys.readouterr()
+    assert captured.out == '{"l":["CREDITCARD"]}\n'
+    assert "CREDITCARD  1 cells changed" in captured.err
+
+# test that stdin is read as text lines, empty lines included
+def test_cli_stdin_text(capsys, monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("mail foo@gaga.com\n\ncard 4556129404313766\n"))
+    assert main(['-q']) == 0
+    assert capsys.readouterr().out == "mail EMAILADDRS\n\ncard CREDITCARD\n"
+
+# test the JSON lines format and a file of terms
+def test_cli_jsonl(capsys, tmp_path):
+    (tmp_path / "data.jsonl").write_text('{"name": "Jacob King", "n": 1}\n{"name": "foo@gaga.com", "n": 2}\n')
+    (tmp_path / "terms.txt").write_text("Jacob King\n")
+    assert main([str(tmp_path / "data.jsonl"), '--terms', str(tmp_path / "terms.txt"), '-q']) == 0
+    out = pd.read_json(io.StringIO(capsys.readouterr().out), lines=True)
+    assert list(out['name']) == ['TERM', 'EMAILADDRS']
+    assert list(out['n']) == [1, 2]
+
+# test the invalid arguments
+def test_cli_errors(capsys):
+    for argv in (['export.xlsx'], ['tests/data_with_pii.csv', '--spotters', 'phone'],
+                 ['tests/data_with_pii.csv', '--jobs', '0'], ['tests/data_with_pii.csv', '--spotters', '']):
+        with pytest.raises(SystemExit) as e:
+            main(argv)
+        assert e.value.code == 2
+    assert main(['missing.csv']) == 1
+    assert "error" in capsys.readouterr().err
@@ -0,0 +1,92 @@
+from sanityze.cleanser import *
+import io
+import pickle
+import pytest
+
+df = pd.DataFrame({'notes': ['foo@gaga.com', 'Okay', 'card 4556129404313766', 'Jacob King'],
+                   'price': [1, 2, 3, 4]})
+
+def make_cleanser():
+    c = Cleanser()
+    c.add_spotter(DictionarySpotter("NAME", ["Jacob King"]))
+    return c
+
+# test that a compiled cleanser cleans like the Cleanser it was compiled from
+def test_compile_clean():
+    c = make_cleanser()
+    for fused in (False, True):
+        compiled = c.compile(fused=fused)
+        assert compiled.spotters == ('EMAILADDRS', 'CREDITCARD', 'NAME')
+        assert compiled.clean(df).equals(c.clean(df, fused=fused))
+        assert compiled.clean_text('mail foo@gaga.com') == 'mail EMAILADDRS'
+        assert compiled.clean_records([{'a': 'Jacob King'}]) == [{'a': 'NAME'}]
+        assert compiled.fingerprint == c.fingerprint(fused)
+
+# test that the compiled cleanser is frozen
+def test_compile_immutable():
+    c = make_cleanser()
+    compiled = c.compile()
+    with pytest.raises(AttributeError):
+        compiled.fused = True
+    with pytest.raises(AttributeError):
+        del compiled.plan
+    c.remove_spotter('EMAILADDRS')
+    assert compiled.clean_text('foo@gaga.com') == 'EMAILADDRS'
+
+# test that the compiled cleanser pickles with its fused chain
+def test_compile_pickle(tmp_path):
+    compiled = make_cleanser().compile(fused=True)
+    loaded = pickle.loads(pickle.dumps(compiled))
+    chain = loaded._cleanser._chains[1][(True, None)]
+    assert loaded._cleanser._compiled_chain(True) is chain
+    assert loaded.clean(df).equals(compiled.clean(df))
+    compiled.save(tmp_path / "cleanser.pkl")
+    assert CompiledCleanser.load(tmp_path / "cleanser.pkl").clean(df).equals(compiled.clean(df))
+    buffer = io.BytesIO()
+    compiled.save(buffer)
+    buffer.seek(0)
+    assert CompiledCleanser.load(buffer).spotters == compiled.spotters
+    with open(tmp_path / "other.pkl", "wb") as f:
+        pickle.dump([1], f)
+    with pytest.raises(TypeError):
+        CompiledCleanser.load(tmp_path / "other.pkl")
+
+# test a compiled cleanser with a plan and in parallel
+def test_compile_plan():
+    c = make_cleanser()
+    plan = c.plan(df, exclude=['notes'])
+    assert c.compile(plan=plan).clean(df).equals(df)
+    plan = c.plan(df)
+    compiled = c.compile(fused=True, plan=plan)
+    assert compiled.clean(df, n_jobs=2).equals(c.clean(df, fused=True, plan=plan))
+
+# test the validation of the chain
+def test_compile_errors():
+    with pytest.raises(ValueError):
+        Cleanser(include_default_spotters=False).compile()
+    c = Cleanser()
+    c.chain.append(EmailSpotter("EMAILS"))
+    with pytest.raises(ValueError):
+        c.compile()
+    class BrokenSpotter(Spotter):
+        pattern = "[a-"
+    c = Cleanser()
+    c.add_spotter(BrokenSpotter("BROKEN"))
+    with pytest.raises(ValueError):
+        c.compile()
+    c = Cleanser()
+    spotter = EmailSpotter("EMAILS")
+    c.chain = [spotter]
+    spotter.unpicklable = lambda: None
+    with pytest.raises(ValueError):
+        c.compile()
+
+# test that add_spotter returns True and follows direct changes to the chain
+def test_add_spotter_uids():
+    c = Cleanser(include_default_spotters=False)
+    assert c.add_spotter(EmailSpotter("EMAILS")) is True
+    assert c.add_spotter(EmailSpotter("EMAILS")) is False
+    c.chain.clear()
+    assert c.add_spotter(EmailSpotter("EMAILS")) is True
+    assert c.remove_spotter("EMAILADDRS")
+    assert c.add_spotter(EmailSpotter("EMAILS")) is True
@@ -16,9 +16,9 @@ fake_cc = {"VISA" : "4556129404313766",
            "JCB" : "3538159804477445"
            }
 
-# test string for credit card md5 hashes
+# test string for credit card md5 hashes, only the card number is hashed
 cc_number = "VISA, 4929688015693122"
-credit_hash = "VISA, 34c2171639b834dce4b1c0183a91d427"
+credit_hash = "VISA, d9b2350b56eb748e20a4ba376ab8b1dc"
 
 # strings of equal length to credit cards
 number_string = "5628404238239405, 5673289472024660, 8709, 356785, 1111111111111111"
@@ -52,3 +52,72 @@ def test_creditcard_spotter_full_cc():
 # check correct hashes are replaced
 def test_creditcard_spotter_hash():
     assert credit_hash == cc_Spotter_hash.process(cc_number)
+
+# check the same card number gets the same hash in any text, and keyed hashes differ
+def test_creditcard_spotter_hash_spans():
+    assert cc_Spotter_hash.process("4929688015693122") == "d9b2350b56eb748e20a4ba376ab8b1dc"
+    keyed = CreditCardSpotter(uid="CREDITCARD", hashSpotted=True, hashAlgorithm="blake2b", hashKey="secret")
+    other_key = CreditCardSpotter(uid="CREDITCARD", hashSpotted=True, hashAlgorithm="blake2b", hashKey="other")
+    assert keyed.process(cc_number) != credit_hash
+    assert keyed.process(cc_number) == keyed.process(cc_number)
+    assert keyed.process(cc_number) != other_key.process(cc_number)
+
+# check card numbers written with spaces or dashes are matched, and hashed like the plain digits
+def test_creditcard_spotter_separators():
+    assert "desk CREDITCARD" == cc_Spotter_no_hash.process("desk 5555 5555 5555 4444")
+    assert "CREDITCARD or CREDITCARD" == cc_Spotter_no_hash.process("4556-1294-0431-3766 or 3451 606780 82328")
+    assert cc_Spotter_hash.process("4929 6880 1569 3122") == cc_Spotter_hash.process("4929688015693122")
+
+# check the numbers failing the Luhn checksum or longer than a card are left alone
+def test_creditcard_spotter_luhn():
+    assert "5555 5555 5555 4445" == cc_Spotter_no_hash.process("5555 5555 5555 4445")
+    assert "45561294043137660000" == cc_Spotter_no_hash.process("45561294043137660000")
+    no_luhn = CreditCardSpotter(uid="CREDITCARD", validateLuhn=False)
+    assert "CREDITCARD" == no_luhn.process("5555 5555 5555 4445")
+    assert cc_Spotter_no_hash.isCardNumber("4556129404313766")
+    assert not cc_Spotter_no_hash.isCardNumber("1111111111111111")
+
+# check the column processing matches the cell processing, alone and fused
+def test_creditcard_spotter_series():
+    cells = ["desk 5555 5555 5555 4444, 5555 5555 5555 4445", "x 1111111111111111", "VISA, 4929688015693122", "Okay"]
+    series = pd.Series(cells)
+    for spotter in (cc_Spotter_no_hash, cc_Spotter_hash):
+        assert spotter.processSeries(series).tolist() == [spotter.process(cell) for cell in cells]
+    assert cc_Spotter_no_hash.countMatches(series) == 2
+    fused = FusedSpotter([EmailSpotter("EMAILS"), cc_Spotter_no_hash])
+    assert fused.process(cells[0]) == cc_Spotter_no_hash.process(cells[0])
+
+# check a card followed by more digits is still replaced, the extra digits are kept
+def test_creditcard_spotter_trailing_digits():
+    assert "card CREDITCARD 123" == cc_Spotter_no_hash.process("card 4556129404313766 123")
+    assert "CREDITCARD 1234" == cc_Spotter_no_hash.process("378282246310005 1234")
+    assert "CREDITCARD-992" == cc_Spotter_no_hash.process("4556-1294-0431-3766-992")
+    assert cc_Spotter_no_hash.cardParts("4556129404313766 123") == [(0, 16, "4556129404313766")]
+    series = pd.Series(["card 4556129404313766 123", "5555 5555 5555 4445 12"])
+    assert cc_Spotter_no_hash.processSeries(series).tolist() == ["card CREDITCARD 123", "5555 5555 5555 4445 12"]
+    assert cc_Spotter_no_hash.countMatches(series) == 1
+    assert cc_Spotter_no_hash.cardNumbers(series) == {"4556129404313766": "4556129404313766"}
+    rows, starts, ends = cc_Spotter_no_hash.findSpans(series)
+    assert (list(rows), list(starts), list(ends)) == ([0], [5], [21])
+
+# check a card is hashed when it is followed by the hash of an email, whose digits extend the run
+def test_creditcard_spotter_after_hashed_email():
+    c = Cleanser(hash_spotted=True)
+    text = "paid with 4556129404313766 foo@gaga.com"
+    card_hash = cc_Spotter_hash.process("4556129404313766")
+    for fused in (False, True, "spans"):
+        cleaned = c.clean_text(text, fused=fused)
+        assert "4556129404313766" not in cleaned
+        assert cleaned.startswith(f"paid with {card_hash} ")
+    cleaned = c.clean(pd.DataFrame({"notes": [text, "Okay"]}))
+    assert cleaned["notes"][0] == c.clean_text(text)
+
+# check a card preceded by other digits is replaced, whatever the run it is part of
+def test_creditcard_spotter_leading_digits():
+    assert "1234 CREDITCARD" == cc_Spotter_no_hash.process("1234 5555-5555-5555-4444")
+    assert "12 34 CREDITCARD 56" == cc_Spotter_no_hash.process("12 34 4556 1294 0431 3766 56")
+    assert "1234 5678 9012 3456 7890" == cc_Spotter_no_hash.process("1234 5678 9012 3456 7890")
+    c = Cleanser(hash_spotted=True)
+    card_hash = cc_Spotter_hash.process("5555555555554444")
+    for fused in (False, True, "spans"):
+        assert c.clean_text("7@x.com 5555-5555-5555-4444", fused=fused).endswith(f" {card_hash}")
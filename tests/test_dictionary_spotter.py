@@ -0,0 +1,53 @@
+from sanityze.cleanser import *
+from sanityze.spotters import *
+from sanityze import engine
+import pickle
+import hashlib
+import pytest
+
+# test that the terms are matched regardless of case, on word boundaries, longest first
+def test_dictionary_spotter_process():
+    ds = DictionarySpotter("CUSTOMER", ["Jacob King", "Jacob", "ab", "abc", "host-01.corp"])
+    assert ds.termCount() == 5
+    assert ds.process("Call jacob KING and Jacob") == "Call CUSTOMER and CUSTOMER"
+    assert ds.process("abc ab abcd Jacobs") == "CUSTOMER CUSTOMER abcd Jacobs"
+    assert ds.process("ping host-01.corp.") == "ping CUSTOMER."
+
+# test the case sensitive matching without word boundaries
+def test_dictionary_spotter_options():
+    ds = DictionarySpotter("TERM", ["Jacob"], ignoreCase=False, wordBoundaries=False)
+    assert ds.process("Jacobs jacob") == "TERMs jacob"
+    with pytest.raises(ValueError):
+        DictionarySpotter("TERM", ["", ""])
+
+# test the hashing, the Cleanser and the fused chain
+def test_dictionary_spotter_cleanser():
+    df = pd.DataFrame({'notes': ['jacob king at foo@gaga.com', 'nobody', None]})
+    c = Cleanser()
+    c.add_spotter(DictionarySpotter("CUSTOMER", ["Jacob King"]))
+    expected = pd.DataFrame({'notes': ['CUSTOMER at EMAILADDRS', 'nobody', None]})
+    assert c.clean(df).equals(expected)
+    assert c.clean(df, fused=True).equals(expected)
+    hashed = DictionarySpotter("CUSTOMER", ["Jacob King"], hashSpotted=True)
+    assert hashed.process("Jacob King") == hashlib.md5(b"Jacob King").hexdigest()
+
+# test that a pickled spotter is loaded without rebuilding the trie nor compiling the pattern
+def test_dictionary_spotter_pickle(monkeypatch):
+    ds = DictionarySpotter("CUSTOMER", ["Jacob King", "Chloe Lavoie"])
+    ds.process("warm up the compiled pattern")
+    blob = pickle.dumps(ds)
+    def compile_program(pattern, flags):
+        raise AssertionError("the pattern should not be compiled again")
+    monkeypatch.setattr(engine, "compile_program", compile_program)
+    loaded = pickle.loads(blob)
+    assert "_compiledPattern" not in loaded.__dict__
+    assert loaded.pattern == ds.pattern
+    assert loaded.process("chloe lavoie and Jacob KING") == "CUSTOMER and CUSTOMER"
+    assert loaded.getPattern().flags == ds.getPattern().flags
+
+# test that a program built by another version of Python is compiled again
+def test_dictionary_spotter_pickle_other_version():
+    ds = pickle.loads(pickle.dumps(DictionarySpotter("CUSTOMER", ["Jacob King"])))
+    ds._program = (("other",),) + ds._program[1:]
+    assert ds.process("call Jacob King") == "call CUSTOMER"
+    assert ds._program[0] != ("other",)
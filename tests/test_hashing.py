@@ -0,0 +1,24 @@
+from sanityze.hashing import TokenHasher
+import hashlib
+import pickle
+import pytest
+
+# test the md5 hashes are compatible with the previous versions
+def test_md5_hasher():
+    hasher = TokenHasher()
+    assert hasher("foo@gaga.com") == hashlib.md5(b"foo@gaga.com").hexdigest()
+    assert hasher("foo@gaga.com") == hashlib.md5(b"foo@gaga.com").hexdigest(), "Memoized hashes should not change"
+
+# test the keyed blake2b hashes, also after pickling
+def test_blake2b_hasher():
+    hasher = TokenHasher("blake2b", key="secret")
+    expected = hashlib.blake2b(b"foo@gaga.com", key=b"secret", digest_size=16).hexdigest()
+    assert hasher("foo@gaga.com") == expected
+    assert pickle.loads(pickle.dumps(hasher))("foo@gaga.com") == expected
+
+# test the invalid settings
+def test_invalid_hasher():
+    with pytest.raises(ValueError):
+        TokenHasher("sha1")
+    with pytest.raises(ValueError):
+        TokenHasher("md5", key="secret")
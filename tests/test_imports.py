@@ -0,0 +1,28 @@
+from sanityze.cleanser import *
+import subprocess
+import sys
+
+def run(code):
+    # a fresh interpreter, the modules imported by the tests do not count
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+
+def test_import_does_not_load_pandas():
+    loaded = run("import sys, sanityze, sanityze.cleanser; "
+                 "print(*[m in sys.modules for m in ('pandas', 'numpy', 'asyncio', 'importlib.metadata')])")
+    assert loaded == ["False", "False", "False", "False"]
+
+def test_spotters_without_pandas():
+    out = run("import sys; from sanityze import CreditCardSpotter, EmailSpotter; "
+              "print(CreditCardSpotter('CC').process('pay_4556129404313766'), EmailSpotter('E').process('foo@gaga.com'), "
+              "CreditCardSpotter('CC').process('4556129404313767'), 'pandas' in sys.modules, 'numpy' in sys.modules)")
+    assert out == ["pay_CREDITCARD", "EMAILADDRS", "4556129404313767", "False", "False"]
+
+def test_lazy_exports():
+    import sanityze
+    assert sanityze.Cleanser is Cleanser
+    assert sanityze.EmailSpotter is EmailSpotter
+    assert isinstance(sanityze.__version__, str)
+    assert "Cleanser" in dir(sanityze)
+
+def test_lazy_pandas():
+    assert isinstance(Cleanser().clean(pd.DataFrame({"a": ["foo@gaga.com"]})), pd.DataFrame)
@@ -0,0 +1,96 @@
+from sanityze.cleanser import *
+import pytest
+
+def make_df():
+    return pd.DataFrame({"name": ["alice", "bob", "carol", None],
+                         "contact": ["alice@gaga.com", "call me", "carol@gaga.com", "none"],
+                         "card": pd.Series(["4658481398602929", "n/a", "n/a", "n/a"], dtype="category"),
+                         "age": [31, 42, 27, 55]})
+
+def test_fingerprint():
+    assert Cleanser().fingerprint() == Cleanser().fingerprint()
+    assert Cleanser().fingerprint() != Cleanser().fingerprint(fused=True)
+    assert Cleanser().fingerprint() != Cleanser(hash_spotted=True).fingerprint()
+    assert (Cleanser(hash_algorithm="blake2b", hash_key="a").fingerprint()
+            != Cleanser(hash_algorithm="blake2b", hash_key="b").fingerprint())
+    c = Cleanser()
+    before = c.fingerprint()
+    c.add_spotter(DictionarySpotter("NAMES", ["alice", "bob"]))
+    assert c.fingerprint() != before
+
+def test_fingerprint_hides_key():
+    config = EmailSpotter("EMAILS", True, "blake2b", "secret").getConfig()
+    assert "secret" not in str(config)
+
+def test_clean_incremental_matches_clean(tmp_path):
+    df = make_df()
+    c = Cleanser()
+    expected = c.clean(df)
+    path = str(tmp_path / "index.sqlite")
+    pd.testing.assert_frame_equal(c.clean_incremental(df, path), expected)
+    # the second run comes from the index
+    with IncrementalIndex(path) as index:
+        pd.testing.assert_frame_equal(c.clean_incremental(df, index), expected)
+        assert index.hits == 4 and index.misses == 0
+
+def test_clean_incremental_new_rows(tmp_path):
+    df = make_df()
+    c = Cleanser()
+    path = str(tmp_path / "index.sqlite")
+    c.clean_incremental(df, path)
+    more = pd.concat([df, pd.DataFrame({"name": ["dave"], "contact": ["dave@gaga.com"],
+                                        "card": pd.Series(["n/a"], dtype=df["card"].dtype), "age": [60]})],
+                     ignore_index=True)
+    more.loc[1, "contact"] = "bob@gaga.com"
+    with IncrementalIndex(path) as index:
+        cleaned = c.clean_incremental(more, index)
+        assert index.hits == 3 and index.misses == 2
+        assert len(index) == 6
+    assert cleaned.loc[1, "contact"] == "EMAILADDRS"
+    assert cleaned.loc[4, "contact"] == "EMAILADDRS"
+    pd.testing.assert_frame_equal(cleaned, c.clean(more))
+
+# test that the repeated and shuffled rows are restored from their own stored row
+def test_clean_incremental_repeated_rows(tmp_path):
+    df = make_df()
+    c = Cleanser()
+    path = str(tmp_path / "index.sqlite")
+    c.clean_incremental(df, path)
+    repeated = pd.concat([df] * 50, ignore_index=True).sample(frac=1, random_state=0).reset_index(drop=True)
+    with IncrementalIndex(path) as index:
+        cleaned = c.clean_incremental(repeated, index)
+        assert index.hits == 200 and index.misses == 0
+    pd.testing.assert_frame_equal(cleaned, c.clean(repeated))
+
+# test that the missing values of a string dtype column are compared safely
+def test_clean_incremental_string_dtype_with_na(tmp_path):
+    df = make_df().astype({"name": "string", "contact": "string"})
+    df.loc[1, "contact"] = pd.NA
+    c = Cleanser()
+    path = str(tmp_path / "index.sqlite")
+    pd.testing.assert_frame_equal(c.clean_incremental(df, path), c.clean(df))
+    with IncrementalIndex(path) as index:
+        cleaned = c.clean_incremental(df, index)
+        assert index.hits == 4
+    assert cleaned["contact"].isna().tolist() == [False, True, False, False]
+    pd.testing.assert_frame_equal(cleaned, c.clean(df))
+
+def test_clean_incremental_invalidated(tmp_path):
+    df = make_df()
+    path = str(tmp_path / "index.sqlite")
+    c = Cleanser()
+    c.clean_incremental(df, path)
+    c.add_spotter(DictionarySpotter("NAMES", ["alice", "bob"]))
+    with IncrementalIndex(path) as index:
+        pd.testing.assert_frame_equal(c.clean_incremental(df, index), c.clean(df))
+        assert index.hits == 0 and index.misses == 4
+    # a new column invalidates the index too
+    with IncrementalIndex(path) as index:
+        c.clean_incremental(df.assign(extra="x"), index)
+        assert index.hits == 0
+
+def test_clean_incremental_errors(tmp_path):
+    with pytest.raises(ValueError):
+        Cleanser().clean_incremental(None, str(tmp_path / "index.sqlite"))
+    with pytest.raises(TypeError):
+        Cleanser().clean_incremental([1, 2], str(tmp_path / "index.sqlite"))
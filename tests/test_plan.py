@@ -0,0 +1,37 @@
+from sanityze.cleanser import *
+import pytest
+
+df = pd.DataFrame({'email': ['foo@gaga.com', 'bar@gaga.com', None],
+                   'card': ['4556129404313766', 'foo@gaga.com', 'x'],
+                   'notes': ['baz@gaga.com', 3, None],
+                   'misc': pd.Series([None, 1.5, None], dtype=object),
+                   'price': [1, 2, 3]})
+
+# test the plan of each column
+def test_plan_describe():
+    c = Cleanser()
+    plan = c.plan(df, exclude=['notes'], spotter_columns={'CREDITCARD': ['card']})
+    described = plan.describe()
+    assert list(described['kind']) == ['text', 'text', 'excluded', 'no strings sampled', 'dtype']
+    assert list(described['spotters']) == ['EMAILADDRS', 'EMAILADDRS,CREDITCARD', '', 'EMAILADDRS', '']
+    assert plan.matches(df) and not plan.matches(df[['email']])
+
+# test cleaning with a plan, also in another frame with the same schema
+def test_clean_with_plan():
+    c = Cleanser()
+    plan = c.plan(df, columns=['email', 'card'], spotter_columns={'CREDITCARD': ['card']})
+    output_df = c.clean(df, plan=plan)
+    assert list(output_df['email']) == ['EMAILADDRS', 'EMAILADDRS', None]
+    assert list(output_df['card']) == ['CREDITCARD', 'EMAILADDRS', 'x']
+    assert output_df['notes'].equals(df['notes']), "Columns left out of the plan should not be cleaned"
+    assert c.clean(df.iloc[::-1], plan=plan, n_jobs=2).equals(output_df.iloc[::-1])
+    with pytest.raises(ValueError):
+        c.clean(df[['email']], plan=plan)
+
+# test the invalid plans
+def test_invalid_plan():
+    c = Cleanser()
+    with pytest.raises(ValueError):
+        c.plan(df, columns=['nope'])
+    with pytest.raises(ValueError):
+        c.plan(df, spotter_columns={'PHONE': ['email']})
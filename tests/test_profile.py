@@ -0,0 +1,51 @@
+from sanityze.cleanser import *
+from sanityze.profile import wilson_interval
+import numpy as np
+import pytest
+
+def wide_frame(rows=2000):
+    rng = np.random.default_rng(0)
+    emails = np.where(rng.random(rows) < 0.3, 'contact foo@gaga.com', 'no contact')
+    return pd.DataFrame({'notes': emails, 'city': ['Vancouver'] * rows,
+                         'rare': ['x'] * (rows - 1) + ['4556129404313766'], 'n': np.arange(rows)})
+
+# test the Wilson bounds
+def test_wilson_interval():
+    lower, upper = wilson_interval(5, 100, 0.95)
+    assert lower < 0.05 < upper
+    assert wilson_interval(0, 1000, 0.95)[0] == 0.0
+    assert wilson_interval(0, 0, 0.95) == (0.0, 1.0)
+    assert wilson_interval(0, 1000, 0.99)[1] > wilson_interval(0, 1000, 0.95)[1]
+
+# test that only the columns with sampled PII are planned, and the plan cleans them
+def test_profile():
+    df = wide_frame()
+    c = Cleanser()
+    plan = c.profile(df, fraction=0.1, min_rows=100)
+    assert plan.columns[0] == ('EMAILADDRS', 'CREDITCARD') and 1 not in plan.columns
+    assert (plan.kinds[0], plan.kinds[1], plan.kinds[3]) == ('PII sampled', 'no PII sampled', 'dtype')
+    row = plan.profile.set_index(['column', 'spotter']).loc[('notes', 'EMAILADDRS')]
+    assert row.cells == 200 and row.lower < row.prevalence < row.upper
+    assert abs(row.prevalence - 0.3) < 0.1
+    assert c.clean(df, plan=plan)['notes'].isin(['contact EMAILADDRS', 'no contact']).all()
+
+# test that a planned column is cleaned by the spotters that did not match in the sample
+def test_profile_cleans_unsampled_spotters():
+    df = wide_frame()
+    row = df.index.difference(df.sample(100, random_state=0).index)[0]
+    df.loc[row, 'notes'] = 'card 4556129404313766'
+    c = Cleanser()
+    plan = c.profile(df, fraction=0.05, min_rows=50)
+    assert plan.profile.set_index(['column', 'spotter']).loc[('notes', 'CREDITCARD')].hits == 0
+    assert c.clean(df, plan=plan).loc[row, 'notes'] == 'card CREDITCARD'
+
+# test the tolerance and the escalation to a full scan
+def test_profile_tolerance_escalate():
+    df = wide_frame()
+    plan = Cleanser().profile(df, fraction=0.05, min_rows=50, tolerance=0.001)
+    assert plan.kinds[1] == 'uncertain' and plan.columns[1] == ('EMAILADDRS', 'CREDITCARD')
+    plan = Cleanser().profile(df, fraction=0.05, min_rows=50, escalate=True)
+    assert plan.columns == {0: ('EMAILADDRS', 'CREDITCARD'), 2: ('EMAILADDRS', 'CREDITCARD')}
+    assert plan.kinds[2] == 'PII found'
+    with pytest.raises(ValueError):
+        Cleanser().profile(df, fraction=0)
@@ -0,0 +1,35 @@
+from sanityze.cleanser import *
+import pytest
+
+# test that a string is cleaned like a cell of a data frame
+def test_clean_text():
+    c = Cleanser()
+    text = "refund 4556129404313766 for foo@gaga.com"
+    assert c.clean_text(text) == "refund CREDITCARD for EMAILADDRS"
+    assert c.clean_text(text, fused=True) == "refund CREDITCARD for EMAILADDRS"
+    assert c.clean_text("engineer") == "engineer"
+    assert c.prefilter_skipped['CREDITCARD'] == 1
+    with pytest.raises(TypeError):
+        c.clean_text(None)
+
+# test that the nested strings of a record are cleaned and the record left untouched
+def test_clean_record():
+    c = Cleanser(hash_spotted=True)
+    record = {'id': 7, 'email': 'foo@gaga.com', 'contact': {'emails': ['foo@gaga.com', None], 'pair': ('x', 'foo@gaga.com')}}
+    cleaned = c.clean_record(record)
+    digest = Cleanser(hash_spotted=True).clean_text('foo@gaga.com')
+    assert cleaned == {'id': 7, 'email': digest, 'contact': {'emails': [digest, None], 'pair': ('x', digest)}}
+    assert record['email'] == 'foo@gaga.com'
+    with pytest.raises(TypeError):
+        c.clean_record(['foo@gaga.com'])
+
+# test the records, with a cache and a chain changed between calls
+def test_clean_records():
+    c = Cleanser(cache_size=10)
+    records = [{'notes': 'foo@gaga.com'}, {'notes': 'foo@gaga.com'}, {'notes': None}]
+    assert c.clean_records(records) == [{'notes': 'EMAILADDRS'}, {'notes': 'EMAILADDRS'}, {'notes': None}]
+    assert c.cache.info()['hits'] == 1
+    c.remove_spotter('EMAILADDRS')
+    assert c.clean_records(records)[0] == {'notes': 'foo@gaga.com'}
+    with pytest.raises(TypeError):
+        c.clean_records(['foo@gaga.com'])
@@ -0,0 +1,42 @@
+from sanityze.cleanser import *
+from sanityze.scan import ScanResult
+import pytest
+
+df = pd.DataFrame({'notes': ['Okay', 'mail a@gaga.com or b@gaga.com', None, 'card 5555 5555 5555 4444'],
+                   'card': pd.Categorical(['4556129404313766', 'x', 'x', '1111111111111111']),
+                   'price': [1, 2, 3, 4]})
+
+# test the match index and the counts, the data frame is not modified
+def test_scan():
+    copy = df.copy()
+    result = Cleanser().scan(df)
+    assert df.equals(copy)
+    assert not result.stopped and result.found() and len(result) == 4
+    frame = result.to_frame()
+    assert list(frame.columns) == ScanResult.COLUMNS
+    assert frame.values.tolist() == [[1, 'notes', 'EMAILADDRS', 5, 15], [1, 'notes', 'EMAILADDRS', 19, 29],
+                                     [3, 'notes', 'CREDITCARD', 5, 24], [0, 'card', 'CREDITCARD', 0, 16]]
+    assert result.counts == {('notes', 'EMAILADDRS'): 2, ('notes', 'CREDITCARD'): 1, ('card', 'CREDITCARD'): 1}
+    counts = Cleanser().scan(df, counts_only=True)
+    assert counts.counts == result.counts and len(counts.rows) == 0
+
+# test the selection of columns and spotters and the early termination
+def test_scan_limit():
+    result = Cleanser().scan(df, spotters=['CREDITCARD'], limit=1, block_size=2)
+    assert result.stopped and len(result) == 1
+    assert result.to_frame().values.tolist() == [[3, 'notes', 'CREDITCARD', 5, 24]]
+    assert not Cleanser().scan(df, columns=['price']).found()
+    with pytest.raises(ValueError):
+        Cleanser().scan(df, spotters=['ZIPCODE'])
+    with pytest.raises(ValueError):
+        Cleanser().scan(df, limit=0)
+
+# test that the spotters without a pattern report the cells they change
+def test_scan_custom_process():
+    class UpperSpotter(Spotter):
+        def process(self, text):
+            return text.lower()
+    c = Cleanser(include_default_spotters=False)
+    c.add_spotter(UpperSpotter("UPPER"))
+    result = c.scan(pd.DataFrame({'a': ['abc', 'ABC']}))
+    assert result.to_frame().values.tolist() == [[1, 'a', 'UPPER', -1, -1]]
@@ -0,0 +1,38 @@
+from sanityze.cleanser import *
+import pytest
+
+df = pd.DataFrame({'notes': ['foo@gaga.com and 4556129404313766', 'Okay', None, 'Jacob King, jacob@gaga.com'],
+                   'price': [1, 2, 3, 4]})
+
+# test the spans reported by the spotters
+def test_spotter_spans():
+    assert EmailSpotter("EMAILS").spans("mail foo@gaga.com") == [(5, 17, 'EMAILADDRS')]
+    assert EmailSpotter("EMAILS").spans("Okay") == []
+    # the candidates that fail the Luhn checksum are not spans
+    assert CreditCardSpotter("CCS").spans("4556129404313767 4556129404313766") == [(17, 33, 'CREDITCARD')]
+    assert EmailSpotter("EMAILS", True).spans("foo@gaga.com") == [(0, 12, '38cca18a520b5ac4a93f52498d5dbb0e')]
+    class UpperSpotter(Spotter):
+        def process(self, text):
+            return text.upper()
+    assert UpperSpotter("UPPER").spans("foo") is None
+    assert not SpanSpotter.canFuse(UpperSpotter("UPPER"))
+
+# test that the overlaps are resolved by chain order
+def test_span_spotter_priority():
+    names = DictionarySpotter("NAME", ["foo", "gaga"])
+    assert SpanSpotter([names, EmailSpotter("EMAILS")]).process("foo@gaga.com x") == "NAME@NAME.com x"
+    assert SpanSpotter([EmailSpotter("EMAILS"), names]).process("foo@gaga.com foo") == "EMAILADDRS NAME"
+    with pytest.raises(ValueError):
+        SpanSpotter([SpanSpotter([EmailSpotter("EMAILS")])])
+
+# test that span based cleaning gives the sequential result when the spotters do not overlap
+def test_clean_spans():
+    c = Cleanser()
+    c.add_spotter(DictionarySpotter("NAME", ["Jacob King"]))
+    cleaned = c.clean(df, fused="spans")
+    assert cleaned.equals(c.clean(df))
+    assert list(cleaned['notes'][:2]) == ['EMAILADDRS and CREDITCARD', 'Okay']
+    assert c.clean_text('Jacob King, jacob@gaga.com', fused="spans") == 'NAME, EMAILADDRS'
+    assert c.compile(fused="spans").clean(df, n_jobs=2).equals(cleaned)
+    with pytest.raises(ValueError):
+        c.clean(df, fused="fast")
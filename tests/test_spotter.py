@@ -0,0 +1,57 @@
+from sanityze.cleanser import *
+from sanityze.spotters import *
+import pytest
+import hashlib
+
+# a custom spotter that only declares its pattern
+class ZipSpotter(Spotter):
+    pattern = r"\b[0-9]{5}\b"
+
+    def getSpotterUID(self):
+        return "ZIPCODE"
+
+# check that the pattern is compiled once and cached on the spotter
+def test_pattern_is_cached():
+    ee = EmailSpotter("EMAILS", False)
+    assert ee.getPattern() is ee.getPattern()
+    assert ee.getPattern().flags & re.IGNORECASE
+
+# check that a declared pattern is used by process() and processSeries()
+def test_custom_pattern_spotter():
+    s = ZipSpotter("ZIPS", False)
+    assert s.process("Zip 90210, not 123456") == "Zip ZIPCODE, not 123456"
+    assert list(s.processSeries(pd.Series(["Zip 90210", "none"]))) == ["Zip ZIPCODE", "none"]
+    s_hash = ZipSpotter("ZIPS", True)
+    assert s_hash.process("90210") == hashlib.md5(b"90210").hexdigest()
+
+# a spotter without a pattern has to override process()
+def test_spotter_without_pattern():
+    with pytest.raises(NotImplementedError):
+        Spotter("NOTHING").process("foo")
+
+# check that a fused spotter scans all the patterns in one pass, in chain order
+def test_fused_spotter():
+    fs = FusedSpotter([EmailSpotter("EMAILS", False), ZipSpotter("ZIPS", False)])
+    assert fs.getSpotterUID() == "EMAILADDRS+ZIPCODE"
+    assert fs.process("90210 foo@gaga.com") == "ZIPCODE EMAILADDRS"
+    # both match at the same position, the first spotter wins
+    assert fs.process("12345@gaga.com") == "EMAILADDRS"
+    assert FusedSpotter([ZipSpotter("ZIPS", False), EmailSpotter("EMAILS", False)]).process("12345@gaga.com") == "ZIPCODE@gaga.com"
+    class NamedZipSpotter(ZipSpotter):
+        pattern = r"\b(?P<zip>[0-9]{5})\b"
+    assert not FusedSpotter.canFuse(NamedZipSpotter("ZIPS", False))
+    with pytest.raises(ValueError):
+        FusedSpotter([NamedZipSpotter("ZIPS", False)])
+
+# check that the global inline flags of a pattern are scoped to its branch
+def test_fused_spotter_inline_flags():
+    class InlineZipSpotter(ZipSpotter):
+        pattern = r"(?i)zip[0-9]{5}"
+    fs = FusedSpotter([EmailSpotter("EMAILS", False), InlineZipSpotter("ZIPS", False)])
+    assert fs.process("ZIP12345 foo@gaga.com zip") == "ZIPCODE EMAILADDRS zip"
+    c = Cleanser()
+    c.add_spotter(InlineZipSpotter("ZIPS", False))
+    assert c.clean_text("ZIP12345 foo@gaga.com", fused=True) == "ZIPCODE EMAILADDRS"
+    class AsciiZipSpotter(ZipSpotter):
+        pattern = r"(?a)zip[0-9]{5}"
+    assert not FusedSpotter.canFuse(AsciiZipSpotter("ZIPS", False))
@@ -0,0 +1,80 @@
+from sanityze.cleanser import *
+from sanityze.stats import CleanStats
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+# test the statistics collected per column and spotter
+def test_clean_return_stats():
+    df = pd.DataFrame({'notes': ['foo@gaga.com and bar@gaga.com', 'engineer', '4556129404313766', None],
+                       'price': [1.0, 2.0, 3.0, 4.0]})
+    cleaned, stats = Cleanser().clean(df, return_stats=True)
+    assert cleaned.equals(Cleanser().clean(df))
+    assert isinstance(stats, CleanStats)
+    email = stats.records[('notes', 'EMAILADDRS')]
+    assert (email.scanned, email.skipped, email.changed, email.matches) == (3, 2, 1, 2)
+    card = stats.records[('notes', 'CREDITCARD')]
+    assert (card.changed, card.matches) == (1, 1)
+    assert card.seconds >= 0
+    assert not any(column == 'price' for column, _ in stats.records), "Numeric columns are not scanned"
+    frame = stats.to_frame()
+    assert list(frame.columns) == CleanStats.COLUMNS
+    assert stats.by_spotter().loc['EMAILADDRS', 'matches'] == 2
+
+# test that the callback receives the statistics and nothing is collected by default
+def test_clean_on_stats():
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'engineer']})
+    received = []
+    cleaned = Cleanser().clean(df, on_stats=received.append)
+    assert isinstance(cleaned, pd.DataFrame)
+    assert received[0].records[('notes', 'EMAILADDRS')].changed == 1
+    c = Cleanser()
+    assert c.clean(df, inplace=True, return_stats=True)[0] is None
+
+# test that the statistics of the workers are merged
+def test_clean_stats_parallel():
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'engineer', 'x', 'bar@gaga.com'] * 5})
+    _, serial = Cleanser().clean(df, return_stats=True)
+    with ThreadPoolExecutor(2) as pool:
+        _, parallel = Cleanser().clean(df, executor=pool, n_jobs=2, return_stats=True)
+    columns = ["column", "spotter", "scanned", "skipped", "changed", "matches"]
+    assert parallel.to_frame()[columns].equals(serial.to_frame()[columns])
+
+# test that the counters and the cache survive an executor running threads
+def test_clean_thread_executor_counters():
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'engineer', 'x', 'bar@gaga.com'] * 64})
+    serial = Cleanser()
+    expected = serial.clean(df)
+    c = Cleanser()
+    with ThreadPoolExecutor(4) as pool:
+        assert c.clean(df, executor=pool, n_jobs=4).equals(expected)
+    assert c.prefilter_skipped == serial.prefilter_skipped
+    c = Cleanser(cache_size=100)
+    c.clean_text('foo@gaga.com')
+    cache = c.cache
+    with ThreadPoolExecutor(4) as pool:
+        assert c.clean(df, executor=pool, n_jobs=4).equals(expected)
+    assert c.cache is cache and cache.get('foo@gaga.com') == 'EMAILADDRS'
+
+# test that the matches can be left uncounted, the other statistics are the same
+def test_clean_stats_without_matches(monkeypatch):
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'engineer', '4556129404313766', 'bar@gaga.com'] * 5})
+    _, counted = Cleanser().clean(df, return_stats=True)
+    def fail(self, series):
+        raise AssertionError("the matches should not be counted")
+    monkeypatch.setattr(EmailSpotter, "countMatches", fail)
+    monkeypatch.setattr(CreditCardSpotter, "countMatches", fail)
+    for n_jobs in [1, 2]:
+        _, stats = Cleanser().clean(df, return_stats=True, count_matches=False, n_jobs=n_jobs, backend="threads")
+        frame = stats.to_frame()
+        assert frame['matches'].isna().all()
+        assert frame['changed'].equals(counted.to_frame()['changed'])
+
+# test that the strings nested in dicts and lists are counted one by one
+@pytest.mark.parametrize("cache_size", [None, 100])
+def test_clean_stats_nested(cache_size):
+    df = pd.DataFrame({'notes': [{'email': 'foo@gaga.com', 'cards': ['4556129404313766', 'x']}, 'bar@gaga.com', ['engineer'], 3]})
+    cleaned, stats = Cleanser(cache_size=cache_size).clean(df, return_stats=True)
+    assert cleaned['notes'].tolist()[:3] == [{'email': 'EMAILADDRS', 'cards': ['CREDITCARD', 'x']}, 'EMAILADDRS', ['engineer']]
+    assert stats.records[('notes', 'EMAILADDRS')].changed == 2
+    assert stats.records[('notes', 'CREDITCARD')].changed == 1
+    assert stats.records[('notes', 'EMAILADDRS')].scanned == 5
@@ -0,0 +1,62 @@
+from sanityze.cleanser import *
+from sanityze.streaming import *
+import pytest
+
+# test that a CSV file is cleaned chunk by chunk, whatever the chunk size
+def test_clean_file_csv(tmp_path):
+    c = Cleanser(include_default_spotters=True)
+    expected = c.clean(pd.read_csv('tests/data_with_pii.csv', dtype=str, keep_default_na=False))
+    for chunksize in [1, 3, 100]:
+        dst = tmp_path / f"clean_{chunksize}.csv"
+        assert c.clean_file('tests/data_with_pii.csv', dst, chunksize=chunksize) == 20
+        assert pd.read_csv(dst, dtype=str, keep_default_na=False).equals(expected)
+
+# test that a Parquet file keeps its schema when cleaned chunk by chunk
+def test_clean_file_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.read_csv('tests/data_with_pii.csv')
+    df.loc[:4, 'email_address'] = None
+    df.to_parquet(tmp_path / "data.parquet")
+    c = Cleanser(include_default_spotters=True)
+    assert c.clean_file(tmp_path / "data.parquet", tmp_path / "clean.parquet", chunksize=4) == 20
+    output_df = pd.read_parquet(tmp_path / "clean.parquet")
+    assert output_df.equals(c.clean(df))
+
+# test that clean_iter cleans the frames lazily and in order
+def test_clean_iter():
+    c = Cleanser(include_default_spotters=True)
+    df = pd.DataFrame({'notes': ['foo@gaga.com', 'Okay']})
+    frames = c.clean_iter(iter([df, df.iloc[1:]]))
+    assert list(next(frames)['notes']) == ['EMAILADDRS', 'Okay']
+    assert list(next(frames)['notes']) == ['Okay']
+
+# test the format inference
+def test_infer_format():
+    assert infer_format("export.CSV.gz") == "csv"
+    assert infer_format("export.parquet") == "parquet"
+    with pytest.raises(ValueError):
+        infer_format("export.xlsx")
+
+# test that JSON lines and text files are cleaned chunk by chunk
+def test_clean_file_jsonl_text(tmp_path):
+    c = Cleanser(include_default_spotters=True)
+    (tmp_path / "data.jsonl").write_text('{"notes": "foo@gaga.com", "n": 1}\n{"notes": "Okay", "n": 2}\n')
+    assert c.clean_file(tmp_path / "data.jsonl", tmp_path / "clean.jsonl", chunksize=1) == 2
+    assert (tmp_path / "clean.jsonl").read_text() == '{"notes":"EMAILADDRS","n":1}\n{"notes":"Okay","n":2}\n'
+    (tmp_path / "app.log").write_text("login foo@gaga.com\n\nOkay\n")
+    assert c.clean_file(tmp_path / "app.log", tmp_path / "clean.log", chunksize=2) == 3
+    assert (tmp_path / "clean.log").read_text() == "login EMAILADDRS\n\nOkay\n"
+
+# test that the strings nested in JSON objects and arrays are cleaned
+def test_clean_file_jsonl_nested(tmp_path):
+    c = Cleanser(include_default_spotters=True)
+    (tmp_path / "data.jsonl").write_text('{"user":{"email":"foo@gaga.com","id":7},"tags":["bar@gaga.com","x"]}\n'
+                                         '{"user":{"email":"none","id":8},"tags":[]}\n')
+    for fused in [False, True]:
+        assert c.clean_file(tmp_path / "data.jsonl", tmp_path / "clean.jsonl", chunksize=1, fused=fused) == 2
+        assert (tmp_path / "clean.jsonl").read_text() == ('{"user":{"email":"EMAILADDRS","id":7},"tags":["EMAILADDRS","x"]}\n'
+                                                          '{"user":{"email":"none","id":8},"tags":[]}\n')
+    df = pd.DataFrame({"values": [{"a": "foo@gaga.com"}, "4556129404313766", 3, ["Okay"]]})
+    cleaned = c.clean(df)
+    assert cleaned["values"].tolist() == [{"a": "EMAILADDRS"}, "CREDITCARD", 3, ["Okay"]]
+    assert df["values"][0] == {"a": "foo@gaga.com"}
@@ -0,0 +1,92 @@
+from sanityze.cleanser import *
+from sanityze import engine
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pickle
+import re
+import pytest
+
+df = pd.read_csv("tests/data_with_pii.csv")
+big = pd.concat([df] * 150, ignore_index=True)
+big['kind'] = pd.Categorical(['a@gaga.com', 'none'] * (len(big) // 2))
+
+# test that the threads give the serial result in every fused mode
+@pytest.mark.parametrize("fused", [False, True, "spans"])
+def test_threads_match_serial(fused):
+    c = Cleanser(hash_spotted=True)
+    serial = c.clean(big, fused=fused)
+    threaded = c.clean(big, fused=fused, n_jobs=4, backend="threads")
+    assert threaded.equals(serial)
+    assert list(threaded.dtypes) == list(serial.dtypes)
+    assert threaded['kind'].dtype == 'category'
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert c.clean(big, fused=fused, n_jobs=2, executor=pool, backend="threads").equals(serial)
+
+# test that the statistics and the counters of the threads are collected
+def test_threads_stats():
+    c = Cleanser()
+    _, serial = c.clean(big, return_stats=True)
+    skipped = sum(c.prefilter_skipped.values())
+    c.prefilter_skipped.clear()
+    _, threaded = c.clean(big, n_jobs=3, return_stats=True, backend="threads")
+    assert sum(c.prefilter_skipped.values()) == skipped
+    assert {k: r.changed for k, r in threaded.records.items()} == {k: r.changed for k, r in serial.records.items()}
+
+# test that the threads skip the missing values of a string dtype column
+@pytest.mark.parametrize("fused", [False, True, "spans"])
+def test_threads_string_dtype_with_na(fused):
+    na = pd.DataFrame({'text': pd.Series(['a@b.com', pd.NA, 'card 4556129404313766'] * 200, dtype="string")})
+    c = Cleanser()
+    threaded = c.clean(na, fused=fused, n_jobs=2, backend="threads")
+    assert threaded.equals(c.clean(na, fused=fused))
+    assert threaded['text'].isna().sum() == 200
+    pytest.importorskip("regex")
+    pattern = engine.compile_concurrent(r"[a-z]+@[a-z]+\.com", 0)
+    cells = na['text'].head(3)
+    assert engine.contains(cells, pattern).tolist() == [True, False, False]
+    assert engine.count(cells, pattern) == 1
+    assert engine.findall(cells, pattern).tolist()[::2] == [['a@b.com'], []]
+    spotter = EmailSpotter("EMAILS").concurrentCopy()
+    assert spotter.processSeries(cells).tolist()[::2] == ['EMAILADDRS', 'card 4556129404313766']
+
+# test the other entry points and the invalid arguments
+def test_threads_entry_points():
+    c = Cleanser()
+    serial = c.clean(df)
+    frames = list(c.clean_iter([df, df], n_jobs=2, backend="threads"))
+    assert all(frame.equals(serial) for frame in frames)
+    assert c.compile(fused=True).clean(df, n_jobs=2, backend="threads").equals(serial)
+    copy_df = df.copy()
+    assert c.clean(copy_df, n_jobs=2, inplace=True, backend="threads") is None
+    assert copy_df.equals(serial)
+    with pytest.raises(ValueError):
+        c.clean(df, n_jobs=2, backend="fibers")
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(ValueError):
+            c.clean(df, executor=pool, backend="threads")
+
+# test that re is used when the regex module is not installed
+def test_threads_without_regex(monkeypatch):
+    monkeypatch.setattr(engine, "_import_regex", lambda: None)
+    assert not engine.has_concurrent()
+    assert engine.compile_concurrent(r"[0-9]+", 0) is None
+    spotter = EmailSpotter("EMAILS")
+    assert spotter.concurrentCopy() is spotter
+    c = Cleanser()
+    assert c.clean(big, n_jobs=2, backend="threads").equals(c.clean(big))
+
+# test the patterns compiled with the regex module
+def test_concurrent_pattern():
+    pytest.importorskip("regex")
+    pattern = engine.compile_concurrent(r"[a-z]+@[a-z]+\.com", re.IGNORECASE | re.ASCII)
+    assert pattern.sub("EMAIL", "Foo@Gaga.com, bar") == "EMAIL, bar"
+    assert pattern.findall("a@b.com c@d.com") == ["a@b.com", "c@d.com"]
+    assert pattern.fullmatch("ÿ@b.com") is None
+    loaded = pickle.loads(pickle.dumps(pattern))
+    assert loaded.search("x Foo@Gaga.com").group() == "Foo@Gaga.com"
+    # the flags of re the regex module does not know are not translated
+    assert engine.compile_concurrent(r"x", re.DEBUG) is None
+    copied = CreditCardSpotter("CCS").concurrentCopy()
+    assert isinstance(copied.getPattern(), engine.ConcurrentPattern)
+    assert copied.process("card 4556129404313766") == "card CREDITCARD"
+    fused = Cleanser()._compiled_chain(True, concurrent=True)
+    assert all(isinstance(s.getPattern(), engine.ConcurrentPattern) for s in fused)